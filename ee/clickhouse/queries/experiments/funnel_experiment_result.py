@@ -12,6 +12,7 @@ from posthog.hogql_queries.experiments.funnels_statistics import (
     are_results_significant,
     calculate_credible_intervals,
     calculate_probabilities,
+    sample_conversion_rates,
 )
 from posthog.models.experiment import ExperimentHoldout
 from posthog.models.feature_flag import FeatureFlag
@@ -105,14 +106,18 @@ class ClickhouseFunnelExperimentResult:
 
             control_variant, test_variants = self.get_variants(filtered_results)
 
-            probabilities = calculate_probabilities(control_variant, test_variants)
+            # draw the simulations once, for both the win probabilities and the expected loss
+            samples = sample_conversion_rates([control_variant, *test_variants])
+            probabilities = calculate_probabilities(control_variant, test_variants, samples=samples)
 
             mapping = {
                 variant.key: probability
                 for variant, probability in zip([control_variant, *test_variants], probabilities)
             }
 
-            significance_code, loss = are_results_significant(control_variant, test_variants, probabilities)
+            significance_code, loss = are_results_significant(
+                control_variant, test_variants, probabilities, samples=samples
+            )
 
             credible_intervals = calculate_credible_intervals([control_variant, *test_variants])
         except ValidationError:
@@ -3,11 +3,14 @@ from functools import lru_cache
 from math import exp, lgamma, log, ceil
 
 from flaky import flaky
+from numpy.random import default_rng
 
 from posthog.hogql_queries.experiments.funnels_statistics import (
     are_results_significant,
     calculate_expected_loss,
     calculate_probabilities,
+    expected_loss_from_samples,
+    sample_conversion_rates,
     calculate_credible_intervals as calculate_funnel_credible_intervals,
 )
 from posthog.schema import ExperimentSignificanceCode, ExperimentVariantFunnelsBaseStats
@@ -173,6 +176,34 @@ class TestFunnelExperimentCalculator(unittest.TestCase):
         alternative_probability = calculate_probability_of_winning_for_target(variant_test, [variant_control])
         self.assertAlmostEqual(probability, alternative_probability, places=1)
 
+    def test_seeded_simulations_are_reproducible(self):
+        variant_test = ExperimentVariantFunnelsBaseStats(key="A", success_count=100, failure_count=10)
+        variant_control = ExperimentVariantFunnelsBaseStats(key="B", success_count=100, failure_count=18)
+
+        probabilities = calculate_probabilities(variant_control, [variant_test], random_sampler=default_rng(42))
+        self.assertEqual(
+            probabilities, calculate_probabilities(variant_control, [variant_test], random_sampler=default_rng(42))
+        )
+        self.assertAlmostEqual(probabilities[1], 0.918, places=2)
+        self.assertEqual(
+            calculate_expected_loss(variant_test, [variant_control], random_sampler=default_rng(42)),
+            calculate_expected_loss(variant_test, [variant_control], random_sampler=default_rng(42)),
+        )
+
+    def test_expected_loss_reuses_the_probability_samples(self):
+        variant_test = ExperimentVariantFunnelsBaseStats(key="A", success_count=1000, failure_count=100)
+        variant_control = ExperimentVariantFunnelsBaseStats(key="B", success_count=1000, failure_count=180)
+
+        samples = sample_conversion_rates([variant_control, variant_test], default_rng(42), priors=(2, 3))
+        probabilities = calculate_probabilities(variant_control, [variant_test], samples=samples)
+        _, loss = are_results_significant(variant_control, [variant_test], probabilities, samples=samples)
+
+        self.assertEqual(
+            probabilities,
+            calculate_probabilities(variant_control, [variant_test], priors=(2, 3), random_sampler=default_rng(42)),
+        )
+        self.assertEqual(loss, expected_loss_from_samples(samples[1], samples[[0]]))
+
     def test_calculate_results_for_two_test_variants(self):
         variant_test_1 = ExperimentVariantFunnelsBaseStats(key="A", success_count=100, failure_count=10)
         variant_test_2 = ExperimentVariantFunnelsBaseStats(key="B", success_count=100, failure_count=3)
@@ -3,6 +3,7 @@ from functools import lru_cache
 from math import exp, lgamma, log, ceil
 
 from flaky import flaky
+from numpy.random import default_rng
 
 from posthog.hogql_queries.experiments.trends_statistics import (
     are_results_significant,
@@ -116,6 +117,16 @@ class TestTrendExperimentCalculator(unittest.TestCase):
         self.assertAlmostEqual(credible_intervals[variant_test.key][0], 0.1053, places=3)
         self.assertAlmostEqual(credible_intervals[variant_test.key][1], 0.2141, places=3)
 
+    def test_seeded_simulations_are_reproducible(self):
+        variant_control = ExperimentVariantTrendsBaseStats(key="A", count=20, exposure=1, absolute_exposure=200)
+        variant_test = ExperimentVariantTrendsBaseStats(key="B", count=30, exposure=1, absolute_exposure=200)
+
+        probabilities = calculate_probabilities(variant_control, [variant_test], random_sampler=default_rng(42))
+        self.assertEqual(
+            probabilities, calculate_probabilities(variant_control, [variant_test], random_sampler=default_rng(42))
+        )
+        self.assertAlmostEqual(probabilities[1], 0.92, places=1)
+
     def test_calculate_results_small_numbers(self):
         variant_control = ExperimentVariantTrendsBaseStats(key="A", count=2, exposure=1, absolute_exposure=200)
         variant_test = ExperimentVariantTrendsBaseStats(key="B", count=1, exposure=1, absolute_exposure=200)
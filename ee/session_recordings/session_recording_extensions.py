@@ -7,6 +7,7 @@ from prometheus_client import Histogram, Counter
 
 from posthog import settings
 from posthog.session_recordings.models.session_recording import SessionRecording
+from posthog.session_recordings.snapshot_sources import write_blob_sources_manifest
 from posthog.storage import object_storage
 
 logger = structlog.get_logger(__name__)
@@ -83,6 +84,11 @@ def persist_recording(recording_id: str, team_id: int) -> None:
         recording.storage_version = "2023-08-01"
         recording.object_storage_path = target_prefix
         recording.save()
+        try:
+            # the persisted blobs won't change, so the first load of the recording doesn't need to list them
+            write_blob_sources_manifest(target_prefix)
+        except Exception as e:
+            logger.warning("failed to write snapshot sources manifest", recording_id=recording_id, error=e)
         SNAPSHOT_PERSIST_SUCCESS_COUNTER.inc()
         return
     else:
@@ -1979,27 +1979,32 @@ const api = {
         async getSnapshots(
             recordingId: SessionRecordingType['id'],
             params: SessionRecordingSnapshotParams
-        ): Promise<string[]> {
+        ): Promise<{ snapshots: string[]; realtimeLastScore: string | null }> {
             const response = await new ApiRequest()
                 .recording(recordingId)
                 .withAction('snapshots')
                 .withQueryString(params)
                 .getResponse()
+            // realtime responses tell us where they got up to, so that polling can ask for only what came after
+            const realtimeLastScore = response.headers.get('X-Realtime-Snapshots-Last-Score')
 
             const contentBuffer = new Uint8Array(await response.arrayBuffer())
+            if (!contentBuffer.length) {
+                return { snapshots: [], realtimeLastScore }
+            }
             try {
                 const textDecoder = new TextDecoder()
                 const textLines = textDecoder.decode(contentBuffer)
 
                 if (textLines) {
-                    return textLines.split('\n')
+                    return { snapshots: textLines.split('\n'), realtimeLastScore }
                 }
             } catch (e) {
                 // we assume it is gzipped, swallow the error, and carry on below
             }
 
             // TODO can be removed after 01-08-2024 when we know no valid snapshots are stored in the old format
-            return strFromU8(decompressSync(contentBuffer)).trim().split('\n')
+            return { snapshots: strFromU8(decompressSync(contentBuffer)).trim().split('\n'), realtimeLastScore }
         },
 
         async listPlaylists(params: string): Promise<SavedSessionRecordingPlaylistsResult> {
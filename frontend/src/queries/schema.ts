@@ -892,6 +892,11 @@ export const TRENDS_FILTER_PROPERTIES = new Set<keyof TrendsFilter>([
 export interface TrendsQueryResponse extends AnalyticsQueryResponseBase<Record<string, any>[]> {
     /** Wether more breakdown values are available. */
     hasMore?: boolean
+    /**
+     * When the results were last calculated in full, if they have since been refreshed incrementally
+     * @format date-time
+     */
+    full_refresh_at?: string
 }
 
 export type CachedTrendsQueryResponse = CachedQueryResponse<TrendsQueryResponse>
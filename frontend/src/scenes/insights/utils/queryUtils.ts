@@ -8,6 +8,7 @@ import {
     isFunnelsQuery,
     isHogQLQuery,
     isInsightQueryNode,
+    isInsightQueryWithCompare,
     isInsightQueryWithDisplay,
     isInsightQueryWithSeries,
     isInsightVizNode,
@@ -106,7 +107,9 @@ const groupedChartDisplayTypes: Record<ChartDisplayType, ChartDisplayType> = {
     [ChartDisplayType.ActionsBarValue]: ChartDisplayType.ActionsBarValue,
     [ChartDisplayType.ActionsPie]: ChartDisplayType.ActionsBarValue,
     [ChartDisplayType.ActionsTable]: ChartDisplayType.ActionsBarValue,
-    [ChartDisplayType.WorldMap]: ChartDisplayType.ActionsBarValue,
+
+    // total value, with a higher breakdown limit
+    [ChartDisplayType.WorldMap]: ChartDisplayType.WorldMap,
 }
 
 /** clean insight queries so that we can check for semantic equality with a deep equality check */
@@ -146,6 +149,12 @@ const cleanInsightQuery = (query: InsightQueryNode, opts?: CompareQueryOpts): In
             yAxisScaleType: undefined,
             hiddenLegendIndexes: undefined,
             hiddenLegendBreakdowns: undefined,
+            showAlertThresholdLines: undefined,
+        }
+
+        // the period to compare to only matters when comparing
+        if (isInsightQueryWithCompare(cleanedQuery) && !cleanedQuery.compareFilter?.compare) {
+            delete cleanedQuery.compareFilter
         }
 
         if (isInsightQueryWithSeries(cleanedQuery)) {
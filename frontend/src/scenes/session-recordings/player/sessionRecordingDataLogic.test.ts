@@ -38,8 +38,10 @@ const REALTIME_SOURCE: SessionRecordingSnapshotSource = {
 
 describe('sessionRecordingDataLogic', () => {
     let logic: ReturnType<typeof sessionRecordingDataLogic.build>
+    let realtimeSinceRequested: (string | null)[]
 
     beforeEach(() => {
+        realtimeSinceRequested = []
         useAvailableFeatures([AvailableFeature.RECORDINGS_PERFORMANCE])
         useMocks({
             get: {
@@ -51,7 +53,16 @@ describe('sessionRecordingDataLogic', () => {
                         if (req.params.id === 'has-only-empty-realtime') {
                             return res(ctx.json([]))
                         }
-                        return res(ctx.text(snapshotsAsJSONLines()))
+                        const since = req.url.searchParams.get('since')
+                        realtimeSinceRequested.push(since)
+                        if (since) {
+                            // nothing new has been written since the last poll
+                            return res(ctx.set('X-Realtime-Snapshots-Last-Score', since), ctx.text(''))
+                        }
+                        return res(
+                            ctx.set('X-Realtime-Snapshots-Last-Score', '1706476789217'),
+                            ctx.text(snapshotsAsJSONLines())
+                        )
                     }
 
                     // with no source requested should return sources
@@ -382,6 +393,32 @@ describe('sessionRecordingDataLogic', () => {
                 'loadSnapshotsForSourceSuccess',
             ])
         })
+
+        it('polls for realtime snapshots since the last one loaded, and keeps those already loaded', async () => {
+            await expectLogic(logic, () => {
+                logic.actions.loadSnapshots()
+            }).toDispatchActions([
+                'loadSnapshots',
+                (action) =>
+                    action.type === logic.actionTypes.loadSnapshotsForSourceSuccess &&
+                    action.payload.snapshotsForSource.source?.source === 'realtime',
+            ])
+            const firstLoadedSnapshots = logic.values.snapshotsBySource?.['realtime-realtime']?.snapshots
+
+            await expectLogic(logic).toDispatchActions([
+                'pollRealtimeSnapshots',
+                (action) =>
+                    action.type === logic.actionTypes.loadSnapshotsForSourceSuccess &&
+                    action.payload.snapshotsForSource.source?.source === 'realtime',
+            ])
+
+            expect(realtimeSinceRequested.slice(0, 2)).toEqual([null, '1706476789217'])
+            expect(firstLoadedSnapshots?.length).toBeGreaterThan(0)
+            expect(logic.values.snapshotsBySource?.['realtime-realtime']).toMatchObject({
+                snapshots: firstLoadedSnapshots,
+                realtime_last_score: '1706476789217',
+            })
+        })
     })
 
     describe('empty realtime loading', () => {
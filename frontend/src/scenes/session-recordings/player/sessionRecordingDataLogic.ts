@@ -546,6 +546,7 @@ export const sessionRecordingDataLogic = kea<sessionRecordingDataLogicType>([
             {
                 loadSnapshotsForSource: async ({ source }, breakpoint) => {
                     let params: SessionRecordingSnapshotParams
+                    const previousSnapshotsForSource = values.snapshotsBySource?.[getSourceKey(source)]
 
                     if (source.source === SnapshotSourceType.blob) {
                         if (!source.blob_key) {
@@ -553,7 +554,11 @@ export const sessionRecordingDataLogic = kea<sessionRecordingDataLogicType>([
                         }
                         params = { blob_key: source.blob_key, source: 'blob' }
                     } else if (source.source === SnapshotSourceType.realtime) {
-                        params = { source: 'realtime', version: '2024-04-30' }
+                        params = {
+                            source: 'realtime',
+                            version: '2024-04-30',
+                            since: previousSnapshotsForSource?.realtime_last_score,
+                        }
                     } else {
                         throw new Error(`Unsupported source: ${source.source}`)
                     }
@@ -569,18 +574,35 @@ export const sessionRecordingDataLogic = kea<sessionRecordingDataLogicType>([
                     const response = await api.recordings.getSnapshots(props.sessionRecordingId, params).catch((e) => {
                         if (source.source === 'realtime' && e.status === 404) {
                             // Realtime source is not always available so a 404 is expected
-                            return []
+                            return { snapshots: [], realtimeLastScore: null }
                         }
                         throw e
                     })
 
                     const { transformed, untransformed } = await processEncodedResponse(
-                        response,
+                        response.snapshots,
                         props,
                         values.featureFlags
                     )
 
-                    return { snapshots: transformed, untransformed_snapshots: untransformed ?? undefined, source }
+                    if (params.source === 'realtime' && params.since) {
+                        // polling only loads the snapshots written since the previous response, so add them to those
+                        return {
+                            snapshots: [...(previousSnapshotsForSource?.snapshots ?? []), ...transformed],
+                            untransformed_snapshots: untransformed
+                                ? [...(previousSnapshotsForSource?.untransformed_snapshots ?? []), ...untransformed]
+                                : undefined,
+                            source,
+                            realtime_last_score: response.realtimeLastScore ?? params.since,
+                        }
+                    }
+
+                    return {
+                        snapshots: transformed,
+                        untransformed_snapshots: untransformed ?? undefined,
+                        source,
+                        realtime_last_score: response.realtimeLastScore ?? undefined,
+                    }
                 },
             },
         ],
@@ -949,12 +949,16 @@ export type SessionRecordingSnapshotParams =
           // originally realtime snapshots were returned in a different format than blob snapshots
           // since version 2024-04-30 they are returned in the same format
           version: '2024-04-30'
+          // the X-Realtime-Snapshots-Last-Score of the previous response, to only load snapshots written after it
+          since?: string
       }
 
 export interface SessionRecordingSnapshotSourceResponse {
     source: Pick<SessionRecordingSnapshotSource, 'source' | 'blob_key'>
     snapshots?: RecordingSnapshot[]
     untransformed_snapshots?: RecordingSnapshot[]
+    // where realtime snapshots have been loaded up to, polling asks for only the snapshots after it
+    realtime_last_score?: string
 }
 
 export interface SessionRecordingSnapshotResponse {
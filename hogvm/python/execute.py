@@ -2,7 +2,7 @@ from datetime import timedelta
 import re
 import time
 from copy import deepcopy
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING, cast
 from collections.abc import Callable
 
 from hogvm.python.debugger import debugger, color_bytecode
@@ -15,11 +15,13 @@ from dataclasses import dataclass
 from hogvm.python.utils import (
     UncaughtHogVMException,
     HogVMException,
+    compile_regex,
     get_nested_value,
     like,
     set_nested_value,
     calculate_cost,
     unify_comparison_types,
+    COST_PER_UNIT,
 )
 
 if TYPE_CHECKING:
@@ -30,6 +32,15 @@ MAX_FUNCTION_ARGS_LENGTH = 300
 CALLSTACK_LENGTH = 1000
 
 
+def stl_result_cost(name: str, args: list[Any], args_cost: Optional[list[Optional[int]]]) -> Optional[int]:
+    """Cost of STL function results that can be derived from the cost of their arguments, without walking them"""
+    if args_cost is None or None in args_cost:
+        return None
+    if name in ("arrayPushBack", "arrayPushFront") and len(args) == 2 and isinstance(args[0], list):
+        return cast(int, args_cost[0]) + cast(int, args_cost[1])
+    return None
+
+
 @dataclass
 class BytecodeResult:
     result: Any
@@ -66,6 +77,10 @@ def execute_bytecode(
     declared_functions: dict[str, tuple[int, int]] = {}
     mem_used = 0
     max_mem_used = 0
+    # Costs in `mem_stack` below this index might be out of date, as the values were mutated after they were pushed.
+    # Costs from this index up are still exact, so values copied or combined from there don't need to be walked again.
+    mem_clean_from = 0
+    global_costs: dict[tuple, int] = {}
     ops = 0
     stdout: list[str] = []
     debug_bytecode = []
@@ -118,7 +133,7 @@ def execute_bytecode(
     set_chunk_bytecode()
 
     def stack_keep_first_elements(count: int) -> list[Any]:
-        nonlocal stack, mem_stack, mem_used
+        nonlocal stack, mem_stack, mem_used, mem_clean_from
         if count < 0 or len(stack) < count:
             raise HogVMException("Stack underflow")
         for upvalue in reversed(upvalues):
@@ -132,6 +147,7 @@ def execute_bytecode(
         stack = stack[0:count]
         mem_used -= sum(mem_stack[count:])
         mem_stack = mem_stack[0:count]
+        mem_clean_from = min(mem_clean_from, count)
         return removed
 
     def next_token():
@@ -144,13 +160,35 @@ def execute_bytecode(
     def pop_stack():
         if not stack:
             raise HogVMException("Stack underflow")
-        nonlocal mem_used
+        nonlocal mem_used, mem_clean_from
         mem_used -= mem_stack.pop()
+        mem_clean_from = min(mem_clean_from, len(mem_stack))
         return stack.pop()
 
-    def push_stack(value):
+    def pop_stack_elements(count: int) -> tuple[list[Any], Optional[int]]:
+        """Pops `count` values, returning them and their total cost if it's still exact"""
+        nonlocal stack, mem_stack, mem_used, mem_clean_from
+        start = len(stack) - count
+        elems = stack[start:]
+        costs = mem_stack[start:]
+        stack = stack[:start]
+        mem_stack = mem_stack[:start]
+        mem_used -= sum(costs)
+        cost = sum(costs) if start >= mem_clean_from else None
+        mem_clean_from = min(mem_clean_from, start)
+        return elems, cost
+
+    def stack_cost(index: int) -> Optional[int]:
+        return mem_stack[index] if index >= mem_clean_from else None
+
+    def invalidate_stack_costs():
+        """Call after anything on the stack might have been mutated in place"""
+        nonlocal mem_clean_from
+        mem_clean_from = len(stack)
+
+    def push_stack(value, cost: Optional[int] = None):
         stack.append(value)
-        mem_stack.append(calculate_cost(value))
+        mem_stack.append(calculate_cost(value) if cost is None else cost)
         nonlocal mem_used
         mem_used += mem_stack[-1]
         nonlocal max_mem_used
@@ -268,29 +306,34 @@ def execute_bytecode(
             case Operation.REGEX:
                 args = [pop_stack(), pop_stack()]
                 # TODO: swap this for re2, as used in HogQL/ClickHouse and in the NodeJS VM
-                push_stack(bool(re.search(re.compile(args[1]), args[0])) if args[0] and args[1] else False)
+                push_stack(bool(compile_regex(args[1]).search(args[0])) if args[0] and args[1] else False)
             case Operation.NOT_REGEX:
                 args = [pop_stack(), pop_stack()]
                 # TODO: swap this for re2, as used in HogQL/ClickHouse and in the NodeJS VM
-                push_stack(not bool(re.search(re.compile(args[1]), args[0])) if args[0] and args[1] else False)
+                push_stack(not bool(compile_regex(args[1]).search(args[0])) if args[0] and args[1] else False)
             case Operation.IREGEX:
                 args = [pop_stack(), pop_stack()]
                 push_stack(
-                    bool(re.search(re.compile(args[1], re.RegexFlag.IGNORECASE), args[0]))
+                    bool(compile_regex(args[1], re.RegexFlag.IGNORECASE).search(args[0]))
                     if args[0] and args[1]
                     else False
                 )
             case Operation.NOT_IREGEX:
                 args = [pop_stack(), pop_stack()]
                 push_stack(
-                    not bool(re.search(re.compile(args[1], re.RegexFlag.IGNORECASE), args[0]))
+                    not bool(compile_regex(args[1], re.RegexFlag.IGNORECASE).search(args[0]))
                     if args[0] and args[1]
                     else False
                 )
             case Operation.GET_GLOBAL:
                 chain = [pop_stack() for _ in range(next_token())]
                 if chunk_globals and chain[0] in chunk_globals:
-                    push_stack(deepcopy(get_nested_value(chunk_globals, chain, True)))
+                    # globals are never mutated (we push copies), so their costs only need to be calculated once
+                    global_key = (id(chunk_globals), *chain)
+                    value = deepcopy(get_nested_value(chunk_globals, chain, True))
+                    if global_key not in global_costs:
+                        global_costs[global_key] = calculate_cost(value)
+                    push_stack(value, global_costs[global_key])
                 elif functions and chain[0] in functions:
                     push_stack(
                         new_hog_closure(
@@ -350,14 +393,16 @@ def execute_bytecode(
 
             case Operation.GET_LOCAL:
                 stack_start = 0 if not call_stack else call_stack[-1].stack_start
-                push_stack(stack[next_token() + stack_start])
+                index = next_token() + stack_start
+                push_stack(stack[index], stack_cost(index))
             case Operation.SET_LOCAL:
                 stack_start = 0 if not call_stack else call_stack[-1].stack_start
+                value_cost = stack_cost(len(stack) - 1)
                 value = pop_stack()
                 index = next_token() + stack_start
                 stack[index] = value
                 last_cost = mem_stack[index]
-                mem_stack[index] = calculate_cost(value)
+                mem_stack[index] = calculate_cost(value) if value_cost is None else value_cost
                 mem_used += mem_stack[index] - last_cost
                 max_mem_used = max(mem_used, max_mem_used)
             case Operation.GET_PROPERTY:
@@ -370,34 +415,31 @@ def execute_bytecode(
                 value = pop_stack()
                 field = pop_stack()
                 set_nested_value(pop_stack(), [field], value)
+                invalidate_stack_costs()
             case Operation.DICT:
                 count = next_token()
                 if count > 0:
-                    elems = stack[-(count * 2) :]
-                    stack = stack[: -(count * 2)]
-                    mem_used -= sum(mem_stack[-(count * 2) :])
-                    mem_stack = mem_stack[: -(count * 2)]
-                    push_stack({elems[i]: elems[i + 1] for i in range(0, len(elems), 2)})
+                    elems, elems_cost = pop_stack_elements(count * 2)
+                    dict_value = {elems[i]: elems[i + 1] for i in range(0, len(elems), 2)}
+                    # repeated keys are only counted once
+                    if elems_cost is not None and len(dict_value) == count:
+                        push_stack(dict_value, COST_PER_UNIT + elems_cost)
+                    else:
+                        push_stack(dict_value)
                 else:
                     push_stack({})
             case Operation.ARRAY:
                 count = next_token()
                 if count > 0:
-                    elems = stack[-count:]
-                    stack = stack[:-count]
-                    mem_used -= sum(mem_stack[-count:])
-                    mem_stack = mem_stack[:-count]
-                    push_stack(elems)
+                    elems, elems_cost = pop_stack_elements(count)
+                    push_stack(elems, None if elems_cost is None else COST_PER_UNIT + elems_cost)
                 else:
                     push_stack([])
             case Operation.TUPLE:
                 count = next_token()
                 if count > 0:
-                    elems = stack[-count:]
-                    stack = stack[:-count]
-                    mem_used -= sum(mem_stack[-count:])
-                    mem_stack = mem_stack[:-count]
-                    push_stack(tuple(elems))
+                    elems, elems_cost = pop_stack_elements(count)
+                    push_stack(tuple(elems), None if elems_cost is None else COST_PER_UNIT + elems_cost)
                 else:
                     push_stack(())
             case Operation.JUMP:
@@ -474,6 +516,8 @@ def execute_bytecode(
                     upvalue["value"] = pop_stack()
                 else:
                     stack[upvalue["location"]] = pop_stack()
+                    # the cost in `mem_stack` is still the one of the old value
+                    mem_clean_from = max(mem_clean_from, upvalue["location"] + 1)
             case Operation.CALL_GLOBAL:
                 check_timeout()
                 name = next_token()
@@ -534,13 +578,19 @@ def execute_bytecode(
                             args = [pop_stack() for _ in range(arg_count)]
                         else:
                             args = stack_keep_first_elements(len(stack) - arg_count)
-                        push_stack(functions[name](*args))
+                        result = functions[name](*args)
+                        # we don't know what external functions do with their arguments
+                        invalidate_stack_costs()
+                        push_stack(result)
                     elif name in STL:
                         if version == 0:
                             args = [pop_stack() for _ in range(arg_count)]
+                            args_cost = None
                         else:
+                            args_cost = [stack_cost(index) for index in range(len(stack) - arg_count, len(stack))]
                             args = stack_keep_first_elements(len(stack) - arg_count)
-                        push_stack(STL[name].fn(args, team, stdout, timeout.total_seconds()))
+                        result = STL[name].fn(args, team, stdout, timeout.total_seconds())
+                        push_stack(result, stl_result_cost(name, args, args_cost))
                     elif name in BYTECODE_STL:
                         arg_names = BYTECODE_STL[name][0]
                         if len(arg_names) != arg_count:
@@ -25,7 +25,7 @@ from .date import (
 )
 from .crypto import sha256Hex, md5Hex, sha256HmacChainHex
 from ..objects import is_hog_error, new_hog_error, is_hog_callable, is_hog_closure, to_hog_interval
-from ..utils import like, get_nested_value
+from ..utils import compile_regex, like, get_nested_value
 
 if TYPE_CHECKING:
     from posthog.models import Team
@@ -892,7 +892,7 @@ STL: dict[str, STLFunction] = {
     "match": STLFunction(
         fn=lambda args, team, stdout, timeout: False
         if args[1] is None or args[0] is None
-        else bool(re.search(re.compile(args[1]), args[0])),
+        else bool(compile_regex(args[1]).search(args[0])),
         minArgs=2,
         maxArgs=2,
     ),
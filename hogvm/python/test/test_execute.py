@@ -139,6 +139,26 @@ class TestBytecodeExecute:
         else:
             raise AssertionError("Expected Exception not raised")
 
+    def test_like_patterns(self):
+        # patterns aren't anchored, so plain strings to look for are matched without a regex
+        assert self._run("'/shop/checkout' like '%/checkout%'") is True
+        assert self._run("'/shop/checkout' like '/checkout%'") is True
+        assert self._run("'/shop/checkout' like '%/shop'") is True
+        assert self._run("'/shop/checkout' like '%/basket%'") is False
+        assert self._run("'/shop/checkout' ilike '%/CHECKOUT%'") is True
+        assert self._run("'/shop/checkout' not ilike '%/CHECKOUT%'") is False
+        assert self._run("'/shop/checkout' like '%/CHECKOUT%'") is False
+        assert self._run("'' like '%'") is True
+        # wildcards in the middle still go through the regex
+        assert self._run("'/shop/checkout' like '/shop%out'") is True
+        assert self._run("'/shop/checkout' like '/sh_p'") is True
+        assert self._run("'/shop/checkout' like '/sh_x'") is False
+        assert self._run("'a.b' like 'a.b'") is True
+        assert self._run("'axb' like 'a.b'") is False
+        # case insensitive matching of non-ascii characters follows the regex rules
+        assert self._run("'\u212a' ilike 'k'") is True
+        assert self._run("'ÄPFEL' ilike '%äpfel%'") is True
+
     def test_memory_limits_1(self):
         # let string := 'banana'
         # for (let i := 0; i < 100; i := i + 1) {
@@ -272,6 +292,26 @@ class TestBytecodeExecute:
         else:
             raise AssertionError("Expected Exception not raised")
 
+    def test_memory_limits_with_cached_costs(self):
+        # the costs of globals and of arrays built with arrayPushBack are reused rather than recalculated
+        globals = {"event": {"properties": {f"key_{i}": "x" * 100 for i in range(1000)}}}
+        code = """
+            let events := []
+            for (let i := 0; i < 1000; i := i + 1) {
+                events := arrayPushBack(events, event)
+            }
+            return length(events)
+        """
+        try:
+            self._run_program(code, globals=globals)
+        except Exception as e:
+            assert str(e).startswith("Memory limit of 67108864 bytes exceeded.")
+        else:
+            raise AssertionError("Expected Exception not raised")
+
+        globals = {"event": {"properties": {f"key_{i}": "x" * 100 for i in range(10)}}}
+        assert self._run_program(code, globals=globals) == 1000
+
     def test_functions(self):
         def stringify(*args):
             if args[0] == 1:
@@ -1,8 +1,11 @@
 import re
+from functools import lru_cache
 from typing import Any
 
 
 COST_PER_UNIT = 8
+# compiled LIKE and regex patterns are shared across executions, as filters run the same patterns for every event
+PATTERN_CACHE_SIZE = 1024
 
 
 class HogVMException(Exception):
@@ -26,9 +29,40 @@ class UncaughtHogVMException(HogVMException):
 
 
 def like(string, pattern, flags=0):
-    pattern = re.escape(pattern).replace("%", ".*").replace("_", ".")
-    re_pattern = re.compile(pattern, flags)
-    return re_pattern.search(string) is not None
+    if isinstance(string, str) and isinstance(pattern, str):
+        literal, re_pattern = _compile_like(pattern, flags)
+        if literal is not None:
+            if not flags & re.IGNORECASE:
+                return literal in string
+            # lowercasing only matches re.IGNORECASE for ascii, e.g. "K" (Kelvin sign) matches "k" in a regex
+            if string.isascii():
+                return literal in string.lower()
+        return re_pattern.search(string) is not None
+    return re.compile(_like_to_regex(pattern), flags).search(string) is not None
+
+
+def _like_to_regex(pattern: str) -> str:
+    return re.escape(pattern).replace("%", ".*").replace("_", ".")
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _compile_like(pattern: str, flags: int) -> tuple[str | None, re.Pattern]:
+    """
+    Returns the compiled pattern, and if the pattern is just a string to look for, that string.
+    Patterns aren't anchored, so "%foo%", "foo%", "%foo" and "foo" all match strings containing "foo".
+    """
+    compiled = re.compile(_like_to_regex(pattern), flags)
+    literal = pattern.strip("%")
+    if "%" in literal or "_" in literal:
+        return None, compiled
+    if flags & re.IGNORECASE:
+        return (literal.lower() if literal.isascii() else None), compiled
+    return literal, compiled
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    return re.compile(pattern, flags)
 
 
 def get_nested_value(obj, chain, nullish=False) -> Any:
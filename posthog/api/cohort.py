@@ -1,4 +1,4 @@
-import csv
+import uuid
 
 from django.db import DatabaseError
 from loginas.utils import is_impersonated_session
@@ -53,7 +53,12 @@ from posthog.event_usage import report_user_action
 from posthog.hogql.context import HogQLContext
 from posthog.models import Cohort, FeatureFlag, Person
 from posthog.models.async_deletion import AsyncDeletion, DeletionType
-from posthog.models.cohort.util import get_dependent_cohorts, print_cohort_hogql_query
+from posthog.models.cohort.util import (
+    get_dependent_cohorts,
+    iter_csv_lines,
+    parse_distinct_ids_from_csv,
+    print_cohort_hogql_query,
+)
 from posthog.models.cohort import CohortOrEmpty
 from posthog.models.filters.filter import Filter
 from posthog.models.filters.path_filter import PathFilter
@@ -75,12 +80,14 @@ from posthog.queries.trends.lifecycle_actors import LifecycleActors
 from posthog.queries.util import get_earliest_timestamp
 from posthog.schema import ActorsQuery, HogQLQuery
 from posthog.tasks.calculate_cohort import (
+    calculate_cohort_from_csv,
     calculate_cohort_from_list,
     insert_cohort_from_feature_flag,
     insert_cohort_from_insight_filter,
     update_cohort,
     insert_cohort_from_query,
 )
+from posthog.storage import object_storage
 from posthog.utils import format_query_params_absolute_url
 from prometheus_client import Counter
 
@@ -93,6 +100,9 @@ API_COHORT_PERSON_BYTES_READ_FROM_POSTGRES_COUNTER = Counter(
 
 logger = structlog.get_logger(__name__)
 
+# CSV uploads larger than this are streamed from object storage by the calculation task
+CSV_UPLOAD_STREAMING_THRESHOLD_BYTES = 1024 * 1024
+
 
 class CohortSerializer(serializers.ModelSerializer):
     created_by = UserBasicSerializer(read_only=True)
@@ -169,9 +179,17 @@ class CohortSerializer(serializers.ModelSerializer):
         return cohort
 
     def _calculate_static_by_csv(self, file, cohort: Cohort) -> None:
-        decoded_file = file.read().decode("utf-8").splitlines()
-        reader = csv.reader(decoded_file)
-        distinct_ids_and_emails = [row[0] for row in reader if len(row) > 0 and row]
+        if settings.OBJECT_STORAGE_ENABLED and file.size > CSV_UPLOAD_STREAMING_THRESHOLD_BYTES:
+            # Large uploads are handed over through object storage, so the task can stream them
+            # instead of receiving millions of distinct IDs in a single Celery message
+            file_key = f"{settings.OBJECT_STORAGE_COHORT_UPLOADS_FOLDER}/team-{self.context['team_id']}/cohort-{cohort.pk}/{uuid.uuid4()}.csv"
+            file.seek(0)
+            object_storage.write_stream(file_key, file)
+            calculate_cohort_from_csv.delay(cohort.pk, file_key, team_id=self.context["team_id"])
+            return
+
+        # The distinct IDs travel to the task in its Celery message, so they need to be collected here
+        distinct_ids_and_emails = list(parse_distinct_ids_from_csv(iter_csv_lines(file.chunks())))
         calculate_cohort_from_list.delay(cohort.pk, distinct_ids_and_emails, team_id=self.context["team_id"])
 
     def validate_query(self, query: Optional[dict]) -> Optional[dict]:
@@ -1,7 +1,11 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from typing import Any, Optional, cast
 
 import structlog
+from django.conf import settings
+from django.db import connections
 from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
@@ -32,10 +36,33 @@ from posthog.models.dashboard_templates import DashboardTemplate
 from posthog.models.tagged_item import TaggedItem
 from posthog.models.user import User
 from posthog.user_permissions import UserPermissionsSerializerMixin
-from posthog.utils import filters_override_requested_by_client, variables_override_requested_by_client
+from posthog.caching.calculate_results import get_cache_key_for_query_based_insight
+from posthog.clickhouse.client.limit import get_running_tasks_count
+from posthog.clickhouse.query_tagging import get_query_tags, reset_query_tags, tag_queries
+from posthog.hogql_queries.legacy_compatibility.flagged_conversion_manager import conversion_to_query_based
+from posthog.hogql_queries.query_cache import prefetched_cache_data
+from posthog.hogql_queries.query_runner import (
+    ExecutionMode,
+    execution_mode_from_refresh,
+    shared_insights_execution_mode,
+)
+from posthog.utils import (
+    filters_override_requested_by_client,
+    refresh_requested_by_client,
+    variables_override_requested_by_client,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Execution modes in which tiles may be calculated while the dashboard is being loaded
+BLOCKING_EXECUTION_MODES = {
+    ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
+    ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE,
+    ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS,
+}
+# Execution modes that disregard the cache, so there's nothing to prefetch
+ALWAYS_CALCULATING_EXECUTION_MODES = {ExecutionMode.CALCULATE_BLOCKING_ALWAYS, ExecutionMode.CALCULATE_ASYNC_ALWAYS}
+
 
 class CanEditDashboard(BasePermission):
     message = "You don't have edit permissions for this dashboard."
@@ -399,27 +426,118 @@ class DashboardSerializer(DashboardBasicSerializer):
         # used by insight serializer to load insight filters in correct context
         self.context.update({"dashboard": dashboard})
 
-        serialized_tiles = []
-
-        tiles = DashboardTile.dashboard_queryset(dashboard.tiles).prefetch_related(
-            Prefetch(
-                "insight__tagged_items",
-                queryset=TaggedItem.objects.select_related("tag"),
-                to_attr="prefetched_tags",
+        tiles = list(
+            DashboardTile.dashboard_queryset(dashboard.tiles).prefetch_related(
+                Prefetch(
+                    "insight__tagged_items",
+                    queryset=TaggedItem.objects.select_related("tag"),
+                    to_attr="prefetched_tags",
+                )
             )
         )
-        self.user_permissions.set_preloaded_dashboard_tiles(list(tiles))
+        self.user_permissions.set_preloaded_dashboard_tiles(tiles)
 
-        for tile in tiles:
-            self.context.update({"dashboard_tile": tile})
+        execution_mode = self._tiles_execution_mode()
+        tile_cache_keys = (
+            {} if execution_mode in ALWAYS_CALCULATING_EXECUTION_MODES else self._tiles_cache_keys(tiles, dashboard)
+        )
 
-            if isinstance(tile.layouts, str):
-                tile.layouts = json.loads(tile.layouts)
+        # All cached results are read from Redis in one go, instead of one round-trip per tile
+        with prefetched_cache_data(tile_cache_keys.values()):
+            if execution_mode in BLOCKING_EXECUTION_MODES and settings.DASHBOARD_TILES_MAX_CONCURRENCY > 1:
+                return self._serialize_tiles_concurrently(tiles, tile_cache_keys)
+            return [self._serialize_tile(tile) for tile in tiles]
+
+    def _serialize_tile(self, tile: DashboardTile) -> ReturnDict:
+        if isinstance(tile.layouts, str):
+            tile.layouts = json.loads(tile.layouts)
+
+        # each tile gets its own context, so that tiles don't see each other's state
+        return DashboardTileSerializer(tile, many=False, context={**self.context, "dashboard_tile": tile}).data
+
+    def _serialize_tiles_concurrently(
+        self, tiles: list[DashboardTile], tile_cache_keys: dict[int, str]
+    ) -> list[ReturnDict]:
+        # Tiles sharing a cache key are serialized one after another, so that only the first one calculates
+        # and the rest read its result
+        tile_groups: dict[int | str, list[int]] = {}
+        for index, tile in enumerate(tiles):
+            tile_groups.setdefault(tile_cache_keys.get(tile.pk, tile.pk), []).append(index)
+
+        max_workers = min(settings.DASHBOARD_TILES_MAX_CONCURRENCY, len(tile_groups), self._free_query_slots())
+        if max_workers <= 1:
+            return [self._serialize_tile(tile) for tile in tiles]
+
+        query_tags = dict(get_query_tags())
+
+        def serialize_tiles_in_thread(tile_group: list[DashboardTile]) -> list[ReturnDict]:
+            # query tags are thread-local, so they're carried over from the request's thread
+            reset_query_tags()
+            tag_queries(**query_tags)
+            try:
+                return [self._serialize_tile(tile) for tile in tile_group]
+            finally:
+                connections.close_all()
+
+        serialized_tiles: list[Optional[ReturnDict]] = [None] * len(tiles)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # contexts are copied per group, so the prefetched cache data is visible in the worker threads
+            futures = [
+                (indexes, executor.submit(copy_context().run, serialize_tiles_in_thread, [tiles[i] for i in indexes]))
+                for indexes in tile_groups.values()
+            ]
+            for indexes, future in futures:
+                for index, serialized_tile in zip(indexes, future.result()):
+                    serialized_tiles[index] = serialized_tile
+        return cast(list[ReturnDict], serialized_tiles)
+
+    def _free_query_slots(self) -> int:
+        """
+        How many more queries the team may run at once, going by the same per-team limit as query tasks.
+        Tiles are calculated one at a time if the team is already at its limit.
+        """
+        from posthog.tasks.tasks import TEAM_QUERIES_CONCURRENCY_LIMIT, process_query_task
 
-            tile_data = DashboardTileSerializer(tile, many=False, context=self.context).data
-            serialized_tiles.append(tile_data)
+        try:
+            running_queries = get_running_tasks_count(process_query_task.name, self.context["get_team"]().pk)
+        except Exception as e:
+            logger.warning("dashboard_tiles_running_queries_count_failed", exc_info=e)
+            return 1
+        return TEAM_QUERIES_CONCURRENCY_LIMIT - running_queries
+
+    def _tiles_execution_mode(self) -> ExecutionMode:
+        execution_mode = execution_mode_from_refresh(refresh_requested_by_client(self.context["request"]))
+        if self.context.get("is_shared", False):
+            execution_mode = shared_insights_execution_mode(execution_mode)
+        return execution_mode
+
+    def _tiles_cache_keys(self, tiles: list[DashboardTile], dashboard: Dashboard) -> dict[int, str]:
+        """
+        Cache keys of the tiles' insights, by tile ID.
+        """
+        request = self.context["request"]
+        filters_override = filters_override_requested_by_client(request)
+        variables_override = variables_override_requested_by_client(request)
 
-        return serialized_tiles
+        cache_keys = {}
+        for tile in tiles:
+            if tile.insight is None or tile.insight.deleted:
+                continue
+            try:
+                with conversion_to_query_based(tile.insight):
+                    cache_key = get_cache_key_for_query_based_insight(
+                        tile.insight,
+                        team=self.context["get_team"](),
+                        dashboard=dashboard,
+                        filters_override=filters_override,
+                        variables_override=variables_override,
+                    )
+            except Exception:
+                # The tile is left to be read on its own, where any error with its query surfaces as before
+                continue
+            if cache_key is not None:
+                cache_keys[tile.pk] = cache_key
+        return cache_keys
 
     def get_filters(self, dashboard: Dashboard) -> dict:
         request = self.context.get("request")
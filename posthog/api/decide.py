@@ -1,9 +1,10 @@
 from random import random
-from typing import Any, Union
+from typing import Any, Optional, Union
 
+import orjson
 import structlog
 from django.conf import settings
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from prometheus_client import Counter
 from rest_framework import status
@@ -29,7 +30,7 @@ from posthog.models import Team, User
 from posthog.models.feature_flag import get_all_feature_flags
 from posthog.models.feature_flag.flag_analytics import increment_request_count
 from posthog.models.filters.mixins.utils import process_bool
-from posthog.models.remote_config import RemoteConfig
+from posthog.models.remote_config import RemoteConfig, convert_config_for_decide
 from posthog.models.utils import execute_with_timeout
 from posthog.plugins.site import get_decide_site_apps
 from posthog.utils import (
@@ -52,7 +53,7 @@ REMOTE_CONFIG_CACHE_COUNTER = Counter(
 )
 
 
-def get_base_config(token: str, team: Team, request: HttpRequest, skip_db: bool = False) -> dict:
+def _should_use_remote_config(request: HttpRequest) -> bool:
     use_remote_config = False
 
     # Explicitly set via query param for testing otherwise rollout percentage
@@ -66,20 +67,14 @@ def get_base_config(token: str, team: Team, request: HttpRequest, skip_db: bool
 
     REMOTE_CONFIG_CACHE_COUNTER.labels(result=use_remote_config).inc()
 
-    if use_remote_config:
-        response = RemoteConfig.get_config_via_token(token, request=request)
-
-        # Add in a bunch of backwards compatibility stuff
-        response["isAuthenticated"] = False
-        response["toolbarParams"] = {}
-        response["config"] = {"enable_collect_everything": True}
-        response["surveys"] = True if len(response["surveys"]) > 0 else False
+    return use_remote_config
 
-        # Remove some stuff that is specific to the new RemoteConfig
-        del response["hasFeatureFlags"]
-        del response["token"]
 
-        return response
+def get_base_config(
+    token: str, team: Team, request: HttpRequest, skip_db: bool = False, use_remote_config: bool = False
+) -> dict:
+    if use_remote_config:
+        return convert_config_for_decide(RemoteConfig.get_config_via_token(token, request=request))
 
     response = {
         "config": {"enable_collect_everything": True},
@@ -265,6 +260,7 @@ def get_decide(request: HttpRequest):
 
         disable_flags = process_bool(data.get("disable_flags")) is True
         feature_flags = None
+        serialized_response: Optional[bytes] = None
         errors = False
         flags_response: dict[str, Any] = {}
 
@@ -328,8 +324,18 @@ def get_decide(request: HttpRequest):
             flags_response["featureFlags"] = {}
 
         # NOTE: Changed code - everything not feature flags goes in here
-        response = get_base_config(token, team, request, skip_db=errors)
-        response.update(flags_response)
+        use_remote_config = _should_use_remote_config(request)
+        serialized_config = (
+            RemoteConfig.get_serialized_decide_config_via_token(token, request=request) if use_remote_config else None
+        )
+
+        if serialized_config:
+            # The config is a serialized JSON object without any of the flag keys,
+            # so we can splice the flags into it instead of building and serializing the whole response
+            serialized_response = serialized_config[:-1] + b"," + orjson.dumps(flags_response)[1:]
+        else:
+            response = get_base_config(token, team, request, skip_db=errors, use_remote_config=use_remote_config)
+            response.update(flags_response)
 
         # NOTE: Whenever you add something to decide response, update this test:
         # `test_decide_doesnt_error_out_when_database_is_down`
@@ -358,6 +364,8 @@ def get_decide(request: HttpRequest):
         )
 
     statsd.incr(f"posthog_cloud_raw_endpoint_success", tags={"endpoint": "decide"})
+    if serialized_response is not None:
+        return cors_response(request, HttpResponse(serialized_response, content_type="application/json"))
     return cors_response(request, JsonResponse(response))
 
 
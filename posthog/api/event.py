@@ -26,6 +26,7 @@ from posthog.models.person.util import get_persons_by_distinct_ids
 from posthog.models.team import Team
 from posthog.models.utils import UUIDT
 from posthog.queries.property_values import get_property_values_for_key
+from posthog.queries.property_values_index import get_indexed_property_values
 from posthog.rate_limit import (
     ClickHouseBurstRateThrottle,
     ClickHouseSustainedRateThrottle,
@@ -270,7 +271,11 @@ class EventViewSet(
             events = sync_execute(GET_CUSTOM_EVENTS, {"team_id": team.pk}, team_id=team.pk)
             return response.Response([{"name": event[0]} for event in events])
         elif key:
-            result = get_property_values_for_key(key, team, event_names, value=request.GET.get("value"))
+            result = None
+            if not event_names:
+                result = get_indexed_property_values("event", team.pk, key, request.GET.get("value"), limit=10)
+            if result is None:
+                result = get_property_values_for_key(key, team, event_names, value=request.GET.get("value"))
 
             for value in result:
                 try:
@@ -70,6 +70,7 @@ from posthog.queries.paths import PathsActors
 from posthog.queries.person_query import PersonQuery
 from posthog.queries.properties_timeline import PropertiesTimeline
 from posthog.queries.property_values import get_person_property_values_for_key
+from posthog.queries.property_values_index import get_indexed_property_values
 from posthog.queries.retention import Retention
 from posthog.queries.stickiness import Stickiness
 from posthog.queries.trends.lifecycle import Lifecycle
@@ -483,7 +484,9 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
     @timed("get_person_property_values_for_key_timer")
     def _get_person_property_values_for_key(self, key, value):
         try:
-            result = get_person_property_values_for_key(key, self.team, value)
+            result = get_indexed_property_values("person", self.team.pk, key, value, limit=20)
+            if result is None:
+                result = get_person_property_values_for_key(key, self.team, value)
             statsd.incr(
                 "get_person_property_values_for_key_success",
                 tags={"team_id": self.team.id},
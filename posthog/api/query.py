@@ -126,7 +126,17 @@ class QueryViewSet(TeamAndOrgViewSetMixin, PydanticModelMixin, viewsets.ViewSet)
         show_progress = (
             show_progress or request.query_params.get("showProgress", False) == "true"
         )  # TODO: Remove this once we have a consistent naming convention
-        query_status = get_query_status(team_id=self.team.pk, query_id=pk, show_progress=show_progress)
+        try:
+            offset = int(request.query_params.get("offset", 0))
+            limit = int(request.query_params["limit"]) if "limit" in request.query_params else None
+        except ValueError:
+            raise ValidationError("offset and limit must be integers")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValidationError("offset and limit must not be negative")
+
+        query_status = get_query_status(
+            team_id=self.team.pk, query_id=pk, show_progress=show_progress, offset=offset, limit=limit
+        )
         query_status_response = QueryStatusResponse(query_status=query_status)
 
         http_code: int = status.HTTP_202_ACCEPTED
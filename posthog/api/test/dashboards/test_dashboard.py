@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from unittest import mock
 from unittest.mock import ANY, MagicMock, patch
 
@@ -255,6 +256,72 @@ class TestDashboard(APIBaseTest, QueryMatchingTest):
         )
         self.assertEqual(response["tiles"][0]["insight"]["result"][0]["count"], 0)
 
+    def test_cached_results_of_all_tiles_are_read_at_once(self):
+        dashboard = Dashboard.objects.create(team=self.team, name="dashboard")
+        query = {
+            "kind": "TrendsQuery",
+            "series": [{"kind": "EventsNode", "event": "$pageview"}],
+            "properties": [{"type": "event", "key": "$browser", "value": "Mac OS X"}],
+        }
+        for short_id in ("item11", "item22"):
+            insight = Insight.objects.create(query=query, team=self.team, short_id=short_id)
+            DashboardTile.objects.create(dashboard=dashboard, insight=insight)
+            self.client.get(f"/api/projects/{self.team.id}/insights/{insight.pk}?refresh=true")
+
+        with patch("posthog.hogql_queries.query_cache.get_safe_cache") as mock_get_safe_cache:
+            response = self.dashboard_api.get_dashboard(dashboard.pk, query_params={"refresh": False})
+
+        mock_get_safe_cache.assert_not_called()
+        self.assertEqual([tile["is_cached"] for tile in response["tiles"]], [True, True])
+        self.assertEqual(response["tiles"][0]["insight"]["result"][0]["count"], 0)
+
+    @override_settings(DASHBOARD_TILES_MAX_CONCURRENCY=2)
+    @patch("posthog.api.dashboards.dashboard.get_running_tasks_count", return_value=0)
+    @patch("posthog.api.dashboards.dashboard.ThreadPoolExecutor")
+    def test_tiles_sharing_a_cache_key_are_calculated_in_one_thread(
+        self, mock_thread_pool_executor, _mock_get_running_tasks_count
+    ):
+        executor = mock_thread_pool_executor.return_value.__enter__.return_value
+
+        def submit(fn, *args):
+            future: Future = Future()
+            future.set_result(fn(*args))
+            return future
+
+        executor.submit.side_effect = submit
+
+        dashboard = Dashboard.objects.create(team=self.team, name="dashboard")
+        pageviews_query = {"kind": "TrendsQuery", "series": [{"kind": "EventsNode", "event": "$pageview"}]}
+        signups_query = {"kind": "TrendsQuery", "series": [{"kind": "EventsNode", "event": "$signup"}]}
+        for short_id, query in (("item11", pageviews_query), ("item22", signups_query), ("item33", pageviews_query)):
+            insight = Insight.objects.create(query=query, team=self.team, short_id=short_id)
+            DashboardTile.objects.create(dashboard=dashboard, insight=insight)
+
+        response = self.dashboard_api.get_dashboard(dashboard.pk, query_params={"refresh": "blocking"})
+
+        mock_thread_pool_executor.assert_called_once_with(max_workers=2)
+        # the two pageview tiles are serialized in the same thread, the second one from the first one's cache
+        self.assertEqual(executor.submit.call_count, 2)
+        self.assertEqual([tile["insight"]["short_id"] for tile in response["tiles"]], ["item11", "item22", "item33"])
+        self.assertEqual([tile["is_cached"] for tile in response["tiles"]], [False, False, True])
+
+    @override_settings(DASHBOARD_TILES_MAX_CONCURRENCY=2)
+    @patch("posthog.api.dashboards.dashboard.get_running_tasks_count", return_value=10)
+    @patch("posthog.api.dashboards.dashboard.ThreadPoolExecutor")
+    def test_tiles_are_calculated_serially_when_team_is_at_its_query_limit(
+        self, mock_thread_pool_executor, _mock_get_running_tasks_count
+    ):
+        dashboard = Dashboard.objects.create(team=self.team, name="dashboard")
+        for short_id, event in (("item11", "$pageview"), ("item22", "$signup")):
+            query = {"kind": "TrendsQuery", "series": [{"kind": "EventsNode", "event": event}]}
+            insight = Insight.objects.create(query=query, team=self.team, short_id=short_id)
+            DashboardTile.objects.create(dashboard=dashboard, insight=insight)
+
+        response = self.dashboard_api.get_dashboard(dashboard.pk, query_params={"refresh": True})
+
+        mock_thread_pool_executor.assert_not_called()
+        self.assertEqual(len(response["tiles"]), 2)
+
     # :KLUDGE: avoid making extra queries that are explicitly not cached in tests. Avoids false N+1-s.
     @override_settings(PERSON_ON_EVENTS_OVERRIDE=False, PERSON_ON_EVENTS_V2_OVERRIDE=False)
     @snapshot_postgres_queries
@@ -334,6 +334,38 @@ User ID,
         self.assertFalse(Cohort.objects.get(pk=response.json()["id"]).is_calculating)
         self.assertEqual(Cohort.objects.get(pk=response.json()["id"]).name, "test2")
 
+    @patch("posthog.api.cohort.CSV_UPLOAD_STREAMING_THRESHOLD_BYTES", 10)
+    @patch("posthog.storage.object_storage.write_stream")
+    @patch("posthog.tasks.calculate_cohort.calculate_cohort_from_csv.delay")
+    @patch("posthog.tasks.calculate_cohort.calculate_cohort_from_list.delay")
+    def test_static_cohort_large_csv_upload_is_streamed_from_object_storage(
+        self, patch_calculate_cohort_from_list, patch_calculate_cohort_from_csv, patch_object_storage_write_stream
+    ):
+        uploaded_contents = []
+        patch_object_storage_write_stream.side_effect = lambda file_key, fileobj: uploaded_contents.append(
+            fileobj.read()
+        )
+
+        csv = SimpleUploadedFile(
+            "example.csv",
+            str.encode("User ID,\nemail@example.org,\n123\n"),
+            content_type="application/csv",
+        )
+
+        with self.settings(OBJECT_STORAGE_ENABLED=True):
+            response = self.client.post(
+                f"/api/projects/{self.team.id}/cohorts/",
+                {"name": "test", "csv": csv, "is_static": True},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(patch_calculate_cohort_from_list.call_count, 0)
+
+        file_key, _ = patch_object_storage_write_stream.call_args[0]
+        self.assertTrue(file_key.startswith(f"cohort_uploads/team-{self.team.id}/cohort-{response.json()['id']}/"))
+        self.assertEqual(uploaded_contents, [b"User ID,\nemail@example.org,\n123\n"])
+        patch_calculate_cohort_from_csv.assert_called_once_with(response.json()["id"], file_key, team_id=self.team.id)
+
     @patch("posthog.tasks.calculate_cohort.calculate_cohort_from_list.delay")
     @patch("posthog.tasks.calculate_cohort.calculate_cohort_ch.delay")
     def test_static_cohort_to_dynamic_cohort(self, patch_calculate_cohort, patch_calculate_cohort_from_list):
@@ -43,7 +43,7 @@ from posthog.models.organization import Organization, OrganizationMembership
 from posthog.models.person import PersonDistinctId
 from posthog.models.personal_api_key import hash_key_value
 from posthog.models.plugin import sync_team_inject_web_apps
-from posthog.models.remote_config import RemoteConfig
+from posthog.models.remote_config import RemoteConfig, cache_key_for_team_token_decide
 from posthog.models.team.team import Team
 from posthog.models.user import User
 from posthog.models.utils import generate_random_token_personal
@@ -3595,10 +3595,12 @@ class TestDecideRemoteConfig(TestDecide):
         # NOTE: This is a sanity check test that we aren't just using the old decide logic
 
         with patch.object(
-            RemoteConfig, "get_config_via_token", wraps=RemoteConfig.get_config_via_token
-        ) as wrapped_get_config_via_token:
+            RemoteConfig,
+            "get_serialized_decide_config_via_token",
+            wraps=RemoteConfig.get_serialized_decide_config_via_token,
+        ) as wrapped_get_serialized_decide_config_via_token:
             response = self._post_decide(api_version=3)
-            wrapped_get_config_via_token.assert_called_once()
+            wrapped_get_serialized_decide_config_via_token.assert_called_once()
 
         # NOTE: If this changes it indicates something is wrong as we should keep this exact format
         # for backwards compatibility
@@ -3625,6 +3627,36 @@ class TestDecideRemoteConfig(TestDecide):
             }
         )
 
+    def test_splices_flags_into_serialized_config(self, *args):
+        FeatureFlag.objects.create(
+            team=self.team, rollout_percentage=100, name="Beta feature", key="beta-feature", created_by=self.user
+        )
+
+        response = self._post_decide(api_version=3)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        assert response.json()["featureFlags"] == {"beta-feature": True}
+        assert response.json()["errorsWhileComputingFlags"] is False
+        assert response.json()["siteApps"] == []
+
+    def test_falls_back_to_building_config_when_serialized_config_is_missing(self, *args):
+        self._post_decide(api_version=3)
+        cache.delete(cache_key_for_team_token_decide(self.team.api_token))
+
+        with patch.object(
+            RemoteConfig, "get_config_via_token", wraps=RemoteConfig.get_config_via_token
+        ) as wrapped_get_config_via_token:
+            response = self.client.post(
+                "/decide/?v=3&use_remote_config=true",
+                {"data": self._dict_to_b64({"token": self.team.api_token, "distinct_id": "example_id"})},
+                HTTP_ORIGIN="http://127.0.0.1:8000",
+            )
+            wrapped_get_config_via_token.assert_called_once()
+
+        assert response.status_code == 200
+        assert response.json()["featureFlags"] == {}
+        assert response.json()["surveys"] is False
+
 
 class TestDatabaseCheckForDecide(BaseTest, QueryMatchingTest):
     """
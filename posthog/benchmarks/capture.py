@@ -0,0 +1,64 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from . import helpers  # noqa: F401
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from posthog.api.capture import build_kafka_event_data
+from posthog.kafka_client.client import _KafkaProducer
+from posthog.models.utils import UUIDT
+
+
+def _event(index: int, property_count: int) -> dict[str, Any]:
+    return {
+        "event": "$pageview",
+        "distinct_id": f"user-{index}",
+        "timestamp": "2024-01-01T00:00:00.000Z",
+        "properties": {
+            "$current_url": "https://example.com/pricing?utm_source=newsletter",
+            "$browser": "Chrome",
+            "$lib": "web",
+            "$set": {"email": f"user-{index}@example.com", "name": "Ünïcödé Üser"},
+            **{f"custom_property_{i}": f"value {i} " * 4 for i in range(property_count)},
+        },
+    }
+
+
+class CaptureKafkaSerializationSuite:
+    """Turning a /batch request into Kafka message values, as capture does for every event."""
+
+    params = ([1, 500], [10, 200])
+    param_names = ["batch_size", "property_count"]
+    version = "v001"
+
+    def setup(self, batch_size: int, property_count: int):
+        self.events = [_event(index, property_count) for index in range(batch_size)]
+        self.now = datetime.now(UTC)
+
+    def _serialize_batch(self):
+        for event in self.events:
+            data = build_kafka_event_data(
+                distinct_id=event["distinct_id"],
+                ip="127.0.0.1",
+                site_url="http://localhost:8000",
+                data=event,
+                now=self.now,
+                sent_at=self.now,
+                event_uuid=UUIDT(),
+                token="phc_benchmark",
+            )
+            _KafkaProducer.json_serializer(data)
+
+    def time_serialize_batch(self, batch_size: int, property_count: int):
+        self._serialize_batch()
+
+    def track_events_per_second(self, batch_size: int, property_count: int):
+        start = time.perf_counter()
+        iterations = 0
+        while time.perf_counter() - start < 1:
+            self._serialize_batch()
+            iterations += 1
+        return iterations * batch_size / (time.perf_counter() - start)
+
+    track_events_per_second.unit = "events/s"  # type: ignore
@@ -0,0 +1,39 @@
+import os
+import sys
+from collections.abc import Callable
+from os.path import dirname
+from unittest.mock import patch
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "posthog.settings")
+sys.path.append(dirname(dirname(dirname(__file__))))
+
+import django  # noqa: E402
+
+django.setup()
+
+from posthog.models import Organization, Team  # noqa: E402
+from posthog.settings import EE_AVAILABLE  # noqa: E402
+
+BENCHMARK_TEAM_NAME = "Offline benchmarks"
+
+
+def get_or_create_team() -> Team:
+    "Returns the fixture team used by the offline benchmarks. Only needs Postgres."
+    team = Team.objects.filter(name=BENCHMARK_TEAM_NAME).first()
+    if team is None:
+        organization = Organization.objects.create(name=BENCHMARK_TEAM_NAME)
+        team = Team.objects.create(organization=organization, name=BENCHMARK_TEAM_NAME)
+    return team
+
+
+def skip_materialized_columns_lookup() -> Callable[[], None]:
+    """
+    Makes the printer see no materialized columns, so printing queries doesn't need ClickHouse.
+    Returns a function that undoes it, for the suite's `teardown`.
+    """
+    if not EE_AVAILABLE:
+        return lambda: None
+
+    patcher = patch("posthog.clickhouse.materialized_columns.get_enabled_materialized_columns", return_value={})
+    patcher.start()
+    return patcher.stop
@@ -0,0 +1,166 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import get_or_create_team, skip_materialized_columns_lookup
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from posthog.hogql.context import HogQLContext
+from posthog.hogql.database.database import create_hogql_database
+from posthog.hogql.printer import prepare_ast_for_printing, print_prepared_ast
+from posthog.hogql.visitor import clone_expr
+from posthog.hogql_queries.query_runner import get_query_runner
+from posthog.schema import (
+    BreakdownFilter,
+    DateRange,
+    EventPropertyFilter,
+    EventsNode,
+    EventsQuery,
+    FunnelsQuery,
+    HogQLQuery,
+    HogQLQueryResponse,
+    LifecycleQuery,
+    PathsFilter,
+    PathsQuery,
+    PropertyOperator,
+    RetentionFilter,
+    RetentionQuery,
+    StickinessQuery,
+    TrendsQuery,
+    WebOverviewQuery,
+    WebStatsBreakdown,
+    WebStatsTableQuery,
+)
+
+DATE_RANGE = DateRange(date_from="-30d")
+PAGEVIEW = EventsNode(event="$pageview")
+PAGELEAVE = EventsNode(event="$pageleave")
+CHROME_ONLY = [EventPropertyFilter(key="$browser", operator=PropertyOperator.EXACT, value="Chrome")]
+
+QUERIES = {
+    "TrendsQuery": TrendsQuery(series=[PAGEVIEW], dateRange=DATE_RANGE),
+    "TrendsQuery with breakdown": TrendsQuery(
+        series=[PAGEVIEW, PAGELEAVE],
+        dateRange=DATE_RANGE,
+        breakdownFilter=BreakdownFilter(breakdown="$browser"),
+        properties=CHROME_ONLY,
+    ),
+    "FunnelsQuery": FunnelsQuery(series=[PAGEVIEW, PAGELEAVE, EventsNode(event="$autocapture")], dateRange=DATE_RANGE),
+    "RetentionQuery": RetentionQuery(retentionFilter=RetentionFilter(), dateRange=DATE_RANGE),
+    "PathsQuery": PathsQuery(pathsFilter=PathsFilter(), dateRange=DATE_RANGE),
+    "StickinessQuery": StickinessQuery(series=[PAGEVIEW], dateRange=DATE_RANGE),
+    "LifecycleQuery": LifecycleQuery(series=[PAGEVIEW], dateRange=DATE_RANGE),
+    "EventsQuery": EventsQuery(select=["*", "event", "person", "timestamp"], properties=CHROME_ONLY),
+    "HogQLQuery": HogQLQuery(
+        query="select event, count() from events where timestamp > now() - interval 1 day group by event"
+    ),
+    "WebOverviewQuery": WebOverviewQuery(properties=[], dateRange=DATE_RANGE),
+    "WebStatsTableQuery": WebStatsTableQuery(
+        breakdownBy=WebStatsBreakdown.PAGE, properties=[], dateRange=DATE_RANGE, includeBounceRate=True
+    ),
+}
+
+
+class HogQLCompilerSuite:
+    """
+    Compiling insight queries down to ClickHouse SQL, per query runner kind. This is the work done on every
+    uncached query before ClickHouse sees it, so it's measured without a ClickHouse node.
+    """
+
+    params = list(QUERIES.keys())
+    param_names = ["query_kind"]
+    # Printing mutates the AST, so every sample needs a fresh copy prepared by `setup`
+    number = 1
+    repeat = (10, 50, 20.0)
+    warmup_time = 0
+    version = "v001"
+
+    def setup(self, query_kind: str):
+        self.stop_skipping_materialized_columns_lookup = skip_materialized_columns_lookup()
+        self.team = get_or_create_team()
+        self.runner = get_query_runner(QUERIES[query_kind], self.team)
+        self.database = create_hogql_database(self.team.pk, self.runner.modifiers, self.team)
+
+        query = self.runner.to_query()
+        self.query_to_prepare = clone_expr(query)
+        self.prepared_context = self._context()
+        prepared_query = prepare_ast_for_printing(clone_expr(query), self.prepared_context, "clickhouse")
+        assert prepared_query is not None
+        self.prepared_query = prepared_query
+
+    def teardown(self, query_kind: str):
+        self.stop_skipping_materialized_columns_lookup()
+
+    def _context(self) -> HogQLContext:
+        return HogQLContext(
+            team_id=self.team.pk,
+            team=self.team,
+            enable_select_queries=True,
+            modifiers=self.runner.modifiers,
+            database=self.database,
+        )
+
+    def time_to_query(self, query_kind: str):
+        get_query_runner(QUERIES[query_kind], self.team).to_query()
+
+    def time_prepare_ast_for_printing(self, query_kind: str):
+        prepare_ast_for_printing(self.query_to_prepare, self._context(), "clickhouse")
+
+    def time_print_prepared_ast(self, query_kind: str):
+        print_prepared_ast(self.prepared_query, self.prepared_context, "clickhouse")
+
+
+def _days(count: int) -> list[datetime]:
+    start = datetime(2024, 1, 1, tzinfo=ZoneInfo("UTC"))
+    return [start + timedelta(days=day) for day in range(count)]
+
+
+def _trends_results() -> HogQLQueryResponse:
+    days = _days(31)
+    return HogQLQueryResponse(
+        columns=["date", "total", "breakdown_value"],
+        results=[[days, [(day + index) % 97 for day in range(31)], f"Browser {index}"] for index in range(25)],
+    )
+
+
+def _lifecycle_results() -> HogQLQueryResponse:
+    days = _days(31)
+    return HogQLQueryResponse(
+        columns=["date", "total", "status"],
+        results=[
+            [days, [day % 13 for day in range(31)], status]
+            for status in ("new", "returning", "resurrecting", "dormant")
+        ],
+    )
+
+
+SYNTHETIC_RESULTS: dict[str, tuple[str, Any]] = {
+    "TrendsQuery with breakdown": ("posthog.hogql_queries.insights.trends.trends_query_runner", _trends_results),
+    "LifecycleQuery": ("posthog.hogql_queries.insights.lifecycle_query_runner", _lifecycle_results),
+}
+
+
+class ResultPostProcessingSuite:
+    """
+    `calculate()` with ClickHouse swapped out for synthetic results. Subtract `HogQLCompilerSuite.time_to_query`
+    to get the time spent turning rows into the insight response.
+    """
+
+    params = list(SYNTHETIC_RESULTS.keys())
+    param_names = ["query_kind"]
+    version = "v001"
+
+    def setup(self, query_kind: str):
+        self.stop_skipping_materialized_columns_lookup = skip_materialized_columns_lookup()
+        self.team = get_or_create_team()
+        module, build_response = SYNTHETIC_RESULTS[query_kind]
+        self.patcher = patch(f"{module}.execute_hogql_query", return_value=build_response())
+        self.patcher.start()
+
+    def teardown(self, query_kind: str):
+        self.patcher.stop()
+        self.stop_skipping_materialized_columns_lookup()
+
+    def time_calculate(self, query_kind: str):
+        get_query_runner(QUERIES[query_kind], self.team).calculate()
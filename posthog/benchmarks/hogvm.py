@@ -0,0 +1,74 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from . import helpers  # noqa: F401
+from typing import Any
+
+from hogvm.python.execute import execute_bytecode
+from posthog.hogql.compiler.bytecode import create_bytecode
+from posthog.hogql.parser import parse_program
+
+
+def _event(size_bytes: int) -> dict[str, Any]:
+    properties: dict[str, Any] = {
+        "$browser": "Chrome",
+        "$current_url": "https://example.com/checkout/step-2?utm_source=newsletter",
+        "$lib": "web",
+    }
+    index = 0
+    while sum(len(key) + len(str(value)) for key, value in properties.items()) < size_bytes:
+        properties[f"custom_property_{index}"] = f"value {index} " * 8
+        index += 1
+    return {
+        "event": "$pageview",
+        "distinct_id": "some-distinct-id",
+        "properties": properties,
+        "elements_chain": "",
+    }
+
+
+PROGRAMS = {
+    # reads a few properties off a large event many times, as HogFunction filters and templates do
+    "read_properties": """
+        let matches := 0
+        for (let i := 0; i < 200; i := i + 1) {
+            if (event.properties.$browser = 'Chrome' and event.properties.$lib = 'web') {
+                matches := matches + 1
+            }
+        }
+        return matches
+    """,
+    # copies the event into a local and walks all of its properties
+    "iterate_properties": """
+        let props := event.properties
+        let count := 0
+        for (let key, value in props) {
+            if (props[key] != null) {
+                count := count + 1
+            }
+        }
+        return count
+    """,
+    # builds an array from the properties in a loop
+    "build_array": """
+        let values := []
+        for (let key, value in event.properties) {
+            values := arrayPushBack(values, value)
+        }
+        return length(values)
+    """,
+}
+
+
+class HogVMSuite:
+    """Executing Hog programs against events with large (100KB+) payloads."""
+
+    params = (list(PROGRAMS.keys()), [100_000, 500_000])
+    param_names = ["program", "event_size_bytes"]
+    version = "v001"
+
+    def setup(self, program: str, event_size_bytes: int):
+        self.bytecode = create_bytecode(parse_program(PROGRAMS[program])).bytecode
+        self.globals = {"event": _event(event_size_bytes)}
+
+    def time_execute(self, program: str, event_size_bytes: int):
+        execute_bytecode(self.bytecode, self.globals)
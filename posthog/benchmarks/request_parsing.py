@@ -0,0 +1,89 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from . import helpers  # noqa: F401
+
+import base64
+import gzip
+import json
+import uuid
+
+from posthog.utils import decompress
+
+
+def _pageview(index: int) -> dict:
+    # Roughly what posthog-js sends for an autocaptured pageview
+    return {
+        "uuid": str(uuid.UUID(int=index)),
+        "event": "$pageview",
+        "properties": {
+            "$os": "Mac OS X",
+            "$os_version": "14.5.0",
+            "$browser": "Chrome",
+            "$browser_version": 126,
+            "$device_type": "Desktop",
+            "$current_url": f"https://posthog.com/docs/page-{index}?utm_source=newsletter",
+            "$host": "posthog.com",
+            "$pathname": f"/docs/page-{index}",
+            "$raw_user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko)",
+            "$screen_height": 1117,
+            "$screen_width": 1728,
+            "$viewport_height": 992,
+            "$viewport_width": 1728,
+            "$lib": "web",
+            "$lib_version": "1.160.0",
+            "$insert_id": f"insert-{index}",
+            "$time": 1720000000.123 + index,
+            "distinct_id": "0190a0a0-0000-7000-8000-000000000000",
+            "$device_id": "0190a0a0-0000-7000-8000-000000000000",
+            "$referrer": "https://www.google.com/",
+            "$referring_domain": "www.google.com",
+            "$session_id": "0190a0a0-0000-7000-8000-000000000001",
+            "$window_id": "0190a0a0-0000-7000-8000-000000000002",
+            "$pageview_id": f"0190a0a0-0000-7000-8000-{index:012d}",
+            "$active_feature_flags": ["beta-feature", "new-onboarding"],
+            "$feature/beta-feature": True,
+            "$feature/new-onboarding": "test",
+            "$set_once": {"$initial_referrer": "$direct", "$initial_current_url": "https://posthog.com/"},
+            "token": "phc_benchmark",
+        },
+        "timestamp": "2024-07-03T10:00:00.000Z",
+    }
+
+
+PAYLOADS = {
+    "single_event": json.dumps(_pageview(0)).encode(),
+    "batch_50_events": json.dumps([_pageview(i) for i in range(50)]).encode(),
+    "decide": json.dumps(
+        {
+            "token": "phc_benchmark",
+            "distinct_id": "0190a0a0-0000-7000-8000-000000000000",
+            "groups": {},
+            "person_properties": {"email": "max@posthog.com"},
+        }
+    ).encode(),
+}
+
+
+def _encode(payload: bytes, compression: str) -> bytes:
+    if compression == "gzip-js":
+        return gzip.compress(payload)
+    if compression == "base64":
+        return b"data=" + base64.b64encode(payload)
+    return payload
+
+
+class RequestParsingSuite:
+    """
+    Measures how quickly /capture, /batch and /decide request bodies are decoded.
+    "base64" is sent without a compression flag, like the GET and form-encoded variants of posthog-js requests.
+    """
+
+    params = (list(PAYLOADS.keys()), ["", "gzip-js", "base64"])
+    param_names = ["payload", "compression"]
+
+    def setup(self, payload: str, compression: str):
+        self.body = _encode(PAYLOADS[payload], compression)
+        self.compression = "" if compression == "base64" else compression
+
+    def time_decompress(self, payload: str, compression: str):
+        decompress(self.body, self.compression)
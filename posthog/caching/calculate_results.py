@@ -40,7 +40,7 @@ from posthog.queries.paths import Paths
 from posthog.queries.retention import Retention
 from posthog.queries.stickiness import Stickiness
 from posthog.queries.trends.trends import Trends
-from posthog.schema import CacheMissResponse, DashboardFilter
+from posthog.schema import CacheMissResponse, DashboardFilter, HogQLVariable, QuerySchemaRoot
 from posthog.types import FilterType
 
 if TYPE_CHECKING:
@@ -122,6 +122,43 @@ def get_cache_type(cacheable: Optional[FilterType] | Optional[dict]) -> CacheTyp
         raise Exception("Could not determine cache type. Must provide a filter or a query")
 
 
+def get_cache_key_for_query_based_insight(
+    insight: Insight,
+    *,
+    team: Team,
+    dashboard: Optional[Dashboard] = None,
+    filters_override: Optional[dict] = None,
+    variables_override: Optional[dict] = None,
+) -> Optional[str]:
+    """
+    The cache key `calculate_for_query_based_insight` is going to read, so that it can be fetched ahead of time.
+    Returns None if the insight's query isn't cached by a query runner.
+    """
+    query: Optional[BaseModel] = QuerySchemaRoot.model_validate(insight.query).root
+    query_runner = None
+    while query is not None and query_runner is None:
+        query_runner = get_query_runner_or_none(query, team)
+        # Like in `process_query_model`, nodes without a runner of their own are run through their source
+        source = getattr(query, "source", None)
+        query = source if isinstance(source, BaseModel) else None
+    if query_runner is None:
+        return None
+
+    dashboard_filters_json = (
+        filters_override if filters_override is not None else dashboard.filters if dashboard is not None else None
+    )
+    variables_override_json = (
+        variables_override if variables_override is not None else dashboard.variables if dashboard is not None else None
+    )
+    if dashboard_filters_json:
+        query_runner.apply_dashboard_filters(DashboardFilter.model_validate(dashboard_filters_json))
+    if variables_override_json:
+        query_runner.apply_variable_overrides(
+            [HogQLVariable.model_validate(variable) for variable in variables_override_json.values()]
+        )
+    return query_runner.get_cache_key()
+
+
 def calculate_for_query_based_insight(
     insight: Insight,
     *,
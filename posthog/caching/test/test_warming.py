@@ -1,8 +1,13 @@
-from posthog.caching.warming import priority_insights, schedule_warming_for_teams_task
+from posthog.caching.warming import (
+    deduplicated_insights,
+    priority_insights,
+    schedule_warming_for_teams_task,
+    warm_insight_cache_task,
+)
 from posthog.models import Insight, DashboardTile, InsightViewed, Dashboard
 
 from datetime import datetime, timedelta, UTC
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from posthog.test.base import APIBaseTest
 
@@ -115,6 +120,41 @@ class TestWarming(APIBaseTest):
         ]
         self.assertEqual(insights, expected_results)
 
+    def test_deduplicated_insights_groups_combinations_with_the_same_cache_key(self):
+        query = {"kind": "InsightVizNode", "source": {"kind": "TrendsQuery", "series": [{"kind": "EventsNode"}]}}
+        other_query = {"kind": "InsightVizNode", "source": {"kind": "FunnelsQuery", "series": [{"kind": "EventsNode"}]}}
+        insight = Insight.objects.create(team=self.team, query=query)
+        same_query_insight = Insight.objects.create(team=self.team, query=query)
+        other_insight = Insight.objects.create(team=self.team, query=other_query)
+        filtered_dashboard = Dashboard.objects.create(team=self.team, filters={"date_from": "-90d"})
+        for user_index in range(3):
+            user = self._create_user(f"user{user_index}@posthog.com")
+            InsightViewed.objects.create(
+                team=self.team, user=user, insight=other_insight, last_viewed_at=datetime.now(UTC)
+            )
+
+        groups = deduplicated_insights(
+            self.team,
+            [
+                (insight.pk, None),
+                (same_query_insight.pk, self.dashboard2.pk),
+                (insight.pk, filtered_dashboard.pk),
+                (other_insight.pk, None),
+                (999999, None),
+            ],
+        )
+
+        self.assertEqual(
+            groups,
+            [
+                # most viewed first
+                [(other_insight.pk, None)],
+                [(insight.pk, None), (same_query_insight.pk, self.dashboard2.pk)],
+                [(insight.pk, filtered_dashboard.pk)],
+                [(999999, None)],
+            ],
+        )
+
 
 class TestScheduleWarmingForTeamsTask(APIBaseTest):
     def setUp(self) -> None:
@@ -153,3 +193,29 @@ class TestScheduleWarmingForTeamsTask(APIBaseTest):
         self.assertEqual(mock_warm_insight_cache_task_si.call_args_list[0][0][0], "1234")
         self.assertEqual(mock_warm_insight_cache_task_si.call_args_list[0][0][1], "5678")
         self.assertEqual(mock_warm_insight_cache_task_si.call_args_list[1][0][0], "2345")
+
+    @patch("posthog.caching.warming.TIME_TO_FRESH_HISTOGRAM")
+    @patch("posthog.caching.warming.process_query_dict")
+    @patch("posthog.hogql_queries.query_cache.QueryCacheManager.get_target_age")
+    def test_warm_insight_cache_task_records_time_to_fresh_of_calculated_stale_insights(
+        self, mock_get_target_age, mock_process_query_dict, mock_time_to_fresh_histogram
+    ):
+        insight = Insight.objects.create(
+            team=self.team, query={"kind": "TrendsQuery", "series": [{"kind": "EventsNode", "event": "$pageview"}]}
+        )
+
+        for is_cached, stale_since, observed in [
+            (False, datetime.now(UTC) - timedelta(minutes=5), True),
+            # Another request refreshed it in the meantime
+            (True, datetime.now(UTC) - timedelta(minutes=5), False),
+            # Warmed ahead of going stale
+            (False, datetime.now(UTC) + timedelta(minutes=5), False),
+            (False, None, False),
+        ]:
+            mock_time_to_fresh_histogram.reset_mock()
+            mock_get_target_age.return_value = stale_since
+            mock_process_query_dict.return_value = MagicMock(is_cached=is_cached, cache_key=None)
+
+            warm_insight_cache_task(insight.pk, None)
+
+            assert mock_time_to_fresh_histogram.observe.called == observed
@@ -1,16 +1,19 @@
 import itertools
+import time
 from datetime import timedelta, UTC, datetime
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from typing import Optional
 
 import structlog
 from celery import shared_task
 from celery.canvas import chain
-from django.db.models import Q
-from prometheus_client import Counter, Gauge
+from django.db.models import Count, Q
+from prometheus_client import Counter, Gauge, Histogram
 from sentry_sdk import capture_exception
 
+from posthog import redis
 from posthog.api.services.query import process_query_dict
+from posthog.caching.calculate_results import get_cache_key_for_query_based_insight
 from posthog.caching.utils import largest_teams
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.errors import CHQueryErrorTooManySimultaneousQueries
@@ -18,7 +21,7 @@ from posthog.hogql.constants import LimitContext
 from posthog.hogql_queries.query_cache import QueryCacheManager
 from posthog.hogql_queries.legacy_compatibility.flagged_conversion_manager import conversion_to_query_based
 from posthog.hogql_queries.query_runner import ExecutionMode
-from posthog.models import Team, Insight, DashboardTile
+from posthog.models import Team, Insight, DashboardTile, InsightViewed
 from posthog.tasks.utils import CeleryQueue
 
 logger = structlog.get_logger(__name__)
@@ -33,9 +36,29 @@ PRIORITY_INSIGHTS_COUNTER = Counter(
     "Number of priority insights warmed",
     ["team_id", "dashboard", "is_cached"],
 )
+DUPLICATE_INSIGHTS_COUNTER = Counter(
+    "posthog_cache_warming_duplicate_insights",
+    "Number of insight + dashboard combinations not warmed on their own, as they share a cache key with another one",
+    ["team_id"],
+)
+TIME_TO_FRESH_HISTOGRAM = Histogram(
+    "posthog_cache_warming_time_to_fresh_seconds",
+    "Time between an insight's cache going stale and it being warmed",
+    buckets=(60, 300, 900, 1800, 3600, 3 * 3600, 12 * 3600, 24 * 3600, float("inf")),
+)
 
 LAST_VIEWED_THRESHOLD = timedelta(days=7)
 
+# Cost of queries that haven't been warmed yet, for ordering
+DEFAULT_QUERY_COST_SECONDS = 1.0
+MIN_QUERY_COST_SECONDS = 0.1
+
+InsightTuple = tuple[int, Optional[int]]
+
+
+def _query_costs_key(team_id: int) -> str:
+    return f"cache_warming_query_costs:{team_id}"
+
 
 def priority_insights(team: Team, shared_only: bool = False) -> Generator[tuple[int, Optional[int]], None, None]:
     """
@@ -86,6 +109,57 @@ def priority_insights(team: Team, shared_only: bool = False) -> Generator[tuple[
     yield from dashboard_tiles
 
 
+def deduplicated_insights(team: Team, insight_tuples: Iterable[InsightTuple]) -> list[list[InsightTuple]]:
+    """
+    Group insight + dashboard combinations by the cache key they resolve to, so that each query is only calculated
+    once. The first combination of each group is the one to warm, the others share its results.
+
+    Groups are ordered by how many views they get per second of query time, as observed by previous warming, so that
+    the most viewed results are kept fresh, should there not be enough time to warm all of them.
+    """
+    insight_tuples = list(insight_tuples)
+    insights = team.insight_set.in_bulk({int(insight_id) for insight_id, _ in insight_tuples})
+    dashboards = team.dashboard_set.in_bulk(
+        {int(dashboard_id) for _, dashboard_id in insight_tuples if dashboard_id is not None}
+    )
+    viewers = dict(
+        InsightViewed.objects.filter(
+            team=team, insight_id__in=insights.keys(), last_viewed_at__gte=datetime.now(UTC) - LAST_VIEWED_THRESHOLD
+        )
+        .values("insight_id")
+        .annotate(viewers=Count("id"))
+        .values_list("insight_id", "viewers")
+    )
+
+    groups: dict[str | InsightTuple, list[InsightTuple]] = {}
+    for insight_id, dashboard_id in insight_tuples:
+        insight = insights.get(int(insight_id))
+        cache_key: Optional[str] = None
+        if insight is not None and not insight.deleted:
+            try:
+                with conversion_to_query_based(insight):
+                    cache_key = get_cache_key_for_query_based_insight(
+                        insight,
+                        team=team,
+                        dashboard=dashboards.get(int(dashboard_id)) if dashboard_id is not None else None,
+                    )
+            except Exception:
+                # Warmed on its own, where any error with the query is reported
+                pass
+        groups.setdefault(cache_key or (insight_id, dashboard_id), []).append((insight_id, dashboard_id))
+
+    cache_keys = [group_key for group_key in groups if isinstance(group_key, str)]
+    costs = dict(zip(cache_keys, redis.get_client().hmget(_query_costs_key(team.pk), cache_keys))) if cache_keys else {}
+
+    def views_per_second(group_key: str | InsightTuple) -> float:
+        # Combinations are only warmed when recently viewed, so each counts as at least one view
+        views = sum(max(viewers.get(int(insight_id), 0), 1) for insight_id, _ in groups[group_key])
+        cost = costs.get(group_key) if isinstance(group_key, str) else None
+        return views / max(float(cost) if cost is not None else DEFAULT_QUERY_COST_SECONDS, MIN_QUERY_COST_SECONDS)
+
+    return [groups[group_key] for group_key in sorted(groups, key=views_per_second, reverse=True)]
+
+
 @shared_task(ignore_result=True, expires=60 * 15)
 def schedule_warming_for_teams_task():
     team_ids = largest_teams(limit=10)
@@ -109,11 +183,16 @@ def schedule_warming_for_teams_task():
     expire_after = datetime.now(UTC) + timedelta(minutes=50)
 
     for team, shared_only in all_teams:
-        insight_tuples = priority_insights(team, shared_only=shared_only)
+        insight_groups = deduplicated_insights(team, priority_insights(team, shared_only=shared_only))
+        DUPLICATE_INSIGHTS_COUNTER.labels(team_id=team.pk).inc(sum(len(group) - 1 for group in insight_groups))
 
-        # We chain the task execution to prevent queries *for a single team* running at the same time
+        # We chain the task execution to prevent queries *for a single team* running at the same time,
+        # while the chains of different teams run in parallel on the ANALYTICS_LIMITED queue
         chain(
-            *(warm_insight_cache_task.si(*insight_tuple).set(expires=expire_after) for insight_tuple in insight_tuples)
+            *(
+                warm_insight_cache_task.si(*insight_tuple, duplicates=duplicates).set(expires=expire_after)
+                for insight_tuple, *duplicates in insight_groups
+            )
         )()
 
 
@@ -126,7 +205,13 @@ def schedule_warming_for_teams_task():
     retry_backoff_max=3,
     max_retries=3,
 )
-def warm_insight_cache_task(insight_id: int, dashboard_id: Optional[int]):
+def warm_insight_cache_task(
+    insight_id: int, dashboard_id: Optional[int], duplicates: Optional[list[InsightTuple]] = None
+):
+    """
+    Warm the cache of an insight + dashboard combination.
+    `duplicates` are combinations with the same cache key, which are kept fresh along with it.
+    """
     try:
         insight = Insight.objects.get(pk=insight_id)
     except Insight.DoesNotExist:
@@ -143,11 +228,17 @@ def warm_insight_cache_task(insight_id: int, dashboard_id: Optional[int]):
     with conversion_to_query_based(insight):
         logger.info(f"Warming insight cache: {insight.pk} for team {insight.team_id} and dashboard {dashboard_id}")
 
+        stale_since = QueryCacheManager.get_target_age(
+            team_id=insight.team_id, insight_id=insight.pk, dashboard_id=dashboard_id
+        )
+
         try:
+            start_time = time.monotonic()
             results = process_query_dict(
                 insight.team,
                 insight.query,
                 dashboard_filters_json=dashboard.filters if dashboard is not None else None,
+                variables_override_json=dashboard.variables if dashboard is not None else None,
                 # We need an execution mode with recent cache:
                 # - in case someone refreshed after this task was triggered
                 # - if insight + dashboard combinations have the same cache key, we prevent needless recalculations
@@ -157,12 +248,42 @@ def warm_insight_cache_task(insight_id: int, dashboard_id: Optional[int]):
                 dashboard_id=dashboard_id,
             )
 
+            is_cached = getattr(results, "is_cached", False)
             PRIORITY_INSIGHTS_COUNTER.labels(
                 team_id=insight.team_id,
                 dashboard=dashboard_id is not None,
-                is_cached=getattr(results, "is_cached", False),
+                is_cached=is_cached,
             ).inc()
+
+            now = datetime.now(UTC)
+            # Only a calculation makes the insight fresh, and a target age still ahead of us wasn't stale yet
+            if not is_cached and stale_since is not None and stale_since <= now:
+                TIME_TO_FRESH_HISTOGRAM.observe((now - stale_since).total_seconds())
+            cache_key = getattr(results, "cache_key", None)
+            if cache_key and not is_cached:
+                redis_client = redis.get_client()
+                redis_client.hset(_query_costs_key(insight.team_id), cache_key, time.monotonic() - start_time)
+                redis_client.expire(_query_costs_key(insight.team_id), LAST_VIEWED_THRESHOLD)
+            if cache_key and duplicates:
+                _share_target_age(insight.team_id, cache_key, getattr(results, "cache_target_age", None), duplicates)
         except CHQueryErrorTooManySimultaneousQueries:
             raise
         except Exception as e:
             capture_exception(e)
+
+
+def _share_target_age(
+    team_id: int, cache_key: str, target_age: Optional[datetime], duplicates: list[InsightTuple]
+) -> None:
+    """Duplicates were kept fresh along with the warmed combination, so they go stale at the same time."""
+    for duplicate_insight_id, duplicate_dashboard_id in duplicates:
+        cache_manager = QueryCacheManager(
+            team_id=team_id,
+            cache_key=cache_key,
+            insight_id=duplicate_insight_id,
+            dashboard_id=duplicate_dashboard_id,
+        )
+        if target_age is not None:
+            cache_manager.update_target_age(target_age)
+        else:
+            cache_manager.remove_last_refresh()
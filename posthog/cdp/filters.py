@@ -1,10 +1,32 @@
-from typing import Optional
+import hashlib
+import json
+import threading
+from typing import Any, Optional
+
+from cachetools import LRUCache
+from prometheus_client import Counter
+
 from posthog.models.action.action import Action
 from posthog.hogql.compiler.bytecode import create_bytecode
 from posthog.hogql.parser import parse_expr
 from posthog.hogql.property import action_to_expr, property_to_expr, ast
 from posthog.models.team.team import Team
 
+FILTERS_BYTECODE_CACHE_SIZE = 1000
+
+FILTERS_BYTECODE_CACHE_COUNTER = Counter(
+    "cdp_filters_bytecode_cache",
+    "Compiling HogFunction filters to bytecode, by whether the bytecode was found in the cache.",
+    labelnames=["result"],
+)
+
+# Destinations often share their filters (e.g. only the test account filters), so compiled filters are cached
+# by a hash of everything that goes into compiling them. Saving an action or a team then compiles each distinct
+# filter once, no matter how many destinations use it.
+# Stored as tuples, so that callers changing the bytecode they got can't change the cached copy
+_filters_bytecode_cache: LRUCache[str, tuple[Any, ...]] = LRUCache(maxsize=FILTERS_BYTECODE_CACHE_SIZE)
+_filters_bytecode_cache_lock = threading.Lock()
+
 
 def hog_function_filters_to_expr(filters: dict, team: Team, actions: dict[int, Action]) -> ast.Expr:
     common_filters_expr: list[ast.Expr] = []
@@ -73,25 +95,71 @@ def filter_action_ids(filters: Optional[dict]) -> list[int]:
         return []
 
 
+def _fetch_actions(filters: dict, team: Team) -> dict[int, Action]:
+    actions_list = (
+        Action.objects.select_related("team")
+        .filter(team__project_id=team.project_id)
+        .filter(id__in=filter_action_ids(filters))
+    )
+    return {action.id: action for action in actions_list}
+
+
 def compile_filters_expr(filters: Optional[dict], team: Team, actions: Optional[dict[int, Action]] = None) -> ast.Expr:
     filters = filters or {}
 
     if actions is None:
         # If not provided as an optimization we fetch all actions
-        actions_list = (
-            Action.objects.select_related("team")
-            .filter(team__project_id=team.project_id)
-            .filter(id__in=filter_action_ids(filters))
-        )
-        actions = {action.id: action for action in actions_list}
+        actions = _fetch_actions(filters, team)
 
     return hog_function_filters_to_expr(filters, team, actions)
 
 
+def filters_bytecode_cache_key(filters: dict, team: Team, actions: dict[int, Action]) -> Optional[str]:
+    """
+    Hash of the normalized inputs to compiling the filters, or None if they can't all be known upfront
+    (e.g. referenced actions that weren't loaded), in which case the filters shouldn't be cached.
+    """
+    try:
+        action_ids = sorted(set(filter_action_ids(filters)))
+        if any(action_id not in actions for action_id in action_ids):
+            return None
+        normalized = {
+            "team_id": team.pk,
+            "filters": {
+                key: value for key, value in filters.items() if key not in ("bytecode", "bytecode_error", "transpiled")
+            },
+            "test_account_filters": team.test_account_filters if filters.get("filter_test_accounts", False) else None,
+            "actions": {str(action_id): actions[action_id].steps_json for action_id in action_ids},
+        }
+        serialized = json.dumps(normalized, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
 def compile_filters_bytecode(filters: Optional[dict], team: Team, actions: Optional[dict[int, Action]] = None) -> dict:
     filters = filters or {}
     try:
-        filters["bytecode"] = create_bytecode(compile_filters_expr(filters, team, actions)).bytecode
+        if actions is None:
+            actions = _fetch_actions(filters, team)
+
+        cache_key = filters_bytecode_cache_key(filters, team, actions)
+        cached_bytecode: Optional[tuple[Any, ...]] = None
+        if cache_key:
+            with _filters_bytecode_cache_lock:
+                cached_bytecode = _filters_bytecode_cache.get(cache_key)
+
+        if cached_bytecode is None:
+            FILTERS_BYTECODE_CACHE_COUNTER.labels(result="miss").inc()
+            bytecode = create_bytecode(compile_filters_expr(filters, team, actions)).bytecode
+            if cache_key:
+                with _filters_bytecode_cache_lock:
+                    _filters_bytecode_cache[cache_key] = tuple(bytecode)
+        else:
+            FILTERS_BYTECODE_CACHE_COUNTER.labels(result="hit").inc()
+            bytecode = list(cached_bytecode)
+
+        filters["bytecode"] = bytecode
         if "bytecode_error" in filters:
             del filters["bytecode_error"]
     except Exception as e:
@@ -1,8 +1,10 @@
 import json
+from unittest.mock import patch
+
 from inline_snapshot import snapshot
 
 from hogvm.python.operation import HOGQL_BYTECODE_VERSION
-from posthog.cdp.filters import hog_function_filters_to_expr
+from posthog.cdp.filters import compile_filters_bytecode, hog_function_filters_to_expr
 from posthog.hogql.compiler.bytecode import create_bytecode
 from posthog.models.action.action import Action
 from posthog.test.base import APIBaseTest, ClickhouseTestMixin, QueryMatchingTest
@@ -291,3 +293,38 @@ class TestHogFunctionFilters(ClickhouseTestMixin, APIBaseTest, QueryMatchingTest
                 2,
             ]
         )
+
+    def test_compile_filters_bytecode_compiles_identical_filters_once(self):
+        actions = {self.action.id: self.action}
+        expected = self.filters_to_bytecode(filters=self.filters)
+
+        with patch("posthog.cdp.filters.create_bytecode", wraps=create_bytecode) as mock_create_bytecode:
+            first = compile_filters_bytecode(json.loads(json.dumps(self.filters)), self.team, actions)
+            second = compile_filters_bytecode(json.loads(json.dumps(self.filters)), self.team, actions)
+
+            assert mock_create_bytecode.call_count == 1
+            assert first["bytecode"] == second["bytecode"] == expected
+
+            # Changing the returned bytecode doesn't change the cached bytecode
+            second["bytecode"].append("changed")
+            fourth = compile_filters_bytecode(json.loads(json.dumps(self.filters)), self.team, actions)
+            assert fourth["bytecode"] == expected
+
+            # Changing the action changes the compiled filters
+            self.action.steps_json = [{"event": "$autocapture"}]
+            third = compile_filters_bytecode(json.loads(json.dumps(self.filters)), self.team, actions)
+
+            assert mock_create_bytecode.call_count == 2
+            assert third["bytecode"] != expected
+
+    def test_compile_filters_bytecode_does_not_cache_errors(self):
+        filters = {"properties": [{"key": "email", "value": "x", "operator": "exact", "type": "person"}]}
+
+        with patch("posthog.cdp.filters.create_bytecode", side_effect=Exception("Compile failed")):
+            assert compile_filters_bytecode(dict(filters), self.team, {}) == {
+                **filters,
+                "bytecode": None,
+                "bytecode_error": "Compile failed",
+            }
+
+        assert compile_filters_bytecode(dict(filters), self.team, {})["bytecode"] == self.filters_to_bytecode(filters)
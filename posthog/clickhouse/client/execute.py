@@ -8,17 +8,28 @@ from typing import Any, Optional, Union
 from collections.abc import Sequence
 
 import sqlparse
+import structlog
+from celery.exceptions import SoftTimeLimitExceeded
 from clickhouse_driver import Client as SyncClient
+from clickhouse_driver.errors import ServerException, SocketTimeoutError
 from django.conf import settings as app_settings
 
 from posthog.clickhouse.client.connection import Workload, get_pool
 from posthog.clickhouse.client.escape import substitute_params
+from posthog.clickhouse.query_deadline import (
+    QUERY_DEADLINE_EXCEEDED_COUNTER,
+    QUERY_DEADLINE_SAVED_SECONDS,
+    capped_max_execution_time,
+    get_query_time_left,
+)
 from posthog.clickhouse.query_tagging import get_query_tag_value, get_query_tags
 from posthog.errors import wrap_query_error
 from posthog.settings import TEST
 from posthog.utils import generate_short_id, patchable
 from prometheus_client import Counter, Gauge
-from sentry_sdk import set_tag
+from sentry_sdk import capture_exception, set_tag
+
+logger = structlog.get_logger(__name__)
 
 QUERY_ERROR_COUNTER = Counter(
     "clickhouse_query_failure",
@@ -120,6 +131,11 @@ def sync_execute(
     if get_query_tag_value("id") == "posthog.tasks.tasks.process_query_task":
         workload = Workload.ONLINE
 
+    # Don't let the query run past the deadline of the request or task running it
+    max_execution_time = capped_max_execution_time((settings or {}).get("max_execution_time"))
+    if max_execution_time is not None:
+        settings = {**(settings or {}), "max_execution_time": max_execution_time}
+
     with get_pool(workload, team_id, readonly).get_client() as client:
         start_time = perf_counter()
 
@@ -147,6 +163,11 @@ def sync_execute(
                 query_id=query_id,
             )
         except Exception as e:
+            if _is_abandoned(e):
+                _kill_abandoned_query(
+                    query_id, workload, team_id, max_execution_time, elapsed_time=perf_counter() - start_time
+                )
+
             err = wrap_query_error(e)
             exception_type = type(err).__name__
             set_tag("clickhouse_exception_type", exception_type)
@@ -166,6 +187,40 @@ def sync_execute(
     return result
 
 
+def _is_abandoned(error: Exception) -> bool:
+    """Whether the caller gave up on the query, while it may still be running on ClickHouse."""
+    if isinstance(error, ServerException):
+        return False  # ClickHouse has already stopped the query
+    if isinstance(error, SoftTimeLimitExceeded | SocketTimeoutError):
+        return True
+    time_left = get_query_time_left()
+    return time_left is not None and time_left <= 0
+
+
+def _kill_abandoned_query(
+    query_id: Optional[str],
+    workload: Workload,
+    team_id: Optional[int],
+    max_execution_time: Optional[int],
+    *,
+    elapsed_time: float,
+) -> None:
+    QUERY_DEADLINE_EXCEEDED_COUNTER.labels(reason="killed").inc()
+    if max_execution_time:
+        QUERY_DEADLINE_SAVED_SECONDS.labels(reason="killed").inc(max(max_execution_time - elapsed_time, 0))
+
+    try:
+        with get_pool(workload, team_id).get_client() as client:
+            client.execute(
+                f"KILL QUERY ON CLUSTER '{app_settings.CLICKHOUSE_CLUSTER}' WHERE query_id = %(query_id)s ASYNC",
+                {"query_id": query_id},
+            )
+    except Exception as e:
+        # Killing is best effort, the original error is what gets raised
+        logger.warning("Failed to kill abandoned query", query_id=query_id, error=e)
+        capture_exception(e)
+
+
 def query_with_columns(
     query: str,
     args: Optional[QueryArgs] = None,
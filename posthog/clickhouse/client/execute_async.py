@@ -1,16 +1,20 @@
 import datetime
 import uuid
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Optional
 
 import orjson as json
 import sentry_sdk
 import structlog
+import zstd
+from django.conf import settings
 from prometheus_client import Histogram
 from pydantic import BaseModel
 from rest_framework.exceptions import APIException, NotFound
 
 from posthog import celery, redis
 from posthog.clickhouse.client.async_task_chain import add_task_to_on_commit
+from posthog.clickhouse.query_deadline import query_deadline
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.errors import CHQueryErrorTooManySimultaneousQueries, ExposedCHQueryError
 from posthog.hogql.constants import LimitContext
@@ -39,14 +43,19 @@ class QueryRetrievalError(Exception):
 
 
 class QueryStatusManager:
-    STATUS_TTL_SECONDS = 60 * 20  # 20 minutes
     KEY_PREFIX_ASYNC_RESULTS = "query_async"
+    # Stored along with the status when its result rows are kept in separate, compressed chunks
+    RESULTS_CHUNKS_FIELD = "results_chunks"
 
     def __init__(self, query_id: str, team_id: int):
         self.redis_client = redis.get_client()
         self.query_id = query_id
         self.team_id = team_id
 
+    @property
+    def status_ttl_seconds(self) -> int:
+        return settings.ASYNC_QUERY_RESULTS_TTL_SECONDS
+
     @property
     def results_key(self) -> str:
         return f"{self.KEY_PREFIX_ASYNC_RESULTS}:{self.team_id}:{self.query_id}"
@@ -55,16 +64,51 @@ class QueryStatusManager:
     def clickhouse_query_status_key(self) -> str:
         return f"{self.KEY_PREFIX_ASYNC_RESULTS}:{self.team_id}:{self.query_id}:status"
 
+    def results_chunk_key(self, index: int) -> str:
+        return f"{self.KEY_PREFIX_ASYNC_RESULTS}:{self.team_id}:{self.query_id}:results:{index}"
+
     def store_query_status(self, query_status: QueryStatus):
-        value = SafeJSONRenderer().render(query_status.model_dump(exclude={"clickhouse_query_progress"}))
+        status_dict = query_status.model_dump(exclude={"clickhouse_query_progress"})
+        value = SafeJSONRenderer().render(status_dict)
         query_status.expiration_time = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
-            seconds=self.STATUS_TTL_SECONDS
+            seconds=self.status_ttl_seconds
         )
-        self.redis_client.set(self.results_key, value, exat=int(query_status.expiration_time.timestamp()))
+        exat = int(query_status.expiration_time.timestamp())
+
+        results = status_dict.get("results")
+        if (
+            len(value) > settings.ASYNC_QUERY_RESULTS_CHUNKING_THRESHOLD_BYTES
+            and isinstance(results, dict)
+            and isinstance(results.get("results"), list)
+        ):
+            self._store_chunked_query_status(status_dict, results, exat=exat)
+        else:
+            self.redis_client.set(self.results_key, value, exat=exat)
+
+    def _store_chunked_query_status(self, status_dict: dict, results: dict, *, exat: int):
+        """
+        Store the result rows in compressed chunks next to the status, so that large results take less memory in
+        Redis and can be retrieved a page at a time.
+        """
+        rows: list = results["results"]
+        chunk_rows = settings.ASYNC_QUERY_RESULTS_CHUNK_ROWS
+
+        # Chunks go first, so that the status never points to chunks that aren't there yet
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for index, chunk_start in enumerate(range(0, len(rows), chunk_rows)):
+            chunk = SafeJSONRenderer().render(rows[chunk_start : chunk_start + chunk_rows])
+            pipeline.set(self.results_chunk_key(index), zstd.compress(chunk), exat=exat)
+        status_dict = {
+            **status_dict,
+            "results": {**results, "results": []},
+            self.RESULTS_CHUNKS_FIELD: {"rows": len(rows), "chunk_rows": chunk_rows},
+        }
+        pipeline.set(self.results_key, SafeJSONRenderer().render(status_dict), exat=exat)
+        pipeline.execute()
 
     def _store_clickhouse_query_progress_dict(self, query_progress_dict):
         value = json.dumps(query_progress_dict)
-        self.redis_client.set(self.clickhouse_query_status_key, value, ex=self.STATUS_TTL_SECONDS)
+        self.redis_client.set(self.clickhouse_query_status_key, value, ex=self.status_ttl_seconds)
 
     def _get_results(self):
         try:
@@ -113,13 +157,62 @@ class QueryStatusManager:
             logger.exception("Clickhouse Status Check Failed", error=e)
             return None
 
-    def get_query_status(self, show_progress: bool = False) -> QueryStatus:
+    def _get_chunked_rows(self, results_chunks: dict, start: int, end: int) -> list:
+        if end <= start:
+            return []
+
+        chunk_rows = results_chunks["chunk_rows"]
+        first_chunk = start // chunk_rows
+        keys = [self.results_chunk_key(index) for index in range(first_chunk, (end - 1) // chunk_rows + 1)]
+        try:
+            chunks = self.redis_client.mget(keys)
+        except Exception as e:
+            raise QueryRetrievalError(
+                f"Error retrieving results of query {self.query_id} for team {self.team_id}"
+            ) from e
+
+        if any(chunk is None for chunk in chunks):
+            raise QueryRetrievalError(f"Results of query {self.query_id} for team {self.team_id} are incomplete")
+
+        rows = [row for chunk in chunks for row in json.loads(zstd.decompress(chunk))]
+        offset_in_chunks = start - first_chunk * chunk_rows
+        return rows[offset_in_chunks : offset_in_chunks + end - start]
+
+    def _paginate_results(self, results: dict, results_chunks: Optional[dict], offset: int, limit: Optional[int]):
+        if results_chunks is None and not isinstance(results.get("results"), list):
+            return results
+
+        rows_count = results_chunks["rows"] if results_chunks else len(results["results"])
+        start = min(offset, rows_count)
+        end = rows_count if limit is None else min(start + limit, rows_count)
+        if results_chunks:
+            rows = self._get_chunked_rows(results_chunks, start, end)
+        else:
+            rows = results["results"][start:end]
+
+        paginated_results = {**results, "results": rows}
+        if end < rows_count:
+            paginated_results["hasMore"] = True
+        return paginated_results
+
+    def get_query_status(
+        self, show_progress: bool = False, offset: int = 0, limit: Optional[int] = None
+    ) -> QueryStatus:
+        """
+        Get the status of the query, with its results if it's complete.
+        `offset` and `limit` page through the result rows, `hasMore` is set on the results if there are rows left.
+        """
         byte_results = self._get_results()
 
         if not byte_results:
             raise QueryNotFoundError(f"Query {self.query_id} not found for team {self.team_id}")
 
-        query_status = QueryStatus(**json.loads(byte_results))
+        status_dict = json.loads(byte_results)
+        results_chunks = status_dict.pop(self.RESULTS_CHUNKS_FIELD, None)
+        query_status = QueryStatus(**status_dict)
+
+        if isinstance(query_status.results, dict) and (results_chunks or offset or limit is not None):
+            query_status.results = self._paginate_results(query_status.results, results_chunks, offset, limit)
 
         if show_progress and not query_status.complete:
             query_status.query_progress = self.get_clickhouse_progresses()
@@ -128,8 +221,17 @@ class QueryStatusManager:
 
     def delete_query_status(self) -> None:
         logger.info("Deleting redis query key %s", self.results_key)
+        try:
+            byte_results = self._get_results()
+        except QueryRetrievalError:
+            byte_results = None
+        results_chunks = json.loads(byte_results).get(self.RESULTS_CHUNKS_FIELD) if byte_results else None
+
         self.redis_client.delete(self.results_key)
         self.redis_client.delete(self.clickhouse_query_status_key)
+        if results_chunks:
+            chunks_count = -(-results_chunks["rows"] // results_chunks["chunk_rows"])
+            self.redis_client.delete(*(self.results_chunk_key(index) for index in range(chunks_count)))
 
 
 def execute_process_query(
@@ -175,17 +277,22 @@ def execute_process_query(
         wait_duration = (query_status.pickup_time - query_status.start_time) / datetime.timedelta(seconds=1)
         QUERY_WAIT_TIME.labels(team=team_id, mode=trigger).observe(wait_duration)
 
+    # The deadline of the query counts from when it was enqueued, as that's how long its client has been waiting
+    deadline_start = query_status.start_time or query_status.pickup_time
+    time_left = settings.ASYNC_QUERY_DEADLINE_SECONDS - (query_status.pickup_time - deadline_start).total_seconds()
+
     try:
         tag_queries(client_query_id=query_id, team_id=team_id, user_id=user_id)
-        results = process_query_dict(
-            team=team,
-            query_json=query_json,
-            limit_context=limit_context,
-            execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
-            insight_id=query_status.insight_id,
-            dashboard_id=query_status.dashboard_id,
-            user=user,
-        )
+        with query_deadline(time_left) if settings.ASYNC_QUERY_DEADLINE_SECONDS else nullcontext():
+            results = process_query_dict(
+                team=team,
+                query_json=query_json,
+                limit_context=limit_context,
+                execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
+                insight_id=query_status.insight_id,
+                dashboard_id=query_status.dashboard_id,
+                user=user,
+            )
         if isinstance(results, BaseModel):
             results = results.model_dump(by_alias=True)
         logger.info("Got results for team %s query %s", team_id, query_id)
@@ -255,12 +362,14 @@ def enqueue_process_query_task(
     return query_status
 
 
-def get_query_status(team_id: int, query_id: str, show_progress: bool = False) -> QueryStatus:
+def get_query_status(
+    team_id: int, query_id: str, show_progress: bool = False, offset: int = 0, limit: Optional[int] = None
+) -> QueryStatus:
     """
     Abstracts away the manager for any caller and returns a QueryStatus object
     """
     manager = QueryStatusManager(query_id, team_id)
-    return manager.get_query_status(show_progress=show_progress)
+    return manager.get_query_status(show_progress=show_progress, offset=offset, limit=limit)
 
 
 def cancel_query(team_id: int, query_id: str) -> bool:
@@ -44,18 +44,30 @@ class CeleryConcurrencyLimitExceeded(Exception):
     pass
 
 
+def _running_tasks_key(task_name: str, dynamic_key: Optional[object] = None) -> str:
+    running_tasks_key = f"celery_running_tasks:{task_name}"
+    if dynamic_key is not None:
+        running_tasks_key = f"{running_tasks_key}:{dynamic_key}"
+    return running_tasks_key
+
+
+def get_running_tasks_count(task_name: str, dynamic_key: Optional[object] = None) -> int:
+    """
+    Number of unexpired tasks currently counted against a `limit_concurrency` limit of the task,
+    e.g. the queries running for a team.
+    """
+    redis_client = redis.get_client()
+    return redis_client.zcount(_running_tasks_key(task_name, dynamic_key), int(time.time()), "+inf")
+
+
 def limit_concurrency(max_concurrent_tasks: int, key: Optional[Callable] = None, ttl: int = 60 * 15) -> Callable:
     def decorator(task_func):
         @wraps(task_func)
         def wrapper(*args, **kwargs):
             task_name = current_task.name
             redis_client = redis.get_client()
-            running_tasks_key = f"celery_running_tasks:{task_name}"
-            if key:
-                dynamic_key = key(*args, **kwargs)
-                running_tasks_key = f"{running_tasks_key}:{dynamic_key}"
-            else:
-                dynamic_key = None
+            dynamic_key = key(*args, **kwargs) if key else None
+            running_tasks_key = _running_tasks_key(task_name, dynamic_key)
             task_id = f"{task_name}:{current_task.request.id}"
             current_time = int(time.time())
 
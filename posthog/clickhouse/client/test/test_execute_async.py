@@ -5,7 +5,7 @@ from posthog.clickhouse.client.async_task_chain import task_chain_context
 from posthog.clickhouse.client.connection import Workload
 import uuid
 
-from django.test import TestCase, SimpleTestCase
+from django.test import TestCase, SimpleTestCase, override_settings
 from django.db import transaction
 
 from posthog.clickhouse.client import execute_async as client
@@ -99,6 +99,49 @@ class TestQueryStatusManager(SimpleTestCase):
         self.query_status.expiration_time = None  # We don't care about expiration time in this test
         self.assertEqual(self.manager.get_query_status(show_progress=True), self.query_status)
 
+    def test_paginates_results(self):
+        self.query_status.complete = True
+        self.query_status.results = {"results": [[i] for i in range(10)], "columns": ["i"]}
+        self.manager.store_query_status(self.query_status)
+
+        self.assertEqual(self.manager.get_query_status().results, self.query_status.results)
+        self.assertEqual(
+            self.manager.get_query_status(offset=2, limit=3).results,
+            {"results": [[2], [3], [4]], "columns": ["i"], "hasMore": True},
+        )
+        self.assertEqual(
+            self.manager.get_query_status(offset=8, limit=3).results, {"results": [[8], [9]], "columns": ["i"]}
+        )
+
+    @override_settings(ASYNC_QUERY_RESULTS_TTL_SECONDS=60)
+    def test_status_expires_after_the_configured_ttl(self):
+        self.manager.store_query_status(self.query_status)
+
+        self.assertTrue(0 < get_client().ttl(self.manager.results_key) <= 60)
+
+    @patch("posthog.clickhouse.client.execute_async.settings.ASYNC_QUERY_RESULTS_CHUNKING_THRESHOLD_BYTES", 100)
+    @patch("posthog.clickhouse.client.execute_async.settings.ASYNC_QUERY_RESULTS_CHUNK_ROWS", 4)
+    def test_large_results_are_stored_in_chunks(self):
+        self.query_status.complete = True
+        self.query_status.results = {"results": [[i, "row"] for i in range(10)], "columns": ["i", "value"]}
+        self.manager.store_query_status(self.query_status)
+
+        redis_client = get_client()
+        stored_status = redis_client.get(self.manager.results_key)
+        assert stored_status is not None
+        self.assertEqual(json.loads(stored_status)["results"]["results"], [])
+        self.assertTrue(all(redis_client.exists(self.manager.results_chunk_key(index)) for index in range(3)))
+
+        self.assertEqual(self.manager.get_query_status().results, self.query_status.results)
+        self.assertEqual(
+            self.manager.get_query_status(offset=3, limit=6).results,
+            {"results": [[i, "row"] for i in range(3, 9)], "columns": ["i", "value"], "hasMore": True},
+        )
+        self.assertEqual(self.manager.get_query_status(offset=12).results, {"results": [], "columns": ["i", "value"]})
+
+        self.manager.delete_query_status()
+        self.assertEqual(redis_client.keys(f"{self.manager.results_key}*"), [])
+
 
 class TestExecuteProcessQuery(TestCase):
     def setUp(self):
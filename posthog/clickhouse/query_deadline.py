@@ -0,0 +1,80 @@
+# This module is responsible for keeping ClickHouse queries from outliving the requests and tasks that run them
+#
+# Once an API request or a query task has run out of time, nobody is waiting for the results of its queries anymore.
+# Callers set a deadline, and queries get their `max_execution_time` capped to the time left until it, so that
+# ClickHouse stops them at the deadline instead of using the cluster for nothing.
+
+import math
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import Counter
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# A context variable rather than a thread local, so that threads started with a copy of the context keep the deadline
+_query_deadline: ContextVar[Optional[float]] = ContextVar("query_deadline", default=None)
+
+QUERY_DEADLINE_EXCEEDED_COUNTER = Counter(
+    "clickhouse_query_deadline_exceeded",
+    "Queries that weren't run, or were killed, because the deadline of their caller had passed.",
+    labelnames=["reason"],
+)
+
+QUERY_DEADLINE_SAVED_SECONDS = Counter(
+    "clickhouse_query_deadline_saved_seconds",
+    "Seconds of ClickHouse execution time that queries were allowed, but that was left after their caller's deadline.",
+    labelnames=["reason"],
+)
+
+
+class QueryDeadlineExceeded(APIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = "The query ran out of time. Try reducing its scope by changing the time range."
+    default_code = "query_deadline_exceeded"
+
+
+@contextmanager
+def query_deadline(timeout_seconds: float) -> Iterator[None]:
+    """Queries run within the block must finish in `timeout_seconds`, or by the deadline of an enclosing block."""
+    deadline = time.monotonic() + timeout_seconds
+    current_deadline = _query_deadline.get()
+    token = _query_deadline.set(deadline if current_deadline is None else min(deadline, current_deadline))
+    try:
+        yield
+    finally:
+        _query_deadline.reset(token)
+
+
+def get_query_time_left() -> Optional[float]:
+    """Seconds left until the current deadline, None if there's no deadline."""
+    deadline = _query_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def capped_max_execution_time(max_execution_time: Optional[int]) -> Optional[int]:
+    """
+    The `max_execution_time` to run a query with now, given the current deadline. None or 0 means no limit.
+    Raises QueryDeadlineExceeded if the deadline has already passed, as there's no point in starting the query.
+    """
+    time_left = get_query_time_left()
+    if time_left is None:
+        return max_execution_time
+
+    seconds_left = math.ceil(time_left)
+    if seconds_left <= 0:
+        QUERY_DEADLINE_EXCEEDED_COUNTER.labels(reason="not_started").inc()
+        if max_execution_time:
+            QUERY_DEADLINE_SAVED_SECONDS.labels(reason="not_started").inc(max_execution_time)
+        raise QueryDeadlineExceeded()
+
+    if max_execution_time and max_execution_time <= seconds_left:
+        return max_execution_time
+    if max_execution_time:
+        QUERY_DEADLINE_SAVED_SECONDS.labels(reason="capped").inc(max_execution_time - seconds_left)
+    return seconds_left
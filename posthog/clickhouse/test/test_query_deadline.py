@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+import pytest
+from freezegun import freeze_time
+
+from posthog.clickhouse.query_deadline import (
+    QueryDeadlineExceeded,
+    capped_max_execution_time,
+    get_query_time_left,
+    query_deadline,
+)
+
+
+def test_no_deadline_keeps_max_execution_time():
+    assert get_query_time_left() is None
+    assert capped_max_execution_time(60) == 60
+    assert capped_max_execution_time(None) is None
+
+
+def test_max_execution_time_is_capped_to_the_time_left():
+    with freeze_time("2024-01-01T00:00:00Z") as frozen_time:
+        with query_deadline(30):
+            assert capped_max_execution_time(60) == 30
+            assert capped_max_execution_time(10) == 10
+            assert capped_max_execution_time(None) == 30
+            assert capped_max_execution_time(0) == 30
+
+            frozen_time.tick(timedelta(seconds=20))
+            assert capped_max_execution_time(60) == 10
+
+            frozen_time.tick(timedelta(seconds=10))
+            with pytest.raises(QueryDeadlineExceeded):
+                capped_max_execution_time(60)
+
+        assert capped_max_execution_time(60) == 60
+
+
+def test_nested_deadlines_cannot_extend_the_enclosing_one():
+    with freeze_time("2024-01-01T00:00:00Z"):
+        with query_deadline(30):
+            with query_deadline(100):
+                assert capped_max_execution_time(60) == 30
+            with query_deadline(5):
+                assert capped_max_execution_time(60) == 5
+            assert capped_max_execution_time(60) == 30
@@ -21,6 +21,7 @@ from posthog.hogql.variables import replace_variables
 from posthog.hogql.visitor import clone_expr
 from posthog.hogql.resolver_utils import extract_select_queries
 from posthog.models.team import Team
+from posthog.clickhouse.query_deadline import capped_max_execution_time
 from posthog.clickhouse.query_tagging import tag_queries
 from posthog.client import sync_execute
 from posthog.schema import (
@@ -156,6 +157,10 @@ def execute_hogql_query(
     settings = settings or HogQLGlobalSettings()
     if limit_context in (LimitContext.EXPORT, LimitContext.COHORT_CALCULATION, LimitContext.QUERY_ASYNC):
         settings.max_execution_time = HOGQL_INCREASED_MAX_EXECUTION_TIME
+    # Settings in the SQL take precedence over the ones ClickHouse gets with the query, so the deadline is applied here
+    max_execution_time = capped_max_execution_time(settings.max_execution_time)
+    if max_execution_time != settings.max_execution_time:
+        settings = settings.model_copy(update={"max_execution_time": max_execution_time})
 
     # Print the ClickHouse SQL query
     with timings.measure("print_ast"):
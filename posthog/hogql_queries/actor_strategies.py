@@ -1,4 +1,5 @@
 from typing import cast, Literal, Optional
+from collections.abc import Iterator
 
 from django.db import connection
 
@@ -18,6 +19,10 @@ class ActorStrategy:
     origin: str
     origin_id: str
 
+    # Actors are looked up and enriched in batches of this size, so only one batch of raw rows and lookups
+    # needs to be held in memory at a time
+    batch_size = 10_000
+
     def __init__(self, team: Team, query: ActorsQuery, paginator: HogQLHasMorePaginator):
         self.team = team
         self.paginator = paginator
@@ -46,47 +51,45 @@ class PersonStrategy(ActorStrategy):
 
     # This is hand written instead of using the ORM because the ORM was blowing up the memory on exports and taking forever
     def get_actors(self, actor_ids, order_by: str = "") -> dict[str, dict]:
-        # If actor queries start quietly dying again, this might need batching at some point
-        # but currently works with 800,000 persondistinctid entries (May 24, 2024)
+        return {str(person["id"]): person for person in self.iter_actors(actor_ids, order_by=order_by)}
+
+    def iter_actors(self, actor_ids, order_by: str = "") -> Iterator[dict]:
         persons_query = """SELECT posthog_person.id, posthog_person.uuid, posthog_person.properties, posthog_person.is_identified, posthog_person.created_at
             FROM posthog_person
             WHERE posthog_person.uuid = ANY(%(uuids)s)
             AND posthog_person.team_id = %(team_id)s"""
         if order_by:
             persons_query += f" ORDER BY {order_by}"
-        with connection.cursor() as cursor:
-            cursor.execute(
-                persons_query,
-                {"uuids": list(actor_ids), "team_id": self.team.pk},
-            )
-            people = cursor.fetchall()
-            cursor.execute(
-                """SELECT posthog_persondistinctid.person_id, posthog_persondistinctid.distinct_id
-            FROM posthog_persondistinctid
-            WHERE posthog_persondistinctid.person_id = ANY(%(people_ids)s)
-            AND posthog_persondistinctid.team_id = %(team_id)s""",
-                {"people_ids": [x[0] for x in people], "team_id": self.team.pk},
-            )
-            distinct_ids = cursor.fetchall()
-
-        person_id_to_raw_person_and_set: dict[int, tuple] = {person[0]: (person, []) for person in people}
-
-        for pdid in distinct_ids:
-            person_id_to_raw_person_and_set[pdid[0]][1].append(pdid[1])
-        del distinct_ids
 
-        person_uuid_to_person = {
-            str(person[1]): {
-                "id": person[1],
-                "properties": json.loads(person[2]),
-                "is_identified": person[3],
-                "created_at": person[4],
-                "distinct_ids": distinct_ids,
-            }
-            for person, distinct_ids in person_id_to_raw_person_and_set.values()
-        }
-
-        return person_uuid_to_person
+        # A server side cursor streams the persons instead of loading them all at once. These don't work behind
+        # pgbouncer in transaction pooling mode, in which case we still fetch in batches from a regular cursor.
+        persons_cursor = (
+            connection.cursor()
+            if connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS")
+            else connection.chunked_cursor()
+        )
+        with persons_cursor, connection.cursor() as distinct_ids_cursor:
+            persons_cursor.execute(persons_query, {"uuids": list(actor_ids), "team_id": self.team.pk})
+            while people := persons_cursor.fetchmany(self.batch_size):
+                distinct_ids_cursor.execute(
+                    """SELECT posthog_persondistinctid.person_id, posthog_persondistinctid.distinct_id
+                FROM posthog_persondistinctid
+                WHERE posthog_persondistinctid.person_id = ANY(%(people_ids)s)
+                AND posthog_persondistinctid.team_id = %(team_id)s""",
+                    {"people_ids": [person[0] for person in people], "team_id": self.team.pk},
+                )
+                distinct_ids_by_person_id: dict[int, list[str]] = {person[0]: [] for person in people}
+                for person_id, distinct_id in distinct_ids_cursor.fetchall():
+                    distinct_ids_by_person_id[person_id].append(distinct_id)
+
+                for person in people:
+                    yield {
+                        "id": person[1],
+                        "properties": json.loads(person[2]),
+                        "is_identified": person[3],
+                        "created_at": person[4],
+                        "distinct_ids": distinct_ids_by_person_id[person[0]],
+                    }
 
     def input_columns(self) -> list[str]:
         return ["person", "id", "person.$delete"]
@@ -1,6 +1,6 @@
 import itertools
 from typing import Optional
-from collections.abc import Sequence, Iterator
+from collections.abc import Sequence
 
 from posthog.hogql import ast
 from posthog.hogql.constants import HogQLGlobalSettings, HogQLQuerySettings
@@ -61,27 +61,36 @@ class ActorsQueryRunner(QueryRunner):
 
     def _enrich_with_actors(
         self,
-        results,
-        actor_column_index,
-        actors_lookup,
+        results: Sequence[list],
+        actor_column_index: int,
         recordings_column_index: Optional[int],
         recordings_lookup: Optional[dict[str, list[dict]]],
-    ) -> list:
+    ) -> tuple[list[list], int]:
+        """
+        Returns the rows with their actors, and how many actors are missing. Actors are looked up a batch of rows at a
+        time, so only one batch of lookups is held in memory alongside the enriched rows.
+        """
         enriched = []
+        missing_actors_count = 0
+
+        for start in range(0, len(results), self.strategy.batch_size):
+            batch = results[start : start + self.strategy.batch_size]
+            actors_lookup = self.strategy.get_actors(row[actor_column_index] for row in batch)
+            missing_actors_count += len(batch) - len(actors_lookup)
+
+            for result in batch:
+                new_row = list(result)
+                actor_id = str(result[actor_column_index])
+                actor = actors_lookup.get(actor_id)
+                new_row[actor_column_index] = actor if actor else {"id": actor_id}
+                if recordings_column_index is not None and recordings_lookup is not None:
+                    new_row[recordings_column_index] = (
+                        self._get_recordings(result[recordings_column_index], recordings_lookup) or []
+                    )
 
-        for result in results:
-            new_row = list(result)
-            actor_id = str(result[actor_column_index])
-            actor = actors_lookup.get(actor_id)
-            new_row[actor_column_index] = actor if actor else {"id": actor_id}
-            if recordings_column_index is not None and recordings_lookup is not None:
-                new_row[recordings_column_index] = (
-                    self._get_recordings(result[recordings_column_index], recordings_lookup) or []
-                )
-
-            enriched.append(new_row)
+                enriched.append(new_row)
 
-        return enriched
+        return enriched, missing_actors_count
 
     def prepare_recordings(
         self, column_name: str, input_columns: list[str]
@@ -112,19 +121,14 @@ class ActorsQueryRunner(QueryRunner):
         )
         input_columns = self.input_columns()
         missing_actors_count = None
-        results: Sequence[list] | Iterator[list] = self.paginator.results
+        results: Sequence[list] = self.paginator.results
 
         enrich_columns = filter(lambda column: column in ("person", "group", "actor"), input_columns)
         for column_name in enrich_columns:
             actor_column_index = input_columns.index(column_name)
-            actor_ids = (row[actor_column_index] for row in self.paginator.results)
-            actors_lookup = self.strategy.get_actors(actor_ids)
-
             recordings_column_index, recordings_lookup = self.prepare_recordings(column_name, input_columns)
-
-            missing_actors_count = len(self.paginator.results) - len(actors_lookup)
-            results = self._enrich_with_actors(
-                results, actor_column_index, actors_lookup, recordings_column_index, recordings_lookup
+            results, missing_actors_count = self._enrich_with_actors(
+                results, actor_column_index, recordings_column_index, recordings_lookup
             )
 
         return ActorsQueryResponse(
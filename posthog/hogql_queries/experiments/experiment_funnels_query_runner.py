@@ -6,6 +6,7 @@ from posthog.hogql_queries.experiments.funnels_statistics import (
     are_results_significant,
     calculate_credible_intervals,
     calculate_probabilities,
+    sample_conversion_rates,
 )
 from posthog.hogql_queries.experiments.funnels_statistics_v2 import (
     are_results_significant_v2,
@@ -76,8 +77,12 @@ class ExperimentFunnelsQueryRunner(QueryRunner):
                 significance_code, loss = are_results_significant_v2(control_variant, test_variants, probabilities)
                 credible_intervals = calculate_credible_intervals_v2([control_variant, *test_variants])
             else:
-                probabilities = calculate_probabilities(control_variant, test_variants)
-                significance_code, loss = are_results_significant(control_variant, test_variants, probabilities)
+                # draw the simulations once, for both the win probabilities and the expected loss
+                samples = sample_conversion_rates([control_variant, *test_variants])
+                probabilities = calculate_probabilities(control_variant, test_variants, samples=samples)
+                significance_code, loss = are_results_significant(
+                    control_variant, test_variants, probabilities, samples=samples
+                )
                 credible_intervals = calculate_credible_intervals([control_variant, *test_variants])
         except Exception as e:
             raise ValueError(f"Error calculating experiment funnel results: {str(e)}") from e
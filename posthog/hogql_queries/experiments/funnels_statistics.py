@@ -1,5 +1,8 @@
+from typing import Optional
+
+import numpy as np
 from rest_framework.exceptions import ValidationError
-from numpy.random import default_rng
+from numpy.random import Generator, default_rng
 from sentry_sdk import capture_exception
 import scipy.stats as stats
 from posthog.hogql_queries.experiments import (
@@ -11,11 +14,15 @@ from posthog.schema import ExperimentSignificanceCode, ExperimentVariantFunnelsB
 
 Probability = float
 
+SIMULATIONS_COUNT = 100_000
+
 
 def calculate_probabilities(
     control_variant: ExperimentVariantFunnelsBaseStats,
     test_variants: list[ExperimentVariantFunnelsBaseStats],
     priors: tuple[int, int] = (1, 1),
+    random_sampler: Optional[Generator] = None,
+    samples: Optional[np.ndarray] = None,
 ) -> list[Probability]:
     """
     Calculates the probability that each variant outperforms the others.
@@ -26,12 +33,16 @@ def calculate_probabilities(
     1. For each variant, create a Beta distribution of conversion rates:
         α (alpha) = success count of variant + prior success
         β (beta) = failure count + variant + prior failures
-    2. Use Monte Carlo simulation to estimate winning probabilities.
+    2. Use Monte Carlo simulation to estimate winning probabilities, from one matrix of samples
+       shared by all variants.
 
     The prior represents our initial belief about conversion rates.
     We use a non-informative prior (1, 1) by default, assuming equal
     likelihood of success and failure.
 
+    Pass `samples` from `sample_conversion_rates([control_variant, *test_variants])` to reuse
+    the simulations for the expected loss in `are_results_significant`.
+
     Returns: List of probabilities, where index 0 is control.
     """
 
@@ -48,56 +59,49 @@ def calculate_probabilities(
         )
 
     variants = [control_variant, *test_variants]
-    probabilities = []
+    if samples is None:
+        samples = sample_conversion_rates(variants, random_sampler, priors)
 
-    # simulate winning for each test variant
-    for index, variant in enumerate(variants):
-        probabilities.append(simulate_winning_variant_for_conversion(variant, variants[:index] + variants[index + 1 :]))
+    # a variant wins a simulation when it has the highest conversion rate in it
+    winners = np.argmax(samples, axis=0)
+    probabilities = [float(np.mean(winners == index)) for index in range(len(variants))]
 
     total_test_probabilities = sum(probabilities[1:])
 
     return [max(0, 1 - total_test_probabilities), *probabilities[1:]]
 
 
-def simulate_winning_variant_for_conversion(
-    target_variant: ExperimentVariantFunnelsBaseStats, variants: list[ExperimentVariantFunnelsBaseStats]
-) -> Probability:
-    random_sampler = default_rng()
-    prior_success = 1
-    prior_failure = 1
-    simulations_count = 100_000
-
-    variant_samples = []
-    for variant in variants:
-        # Get `N=simulations` samples from a Beta distribution with alpha = prior_success + variant_sucess,
-        # and beta = prior_failure + variant_failure
-        samples = random_sampler.beta(
-            variant.success_count + prior_success,
-            variant.failure_count + prior_failure,
-            simulations_count,
-        )
-        variant_samples.append(samples)
-
-    target_variant_samples = random_sampler.beta(
-        target_variant.success_count + prior_success,
-        target_variant.failure_count + prior_failure,
-        simulations_count,
-    )
-
-    winnings = 0
-    variant_conversions = list(zip(*variant_samples))
-    for i in range(simulations_count):
-        if target_variant_samples[i] > max(variant_conversions[i]):
-            winnings += 1
+def sample_conversion_rates(
+    variants: list[ExperimentVariantFunnelsBaseStats],
+    random_sampler: Optional[Generator] = None,
+    priors: tuple[int, int] = (1, 1),
+) -> np.ndarray:
+    """
+    Samples conversion rates of each variant from its Beta distribution, with
+    alpha = prior success + success count and beta = prior failure + failure count.
 
-    return winnings / simulations_count
+    Returns a (variants x simulations) matrix, with a row per variant.
+    """
+    random_sampler = random_sampler or default_rng()
+    prior_success, prior_failure = priors
+    alphas = np.array([variant.success_count + prior_success for variant in variants], dtype=float)
+    betas = np.array([variant.failure_count + prior_failure for variant in variants], dtype=float)
+    return random_sampler.beta(alphas[:, np.newaxis], betas[:, np.newaxis], (len(variants), SIMULATIONS_COUNT))
 
 
 def are_results_significant(
     control_variant: ExperimentVariantFunnelsBaseStats,
     test_variants: list[ExperimentVariantFunnelsBaseStats],
     probabilities: list[Probability],
+    random_sampler: Optional[Generator] = None,
+    priors: tuple[int, int] = (1, 1),
+    samples: Optional[np.ndarray] = None,
 ) -> tuple[ExperimentSignificanceCode, Probability]:
+    """
+    Pass the `samples` used for `probabilities` so the expected loss is computed from the
+    same simulations, instead of drawing new ones.
+    """
+
     def get_conversion_rate(variant: ExperimentVariantFunnelsBaseStats):
         return variant.success_count / (variant.success_count + variant.failure_count)
 
@@ -119,15 +123,18 @@ def are_results_significant(
         # Sum of probability of winning for all variants except control is less than 90%
         return ExperimentSignificanceCode.LOW_WIN_PROBABILITY, 1
 
-    best_test_variant = max(
-        test_variants,
-        key=lambda variant: get_conversion_rate(variant),
+    best_test_index, best_test_variant = max(
+        enumerate(test_variants, start=1),
+        key=lambda indexed_variant: get_conversion_rate(indexed_variant[1]),
     )
 
+    if samples is None:
+        samples = sample_conversion_rates([control_variant, *test_variants], random_sampler, priors)
+
     if get_conversion_rate(best_test_variant) > get_conversion_rate(control_variant):
-        expected_loss = calculate_expected_loss(best_test_variant, [control_variant])
+        expected_loss = expected_loss_from_samples(samples[best_test_index], samples[[0]])
     else:
-        expected_loss = calculate_expected_loss(control_variant, [best_test_variant])
+        expected_loss = expected_loss_from_samples(samples[0], samples[[best_test_index]])
 
     if expected_loss >= EXPECTED_LOSS_SIGNIFICANCE_LEVEL:
         return ExperimentSignificanceCode.HIGH_LOSS, expected_loss
@@ -136,7 +143,10 @@ def are_results_significant(
 
 
 def calculate_expected_loss(
-    target_variant: ExperimentVariantFunnelsBaseStats, variants: list[ExperimentVariantFunnelsBaseStats]
+    target_variant: ExperimentVariantFunnelsBaseStats,
+    variants: list[ExperimentVariantFunnelsBaseStats],
+    random_sampler: Optional[Generator] = None,
+    priors: tuple[int, int] = (1, 1),
 ) -> float:
     """
     Calculates expected loss in conversion rate for a given variant.
@@ -149,34 +159,16 @@ def calculate_expected_loss(
     The unit of the return value is conversion rate values
 
     """
-    random_sampler = default_rng()
-    prior_success = 1
-    prior_failure = 1
-    simulations_count = 100_000
-
-    variant_samples = []
-    for variant in variants:
-        # Get `N=simulations` samples from a Beta distribution with alpha = prior_success + variant_sucess,
-        # and beta = prior_failure + variant_failure
-        samples = random_sampler.beta(
-            variant.success_count + prior_success,
-            variant.failure_count + prior_failure,
-            simulations_count,
-        )
-        variant_samples.append(samples)
-
-    target_variant_samples = random_sampler.beta(
-        target_variant.success_count + prior_success,
-        target_variant.failure_count + prior_failure,
-        simulations_count,
-    )
+    samples = sample_conversion_rates([target_variant, *variants], random_sampler, priors)
+    return expected_loss_from_samples(samples[0], samples[1:])
 
-    loss = 0
-    variant_conversions = list(zip(*variant_samples))
-    for i in range(simulations_count):
-        loss += max(0, max(variant_conversions[i]) - target_variant_samples[i])
 
-    return loss / simulations_count
+def expected_loss_from_samples(target_samples: np.ndarray, variant_samples: np.ndarray) -> float:
+    """
+    Expected loss of the target, given its row of simulated conversion rates and a
+    (variants x simulations) matrix for the variants it's compared against.
+    """
+    return float(np.mean(np.maximum(0, np.max(variant_samples, axis=0) - target_samples)))
 
 
 def calculate_credible_intervals(variants, lower_bound=0.025, upper_bound=0.975):
@@ -1,7 +1,9 @@
 from functools import lru_cache
 from math import exp, lgamma, log, ceil
+from typing import Optional
 
-from numpy.random import default_rng
+import numpy as np
+from numpy.random import Generator, default_rng
 from rest_framework.exceptions import ValidationError
 import scipy.stats as stats
 from sentry_sdk import capture_exception
@@ -16,9 +18,14 @@ from posthog.schema import ExperimentSignificanceCode, ExperimentVariantTrendsBa
 
 Probability = float
 
+SIMULATIONS_COUNT = 100_000
+
 
 def calculate_probabilities(
-    control_variant: ExperimentVariantTrendsBaseStats, test_variants: list[ExperimentVariantTrendsBaseStats]
+    control_variant: ExperimentVariantTrendsBaseStats,
+    test_variants: list[ExperimentVariantTrendsBaseStats],
+    random_sampler: Optional[Generator] = None,
+    samples: Optional[np.ndarray] = None,
 ) -> list[Probability]:
     """
     Calculates probability that A is better than B. First variant is control, rest are test variants.
@@ -28,6 +35,9 @@ def calculate_probabilities(
     For each variant, we create a Gamma distribution of arrival rates,
     where alpha (shape parameter) = count of variant + 1
     beta (exposure parameter) = 1
+
+    Pass `samples` from `sample_arrival_rates([control_variant, *test_variants])` to reuse
+    simulations that were already drawn.
     """
     if not control_variant:
         raise ValidationError("No control variant data found", code="no_data")
@@ -45,43 +55,31 @@ def calculate_probabilities(
         )
 
     variants = [control_variant, *test_variants]
-    probabilities = []
+    if samples is None:
+        samples = sample_arrival_rates(variants, random_sampler)
 
-    # simulate winning for each test variant
-    for index, variant in enumerate(variants):
-        probabilities.append(
-            simulate_winning_variant_for_arrival_rates(variant, variants[:index] + variants[index + 1 :])
-        )
+    # a variant wins a simulation when it has the highest arrival rate in it
+    winners = np.argmax(samples, axis=0)
+    probabilities = [float(np.mean(winners == index)) for index in range(len(variants))]
 
     total_test_probabilities = sum(probabilities[1:])
 
     return [max(0, 1 - total_test_probabilities), *probabilities[1:]]
 
 
-def simulate_winning_variant_for_arrival_rates(
-    target_variant: ExperimentVariantTrendsBaseStats, variants: list[ExperimentVariantTrendsBaseStats]
-) -> float:
-    random_sampler = default_rng()
-    simulations_count = 100_000
-
-    variant_samples = []
-    for variant in variants:
-        # Get `N=simulations` samples from a Gamma distribution with alpha = variant_sucess + 1,
-        # and exposure = relative exposure of variant
-        samples = random_sampler.gamma(variant.count + 1, 1 / variant.exposure, simulations_count)
-        variant_samples.append(samples)
-
-    target_variant_samples = random_sampler.gamma(
-        target_variant.count + 1, 1 / target_variant.exposure, simulations_count
-    )
-
-    winnings = 0
-    variant_conversions = list(zip(*variant_samples))
-    for i in range(ceil(simulations_count)):
-        if target_variant_samples[i] > max(variant_conversions[i]):
-            winnings += 1
+def sample_arrival_rates(
+    variants: list[ExperimentVariantTrendsBaseStats], random_sampler: Optional[Generator] = None
+) -> np.ndarray:
+    """
+    Samples arrival rates of each variant from its Gamma distribution, with
+    alpha = count of variant + 1 and scale = 1 / relative exposure of variant.
 
-    return winnings / simulations_count
+    Returns a (variants x simulations) matrix, with a row per variant.
+    """
+    random_sampler = random_sampler or default_rng()
+    shapes = np.array([variant.count + 1 for variant in variants], dtype=float)
+    scales = np.array([1 / variant.exposure for variant in variants], dtype=float)
+    return random_sampler.gamma(shapes[:, np.newaxis], scales[:, np.newaxis], (len(variants), SIMULATIONS_COUNT))
 
 
 def are_results_significant(
@@ -0,0 +1,146 @@
+"""
+Incremental refresh of stale trends results.
+
+Results of a trends query hold a value per interval. Once an interval is over and its events have been ingested,
+its value doesn't change, so a stale result only needs the intervals since its last refresh recalculated. One
+settled interval is recalculated along with them, and if its value differs from the cached one, the data has been
+backfilled in the meantime and the query is calculated in full instead.
+
+Changes that the settled interval can't reveal, such as late events in older intervals, deleted events, or changed
+persons behind a filter, are picked up by calculating the query in full again once its last full calculation is a few
+hours old. Filters on cohorts, and on person properties that aren't stored on events, change with no new events at all,
+so queries with them are always calculated in full.
+"""
+
+from datetime import datetime, timedelta
+from math import isclose
+from typing import Any, Optional
+
+from prometheus_client import Counter
+from pydantic import BaseModel
+
+from posthog.hogql_queries.utils.query_date_range import QueryDateRange
+
+# How long after an interval is over its events are considered to have been ingested
+INCREMENTAL_REFRESH_SETTLE_TIME = timedelta(hours=1)
+
+INCREMENTAL_REFRESH_INTERVALS = ("hour", "day")
+
+TRENDS_INCREMENTAL_REFRESH_COUNTER = Counter(
+    "posthog_trends_incremental_refresh_total",
+    "Stale trends results that could be brought up to date incrementally, or had to be calculated in full.",
+    labelnames=["result"],
+)
+
+
+def format_interval_day(date: datetime, interval: str) -> str:
+    return date.strftime("%Y-%m-%d{}".format(" %H:%M:%S" if interval in ("hour", "minute") else ""))
+
+
+def incremental_refresh_date_from(query_date_range: QueryDateRange, last_refresh: datetime) -> Optional[datetime]:
+    """
+    Start of the intervals to recalculate for a result last refreshed at `last_refresh`, including the one settled
+    interval that is compared with the cached value. None if that doesn't leave any intervals to reuse.
+    """
+    if query_date_range.interval_name not in INCREMENTAL_REFRESH_INTERVALS:
+        return None
+
+    settled_until = last_refresh.astimezone(query_date_range.now_with_timezone.tzinfo) - INCREMENTAL_REFRESH_SETTLE_TIME
+    recalculate_from = query_date_range.align_with_interval(settled_until) - query_date_range.interval_relativedelta()
+    if recalculate_from <= query_date_range.align_with_interval(query_date_range.date_from()):
+        return None
+    return recalculate_from
+
+
+def _property_filters(properties: Any) -> list[dict[str, Any]]:
+    """Property filters within `properties`, however deeply they are nested in property groups."""
+    if isinstance(properties, BaseModel):
+        properties = properties.model_dump()
+    if isinstance(properties, list):
+        return [property for value in properties for property in _property_filters(value)]
+    if not isinstance(properties, dict):
+        return []
+    if properties.get("type") in ("AND", "OR"):
+        return _property_filters(properties.get("values"))
+    return [properties]
+
+
+def filters_depend_on_persons(properties: Any, *, person_properties_on_events: bool) -> bool:
+    """
+    Whether any of the property filters matches events by their person's current state, rather than by what was
+    stored on the events when they were ingested.
+    """
+    for property in _property_filters(properties):
+        property_type = property.get("type")
+        if property_type in ("cohort", "precalculated-cohort", "static-cohort"):
+            return True
+        if property_type == "person" and not person_properties_on_events:
+            return True
+        if property_type == "hogql":
+            expression = str(property.get("key", "")).lower()
+            if "cohort" in expression or ("person" in expression and not person_properties_on_events):
+                return True
+    return False
+
+
+def _values_by_day(series: dict[str, Any], key: str) -> Optional[dict[str, Any]]:
+    days, values = series.get("days"), series.get(key)
+    if not isinstance(days, list) or not isinstance(values, list) or len(days) != len(values):
+        return None
+    return dict(zip(days, values))
+
+
+def _series_by_order(results: list[dict[str, Any]]) -> Optional[dict[Any, dict[str, Any]]]:
+    series_by_order = {(series.get("action") or {}).get("order"): series for series in results}
+    if None in series_by_order or len(series_by_order) != len(results):
+        return None
+    return series_by_order
+
+
+def merge_incremental_results(
+    cached_results: list[dict[str, Any]],
+    recalculated_results: list[dict[str, Any]],
+    *,
+    days: list[str],
+    settled_day: str,
+) -> Optional[list[dict[str, Any]]]:
+    """
+    Merge the recalculated trailing intervals into the cached series, spanning `days`.
+    Returns None when the cached results can't be reused, i.e. they are of a different shape, don't cover all the
+    intervals that weren't recalculated, or their value for `settled_day` no longer holds.
+    """
+    cached_by_order = _series_by_order(cached_results)
+    recalculated_by_order = _series_by_order(recalculated_results)
+    if (
+        cached_by_order is None
+        or recalculated_by_order is None
+        or cached_by_order.keys() != recalculated_by_order.keys()
+    ):
+        return None
+
+    merged_results = []
+    for order, recalculated in recalculated_by_order.items():
+        cached_data = _values_by_day(cached_by_order[order], "data")
+        cached_labels = _values_by_day(cached_by_order[order], "labels")
+        recalculated_data = _values_by_day(recalculated, "data")
+        recalculated_labels = _values_by_day(recalculated, "labels")
+        if cached_data is None or cached_labels is None or recalculated_data is None or recalculated_labels is None:
+            return None
+
+        cached_value, recalculated_value = cached_data.get(settled_day), recalculated_data.get(settled_day)
+        if cached_value is None or recalculated_value is None or not isclose(cached_value, recalculated_value):
+            return None
+
+        data, labels = [], []
+        for day in days:
+            if day in recalculated_data:
+                data.append(recalculated_data[day])
+                labels.append(recalculated_labels[day])
+            elif day in cached_data:
+                data.append(cached_data[day])
+                labels.append(cached_labels[day])
+            else:
+                return None
+
+        merged_results.append({**recalculated, "data": data, "labels": labels, "days": days, "count": float(sum(data))})
+    return merged_results
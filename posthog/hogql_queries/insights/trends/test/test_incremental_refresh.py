@@ -0,0 +1,80 @@
+from posthog.hogql_queries.insights.trends.incremental_refresh import (
+    filters_depend_on_persons,
+    merge_incremental_results,
+)
+from posthog.schema import (
+    EventPropertyFilter,
+    FilterLogicalOperator,
+    PersonPropertyFilter,
+    PropertyGroupFilter,
+    PropertyGroupFilterValue,
+    PropertyOperator,
+)
+
+
+def _series(order: int, days: list[str], data: list[int]) -> dict:
+    return {"action": {"order": order}, "days": days, "labels": [f"label {day}" for day in days], "data": data}
+
+
+def test_merge_incremental_results():
+    cached = [_series(0, ["2020-01-01", "2020-01-02", "2020-01-03"], [1, 2, 3])]
+    recalculated = [_series(0, ["2020-01-03", "2020-01-04"], [4, 5])]
+
+    results = merge_incremental_results(
+        cached, recalculated, days=["2020-01-02", "2020-01-03", "2020-01-04"], settled_day="2020-01-03"
+    )
+
+    assert results is None  # the settled interval changed
+
+    recalculated = [_series(0, ["2020-01-03", "2020-01-04"], [3, 5])]
+    results = merge_incremental_results(
+        cached, recalculated, days=["2020-01-02", "2020-01-03", "2020-01-04"], settled_day="2020-01-03"
+    )
+
+    assert results == [
+        {
+            "action": {"order": 0},
+            "days": ["2020-01-02", "2020-01-03", "2020-01-04"],
+            "labels": ["label 2020-01-02", "label 2020-01-03", "label 2020-01-04"],
+            "data": [2, 3, 5],
+            "count": 10.0,
+        }
+    ]
+
+
+def test_merge_incremental_results_requires_matching_series():
+    days = ["2020-01-01", "2020-01-02"]
+    cached = [_series(0, days, [1, 2])]
+
+    assert merge_incremental_results(cached, [_series(1, days, [1, 2])], days=days, settled_day=days[0]) is None
+    assert merge_incremental_results(cached, [], days=days, settled_day=days[0]) is None
+    assert merge_incremental_results([{"result": 3}], cached, days=days, settled_day=days[0]) is None
+
+
+def test_merge_incremental_results_requires_cached_intervals_to_be_covered():
+    cached = [_series(0, ["2020-01-02", "2020-01-03"], [2, 3])]
+    recalculated = [_series(0, ["2020-01-03", "2020-01-04"], [3, 4])]
+
+    results = merge_incremental_results(
+        cached, recalculated, days=["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-04"], settled_day="2020-01-03"
+    )
+
+    assert results is None
+
+
+def test_filters_depend_on_persons():
+    event_filter = EventPropertyFilter(key="$browser", value="Chrome", operator=PropertyOperator.EXACT)
+    person_filter = PersonPropertyFilter(key="email", value="a@b.c", operator=PropertyOperator.EXACT)
+    nested_person_filter = PropertyGroupFilter(
+        type=FilterLogicalOperator.AND_,
+        values=[PropertyGroupFilterValue(type=FilterLogicalOperator.OR_, values=[event_filter, person_filter])],
+    )
+
+    assert not filters_depend_on_persons([None, [event_filter]], person_properties_on_events=False)
+    assert filters_depend_on_persons([[event_filter], nested_person_filter], person_properties_on_events=False)
+    assert not filters_depend_on_persons([nested_person_filter], person_properties_on_events=True)
+    # cohort membership changes with no new events, whether person properties are on events or not
+    assert filters_depend_on_persons([[{"type": "cohort", "key": "id", "value": 2}]], person_properties_on_events=True)
+    assert filters_depend_on_persons(
+        [[{"type": "hogql", "key": "person.properties.email = 'a@b.c'"}]], person_properties_on_events=False
+    )
@@ -25,6 +25,7 @@ from posthog.hogql_queries.insights.trends.trends_query_runner import (
     BREAKDOWN_OTHER_DISPLAY,
     TrendsQueryRunner,
 )
+from posthog.hogql_queries.query_runner import APPROXIMATE_RESULTS_LABEL, CacheMissResponse, ExecutionMode
 from posthog.models import GroupTypeMapping
 from posthog.models.action.action import Action
 from posthog.models.cohort.cohort import Cohort
@@ -38,6 +39,7 @@ from posthog.schema import (
     BreakdownFilter,
     BreakdownItem,
     BreakdownType,
+    CachedTrendsQueryResponse,
     ChartDisplayType,
     CompareFilter,
     CompareItem,
@@ -51,6 +53,7 @@ from posthog.schema import (
     IntervalType,
     MultipleBreakdownType,
     PersonPropertyFilter,
+    PersonsOnEventsMode,
     PropertyMathType,
     PropertyOperator,
     TrendsFilter,
@@ -5067,3 +5070,163 @@ class TestTrendsQueryRunner(ClickhouseTestMixin, APIBaseTest):
         assert len(response.results) == 1
         assert response.results[0]["count"] == 1
         assert response.results[0]["data"] == [0, 0, 1, 0]
+
+    def test_stale_results_are_refreshed_incrementally(self):
+        for timestamp in ("2020-01-10T12:00:00Z", "2020-01-14T12:00:00Z"):
+            _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp=timestamp)
+        flush_persons_and_events()
+        query = TrendsQuery(series=[EventsNode(event="$pageview")], dateRange=DateRange(date_from="-7d"))
+
+        with freeze_time("2020-01-15T12:00:00Z"):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE
+            )
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.results[0]["data"] == [0, 0, 1, 0, 0, 0, 1, 0]
+
+        for timestamp in ("2020-01-12T12:00:00Z", "2020-01-15T13:00:00Z"):
+            _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp=timestamp)
+        flush_persons_and_events()
+
+        with freeze_time("2020-01-15T15:00:00Z"):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE
+            )
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.is_cached is False
+        # Only the intervals since the last refresh were calculated, so the late event on the 12th isn't picked up yet
+        assert response.results[0]["days"][0] == "2020-01-08"
+        assert response.results[0]["data"] == [0, 0, 1, 0, 0, 0, 1, 1]
+        assert response.results[0]["count"] == 3
+        assert len(response.results[0]["labels"]) == 8
+        assert response.full_refresh_at == datetime(2020, 1, 15, 12, tzinfo=zoneinfo.ZoneInfo(key="UTC"))
+
+        # The last full calculation is too old to build on, so the query is calculated in full, with the late event
+        with freeze_time("2020-01-15T17:30:00Z"):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE
+            )
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.results[0]["data"] == [0, 0, 1, 0, 1, 0, 1, 1]
+        assert response.results[0]["count"] == 4
+        assert response.full_refresh_at is None
+
+        # An event is backfilled into an interval that had settled, so the query is calculated in full
+        _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp="2020-01-14T13:00:00Z")
+        flush_persons_and_events()
+
+        with freeze_time("2020-01-15T20:00:00Z"):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE
+            )
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.results[0]["data"] == [0, 0, 1, 0, 1, 0, 2, 1]
+        assert response.results[0]["count"] == 5
+        assert response.full_refresh_at is None
+
+    def test_incremental_refresh_is_skipped_for_person_filters(self):
+        _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp="2020-01-14T12:00:00Z")
+        flush_persons_and_events()
+        query = TrendsQuery(
+            series=[
+                EventsNode(
+                    event="$pageview",
+                    properties=[PersonPropertyFilter(key="name", value="p1", operator=PropertyOperator.EXACT)],
+                )
+            ],
+            dateRange=DateRange(date_from="-7d"),
+            modifiers=HogQLQueryModifiers(personsOnEventsMode=PersonsOnEventsMode.DISABLED),
+        )
+
+        with freeze_time("2020-01-15T12:00:00Z"):
+            TrendsQueryRunner(team=self.team, query=query).run(ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+
+        with (
+            freeze_time("2020-01-15T15:00:00Z"),
+            patch(
+                "posthog.hogql_queries.insights.trends.trends_query_runner.merge_incremental_results"
+            ) as mock_merge_incremental_results,
+        ):
+            TrendsQueryRunner(team=self.team, query=query).run(ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+
+        mock_merge_incremental_results.assert_not_called()
+
+    def test_incremental_refresh_is_skipped_for_queries_over_the_whole_range(self):
+        _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp="2020-01-14T12:00:00Z")
+        flush_persons_and_events()
+        query = TrendsQuery(
+            series=[EventsNode(event="$pageview")],
+            dateRange=DateRange(date_from="-7d"),
+            trendsFilter=TrendsFilter(display=ChartDisplayType.ACTIONS_LINE_GRAPH_CUMULATIVE),
+        )
+
+        with freeze_time("2020-01-15T12:00:00Z"):
+            TrendsQueryRunner(team=self.team, query=query).run(ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE)
+
+        with (
+            freeze_time("2020-01-15T15:00:00Z"),
+            patch(
+                "posthog.hogql_queries.insights.trends.trends_query_runner.merge_incremental_results"
+            ) as mock_merge_incremental_results,
+        ):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_BLOCKING_IF_STALE
+            )
+
+        mock_merge_incremental_results.assert_not_called()
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.results[0]["data"] == [0, 0, 0, 0, 0, 0, 1, 1]
+
+    @override_settings(TRENDS_APPROXIMATE_RESULTS_MIN_EVENTS=1_000_000)
+    def test_approximate_results_are_returned_first_for_large_ranges(self):
+        _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp="2020-01-14T12:00:00Z")
+        flush_persons_and_events()
+        query = TrendsQuery(series=[EventsNode(event="$pageview")], dateRange=DateRange(date_from="-7d"))
+
+        with (
+            freeze_time("2020-01-15T12:00:00Z"),
+            patch.object(TrendsQueryRunner, "_get_or_calculate_event_count", return_value=1_000_000),
+        ):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS
+            )
+            cached_response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.CACHE_ONLY_NEVER_CALCULATE
+            )
+
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.query_status is not None
+        assert response.query_status.labels == [APPROXIMATE_RESULTS_LABEL]
+        assert response.query_status.complete is False
+        assert "SAMPLE 0.01" in (response.hogql or "")
+        # Only the exact results get cached
+        assert isinstance(cached_response, CacheMissResponse)
+
+    def test_event_count_is_of_the_smallest_series(self):
+        for i in range(10):
+            _create_event(team=self.team, event="$pageview", distinct_id=f"p{i}", timestamp="2020-01-14T12:00:00Z")
+        flush_persons_and_events()
+        query = TrendsQuery(
+            series=[EventsNode(event="$pageview"), EventsNode(event="$rare_event")],
+            dateRange=DateRange(date_from="-7d"),
+        )
+
+        with freeze_time("2020-01-15T12:00:00Z"):
+            event_count = TrendsQueryRunner(team=self.team, query=query)._get_or_calculate_event_count()
+
+        assert event_count == 0
+
+    @override_settings(TRENDS_APPROXIMATE_RESULTS_MIN_EVENTS=1_000_000)
+    def test_small_ranges_are_calculated_exactly(self):
+        _create_event(team=self.team, event="$pageview", distinct_id="p1", timestamp="2020-01-14T12:00:00Z")
+        flush_persons_and_events()
+        query = TrendsQuery(series=[EventsNode(event="$pageview")], dateRange=DateRange(date_from="-7d"))
+
+        with freeze_time("2020-01-15T12:00:00Z"):
+            response = TrendsQueryRunner(team=self.team, query=query).run(
+                ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS
+            )
+
+        assert isinstance(response, CachedTrendsQueryResponse)
+        assert response.query_status is None
+        assert response.results[0]["data"] == [0, 0, 0, 0, 0, 0, 1, 0]
@@ -662,6 +662,10 @@ class TrendsQueryBuilder(DataWarehouseInsightQueryMixin):
 
         return query
 
+    def series_events_filter(self) -> ast.Expr:
+        """Filter on the events of the series in the date range, regardless of any breakdown."""
+        return self._events_filter(is_actors_query=False, breakdown=None, ignore_breakdowns=True)
+
     def _events_filter(
         self,
         is_actors_query: bool,
@@ -1,11 +1,12 @@
 import threading
 from copy import deepcopy
-from datetime import timedelta
+from datetime import UTC, timedelta
 from math import ceil
 from operator import itemgetter
 from typing import Any, Optional, Union
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.timezone import datetime
 from natsort import natsorted, ns
 
@@ -17,6 +18,7 @@ from posthog.caching.insights_api import (
 from posthog.clickhouse import query_tagging
 from posthog.hogql import ast
 from posthog.hogql.constants import MAX_SELECT_RETURNED_ROWS, LimitContext
+from posthog.hogql.parser import parse_select
 from posthog.hogql.printer import to_printed_hogql
 from posthog.hogql.query import execute_hogql_query
 from posthog.hogql.timings import HogQLTimings
@@ -28,6 +30,13 @@ from posthog.hogql_queries.insights.trends.breakdown import (
     BREAKDOWN_OTHER_STRING_LABEL,
 )
 from posthog.hogql_queries.insights.trends.display import TrendsDisplay
+from posthog.hogql_queries.insights.trends.incremental_refresh import (
+    TRENDS_INCREMENTAL_REFRESH_COUNTER,
+    filters_depend_on_persons,
+    format_interval_day,
+    incremental_refresh_date_from,
+    merge_incremental_results,
+)
 from posthog.hogql_queries.insights.trends.series_with_extras import SeriesWithExtras
 from posthog.hogql_queries.insights.trends.trends_actors_query_builder import TrendsActorsQueryBuilder
 from posthog.hogql_queries.insights.trends.trends_query_builder import TrendsQueryBuilder
@@ -38,6 +47,7 @@ from posthog.hogql_queries.utils.query_date_range import QueryDateRange
 from posthog.hogql_queries.utils.query_previous_period_date_range import (
     QueryPreviousPeriodDateRange,
 )
+from posthog.hogql_queries.utils.sampling import sample_rate_from_count
 from posthog.models import Team
 from posthog.models.action.action import Action
 from posthog.models.cohort.cohort import Cohort
@@ -46,6 +56,7 @@ from posthog.models.property_definition import PropertyDefinition
 from posthog.queries.util import correct_result_for_sampling
 from posthog.schema import (
     ActionsNode,
+    BaseMathType,
     BreakdownItem,
     BreakdownType,
     CachedTrendsQueryResponse,
@@ -54,6 +65,7 @@ from posthog.schema import (
     CompareItem,
     DashboardFilter,
     DataWarehouseEventsModifier,
+    DateRange,
     DataWarehouseNode,
     DayItem,
     EventsNode,
@@ -64,12 +76,13 @@ from posthog.schema import (
     IntervalType,
     MultipleBreakdownOptions,
     MultipleBreakdownType,
+    PersonsOnEventsMode,
     QueryTiming,
     Series,
     TrendsQuery,
     TrendsQueryResponse,
 )
-from posthog.utils import format_label_date, multisort
+from posthog.utils import format_label_date, generate_cache_key, get_safe_cache, multisort
 from posthog.warehouse.models.util import get_view_or_table_by_name
 
 
@@ -432,6 +445,190 @@ class TrendsQueryRunner(QueryRunner):
             error=". ".join(debug_errors),
         )
 
+    def calculate_incrementally(self, stale_response: CachedTrendsQueryResponse) -> Optional[TrendsQueryResponse]:
+        if not settings.TRENDS_INCREMENTAL_REFRESH_ENABLED:
+            return None
+
+        # Results are calculated in full every so often, to pick up changes the settled interval doesn't reveal
+        full_refresh_at = stale_response.full_refresh_at or stale_response.last_refresh
+        if datetime.now(UTC) - full_refresh_at > timedelta(seconds=settings.TRENDS_INCREMENTAL_REFRESH_MAX_AGE_SECONDS):
+            TRENDS_INCREMENTAL_REFRESH_COUNTER.labels(result="full").inc()
+            return None
+
+        if not self._can_refresh_incrementally():
+            return None
+
+        recalculate_from = incremental_refresh_date_from(self.query_date_range, stale_response.last_refresh)
+        if recalculate_from is None:
+            TRENDS_INCREMENTAL_REFRESH_COUNTER.labels(result="full").inc()
+            return None
+
+        date_range = self.query.dateRange or DateRange()
+        recalculated_response = TrendsQueryRunner(
+            query=self.query.model_copy(
+                update={
+                    "dateRange": DateRange(
+                        date_from=recalculate_from.isoformat(),
+                        date_to=date_range.date_to,
+                        explicitDate=date_range.explicitDate,
+                    )
+                },
+                deep=True,
+            ),
+            team=self.team,
+            timings=self.timings,
+            modifiers=self.modifiers,
+            limit_context=self.limit_context,
+        ).calculate()
+
+        interval = self.query_date_range.interval_name
+        results = merge_incremental_results(
+            stale_response.results,
+            recalculated_response.results,
+            days=[format_interval_day(day, interval) for day in self.query_date_range.all_values()],
+            settled_day=format_interval_day(recalculate_from, interval),
+        )
+        if results is None:
+            TRENDS_INCREMENTAL_REFRESH_COUNTER.labels(result="full").inc()
+            return None
+
+        TRENDS_INCREMENTAL_REFRESH_COUNTER.labels(result="incremental").inc()
+        for result in results:
+            result["filter"] = self._query_to_filter()
+            result["action"] = {**result["action"], "days": self.query_date_range.all_values()}
+        return recalculated_response.model_copy(
+            update={"results": results, "hogql": stale_response.hogql, "full_refresh_at": full_refresh_at}
+        )
+
+    def _can_refresh_incrementally(self) -> bool:
+        """
+        Whether the value of each interval only depends on the events within it, and no series depends on the
+        range as a whole, e.g. breakdown values are picked from the whole range.
+        """
+        if (
+            self.breakdown_enabled
+            or (self.query.compareFilter is not None and self.query.compareFilter.compare)
+            or self._trends_display.is_total_value()
+            or self._trends_display.display_type == ChartDisplayType.ACTIONS_LINE_GRAPH_CUMULATIVE
+        ):
+            return False
+        if self.query.trendsFilter is not None and (
+            self.query.trendsFilter.formula or (self.query.trendsFilter.smoothingIntervals or 1) > 1
+        ):
+            return False
+        if filters_depend_on_persons(
+            self._incremental_refresh_property_filters(),
+            person_properties_on_events=self.modifiers.personsOnEventsMode
+            in (
+                PersonsOnEventsMode.PERSON_ID_NO_OVERRIDE_PROPERTIES_ON_EVENTS,
+                PersonsOnEventsMode.PERSON_ID_OVERRIDE_PROPERTIES_ON_EVENTS,
+            ),
+        ):
+            return False
+        return all(
+            not isinstance(series, DataWarehouseNode)
+            and series.math
+            not in (
+                BaseMathType.WEEKLY_ACTIVE,
+                BaseMathType.MONTHLY_ACTIVE,
+                BaseMathType.FIRST_TIME_FOR_USER,
+                BaseMathType.FIRST_MATCHING_EVENT_FOR_USER,
+            )
+            for series in self.query.series
+        )
+
+    def _incremental_refresh_property_filters(self) -> list:
+        """All property filters of the query, including those of test accounts and of the series' actions."""
+        properties: list = [self.query.properties]
+        if self.query.filterTestAccounts and isinstance(self.team.test_account_filters, list):
+            properties.append(self.team.test_account_filters)
+        for series in self.query.series:
+            properties.append(series.properties)
+            if isinstance(series, ActionsNode):
+                try:
+                    action = Action.objects.get(pk=int(series.id), team__project_id=self.team.project_id)
+                except Action.DoesNotExist:
+                    continue
+                properties.extend(step.properties for step in action.steps)
+        return properties
+
+    def calculate_approximately(self) -> Optional[TrendsQueryResponse]:
+        if (
+            not settings.TRENDS_APPROXIMATE_RESULTS_MIN_EVENTS
+            or self.query.samplingFactor is not None
+            # Data warehouse tables can't be sampled
+            or any(isinstance(series, DataWarehouseNode) for series in self.query.series)
+        ):
+            return None
+
+        event_count = self._get_or_calculate_event_count()
+        if event_count < settings.TRENDS_APPROXIMATE_RESULTS_MIN_EVENTS:
+            return None
+
+        # The same steps of sample rate as web analytics, the results are corrected for sampling like for samplingFactor
+        sample_rate = sample_rate_from_count(event_count)
+        if not sample_rate.denominator:
+            return None
+        return TrendsQueryRunner(
+            query=self.query.model_copy(update={"samplingFactor": sample_rate.numerator / sample_rate.denominator}),
+            team=self.team,
+            timings=self.timings,
+            modifiers=self.modifiers,
+            limit_context=self.limit_context,
+        ).calculate()
+
+    def _get_or_calculate_event_count(self) -> int:
+        """Estimate of the number of events of the smallest series, counted on a sample of them.
+
+        Sampling is only as accurate as the rarest series allows, so a rare series next to a busy one keeps the whole
+        query exact.
+        """
+        cache_key = generate_cache_key(
+            f"trends_event_count_{self.query.model_dump_json(include={'series', 'properties', 'filterTestAccounts', 'dateRange'})}_{self.team.pk}_{self.team.timezone}"
+        )
+        cached_count = get_safe_cache(cache_key)
+        if cached_count is not None:
+            return cached_count
+
+        query = parse_select(
+            "SELECT count() FROM events AS e SAMPLE 1/1000 WHERE timestamp >= {date_from} AND timestamp <= {date_to}",
+            placeholders={
+                "date_from": self.query_date_range.date_from_as_hogql(),
+                "date_to": self.query_date_range.date_to_as_hogql(),
+            },
+        )
+        assert isinstance(query, ast.SelectQuery)
+        query.select = [
+            ast.Call(
+                name="countIf",
+                args=[
+                    TrendsQueryBuilder(
+                        trends_query=self.query,
+                        team=self.team,
+                        query_date_range=self.query_date_range,
+                        series=series,
+                        timings=self.timings,
+                        modifiers=self.modifiers,
+                        limit_context=self.limit_context,
+                    ).series_events_filter()
+                ],
+            )
+            for series in self.query.series
+        ]
+
+        with self.timings.measure("event_count_query"):
+            response = execute_hogql_query(
+                query_type="trends_event_count_query",
+                query=query,
+                team=self.team,
+                timings=self.timings,
+                limit_context=self.limit_context,
+            )
+
+        event_count = min(response.results[0]) * 1000 if response.results and response.results[0] else 0
+        cache.set(cache_key, event_count, settings.CACHED_RESULTS_TTL)
+        return event_count
+
     def build_series_response(self, response: HogQLQueryResponse, series: SeriesWithExtras, series_count: int):
         def get_value(name: str, val: Any):
             if name not in ["date", "total", "breakdown_value"]:
@@ -1,3 +1,6 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, UTC
 from typing import Optional
 
@@ -8,6 +11,30 @@ from posthog import redis
 from posthog.cache_utils import OrjsonJsonSerializer
 from posthog.utils import get_safe_cache
 
+# Cache entries fetched up front for a batch of queries, e.g. all tiles of a dashboard
+_prefetched_cache_data: ContextVar[Optional[dict[str, Optional[bytes]]]] = ContextVar(
+    "prefetched_query_cache_data", default=None
+)
+
+
+@contextmanager
+def prefetched_cache_data(cache_keys: Iterable[str]) -> Iterator[None]:
+    """
+    Fetch the given cache keys in a single round-trip, so that `QueryCacheManager`s within the block
+    read them from memory instead of going to Redis one key at a time.
+    """
+    cache_keys = list(dict.fromkeys(cache_keys))
+    try:
+        found = cache.get_many(cache_keys) if cache_keys else {}
+    except Exception:  # keys are read one by one if the batch read fails, like without prefetching
+        cache_keys, found = [], {}
+
+    token = _prefetched_cache_data.set({cache_key: found.get(cache_key) for cache_key in cache_keys})
+    try:
+        yield
+    finally:
+        _prefetched_cache_data.reset(token)
+
 
 class QueryCacheManager:
     def __init__(
@@ -18,7 +45,6 @@ class QueryCacheManager:
         insight_id: Optional[int] = None,
         dashboard_id: Optional[int] = None,
     ):
-        self.redis_client = redis.get_client()
         self.team_id = team_id
         self.cache_key = cache_key
         self.insight_id = insight_id
@@ -66,11 +92,20 @@ class QueryCacheManager:
             threshold.timestamp(),
         )
 
+    @staticmethod
+    def get_target_age(*, team_id: int, insight_id: int, dashboard_id: Optional[int]) -> Optional[datetime]:
+        """
+        When the cached results of the insight + dashboard combination go stale, if they're tracked.
+        """
+        target_age = redis.get_client().zscore(f"cache_timestamps:{team_id}", f"{insight_id}:{dashboard_id or ''}")
+        return datetime.fromtimestamp(target_age, UTC) if target_age is not None else None
+
     def update_target_age(self, target_age: datetime) -> None:
         if not self.insight_id:
             return
 
-        self.redis_client.zadd(
+        redis.queue_command(
+            "zadd",
             f"cache_timestamps:{self.team_id}",
             {self.identifier: target_age.timestamp()},
         )
@@ -79,11 +114,14 @@ class QueryCacheManager:
         if not self.insight_id:
             return
 
-        self.redis_client.zrem(f"cache_timestamps:{self.team_id}", self.identifier)
+        redis.queue_command("zrem", f"cache_timestamps:{self.team_id}", self.identifier)
 
     def set_cache_data(self, *, response: dict, target_age: Optional[datetime]) -> None:
         fresh_response_serialized = OrjsonJsonSerializer({}).dumps(response)
         cache.set(self.cache_key, fresh_response_serialized, settings.CACHED_RESULTS_TTL)
+        prefetched = _prefetched_cache_data.get()
+        if prefetched is not None and self.cache_key in prefetched:
+            prefetched[self.cache_key] = fresh_response_serialized
 
         if target_age:
             self.update_target_age(target_age)
@@ -91,7 +129,12 @@ class QueryCacheManager:
             self.remove_last_refresh()
 
     def get_cache_data(self) -> Optional[dict]:
-        cached_response_bytes: Optional[bytes] = get_safe_cache(self.cache_key)
+        cached_response_bytes: Optional[bytes]
+        prefetched = _prefetched_cache_data.get()
+        if prefetched is not None and self.cache_key in prefetched:
+            cached_response_bytes = prefetched[self.cache_key]
+        else:
+            cached_response_bytes = get_safe_cache(self.cache_key)
         if not cached_response_bytes:
             return None
 
@@ -78,6 +78,9 @@ QUERY_CACHE_HIT_COUNTER = Counter(
 
 EXTENDED_CACHE_AGE = timedelta(days=1)
 
+# Label of the query status attached to approximate results, while the exact ones are being calculated
+APPROXIMATE_RESULTS_LABEL = "approximate_results"
+
 
 class ExecutionMode(StrEnum):
     CALCULATE_BLOCKING_ALWAYS = "force_blocking"
@@ -477,6 +480,7 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
         _modifiers = modifiers or (query.modifiers if hasattr(query, "modifiers") else None)
         self.modifiers = create_default_modifiers_for_team(team, _modifiers)
         self.query_id = query_id
+        self._stale_cached_response: Optional[CR] = None
 
         if not self.is_query_node(query):
             query = self.query_type.model_validate(query)
@@ -510,6 +514,21 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
     def calculate(self) -> R:
         raise NotImplementedError()
 
+    def calculate_incrementally(self, stale_response: CR) -> Optional[R]:
+        """
+        Bring a stale cached response up to date without calculating the whole query again, where the query allows it.
+        Returns None if the query needs to be calculated in full.
+        """
+        return None
+
+    def calculate_approximately(self) -> Optional[R]:
+        """
+        Calculate approximate results, e.g. from a sample of the data, where the exact calculation would take long.
+        They are returned first, while the exact results are calculated asynchronously and replace them in the cache.
+        Returns None if there's no faster approximation of the query.
+        """
+        return None
+
     def enqueue_async_calculation(
         self,
         *,
@@ -574,6 +593,8 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
                 return cached_response
 
             self.count_query_cache_hit(hit="stale", trigger=cached_response.calculation_trigger or "")
+            # Kept around in case we proceed to calculation, as it might be brought up to date incrementally
+            self._stale_cached_response = cached_response
             # We have a stale result. If we aren't allowed to calculate, let's still return it
             # – otherwise let's proceed to calculation
             if execution_mode == ExecutionMode.CACHE_ONLY_NEVER_CALCULATE:
@@ -669,8 +690,17 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
             self.modifiers = create_default_modifiers_for_user(user, self.team, self.modifiers)
             self.modifiers.useMaterializedViews = True
 
+        response: Optional[R] = None
+        is_approximate = False
+        if self._stale_cached_response is not None and execution_mode != ExecutionMode.CALCULATE_BLOCKING_ALWAYS:
+            response = self.calculate_incrementally(self._stale_cached_response)
+        elif execution_mode == ExecutionMode.RECENT_CACHE_CALCULATE_ASYNC_IF_STALE_AND_BLOCKING_ON_MISS:
+            # The client polls for the query status in this mode, so it can show approximate results in the meantime
+            response = self.calculate_approximately()
+            is_approximate = response is not None
+
         fresh_response_dict = {
-            **self.calculate().model_dump(),
+            **(response or self.calculate()).model_dump(),
             "is_cached": False,
             "last_refresh": last_refresh,
             "next_allowed_client_refresh": last_refresh + self._refresh_frequency(),
@@ -682,6 +712,14 @@ class QueryRunner(ABC, Generic[Q, R, CR]):
             fresh_response_dict["calculation_trigger"] = get_query_tag_value("trigger")
         fresh_response = CachedResponse(**fresh_response_dict)
 
+        if is_approximate:
+            # Approximate results aren't cached, the exact ones calculated asynchronously are
+            query_status = self.enqueue_async_calculation(cache_manager=cache_manager, user=user)
+            fresh_response.query_status = query_status.model_copy(
+                update={"labels": [*(query_status.labels or []), APPROXIMATE_RESULTS_LABEL]}
+            )
+            return fresh_response
+
         # Don't cache debug queries with errors and export queries
         has_error: Optional[list] = fresh_response_dict.get("error", None)
         if (has_error is None or len(has_error) == 0) and self.limit_context != LimitContext.EXPORT:
@@ -1,10 +1,12 @@
 from typing import cast
+from unittest.mock import patch
 
 import pytest
 
 from posthog.hogql import ast
 from posthog.hogql.test.utils import pretty_print_in_tests
 from posthog.hogql.visitor import clear_locations
+from posthog.hogql_queries.actor_strategies import PersonStrategy
 from posthog.hogql_queries.actors_query_runner import ActorsQueryRunner
 from posthog.models.utils import UUIDT
 from posthog.schema import (
@@ -88,6 +90,19 @@ class TestActorsQueryRunner(ClickhouseTestMixin, APIBaseTest):
         assert response.results[0][0].get("properties").get("random_uuid") == self.random_uuid
         assert len(response.results[0][0].get("distinct_ids")) > 0
 
+    @patch.object(PersonStrategy, "batch_size", 3)
+    def test_persons_query_enriches_persons_in_batches(self):
+        self.random_uuid = self._create_random_persons()
+        runner = self._create_runner(ActorsQuery(select=["person", "properties.index"], orderBy=["properties.index"]))
+
+        response = runner.calculate()
+
+        assert response.missing_actors_count == 0
+        assert [row[0]["properties"]["index"] for row in response.results] == list(range(10))
+        assert [row[0]["distinct_ids"] for row in response.results] == [
+            [f"id-{self.random_uuid}-{index}"] for index in range(10)
+        ]
+
     def test_persons_query_properties(self):
         self.random_uuid = self._create_random_persons()
         runner = self._create_runner(
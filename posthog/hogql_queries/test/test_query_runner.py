@@ -7,6 +7,7 @@ from django.core.cache import cache
 from freezegun import freeze_time
 from pydantic import BaseModel
 
+from posthog.hogql_queries.insights.trends.trends_query_runner import TrendsQueryRunner
 from posthog.hogql_queries.query_runner import ExecutionMode, QueryRunner
 from posthog.models.team.team import Team
 from posthog.schema import (
@@ -147,6 +148,21 @@ class TestQueryRunner(BaseTest):
         cache_key = runner.get_cache_key()
         self.assertEqual(cache_key, "cache_e0c2bb1ad091102533399ebdddbfb24d")
 
+    def test_cache_key_ignores_display_only_changes(self):
+        def cache_key(trends_filter: dict, **kwargs) -> str:
+            query = {"kind": "TrendsQuery", "series": [{"kind": "EventsNode", "event": "$pageview"}], **kwargs}
+            return TrendsQueryRunner(query={**query, "trendsFilter": trends_filter}, team=self.team).get_cache_key()
+
+        line_graph = cache_key({"display": "ActionsLineGraph"})
+        self.assertEqual(cache_key({"display": "ActionsStackedBar", "showLegend": True}), line_graph)
+        self.assertEqual(cache_key({"hiddenLegendIndexes": [0], "yAxisScaleType": "log10"}), line_graph)
+        self.assertEqual(cache_key({}, compareFilter={"compare": False, "compare_to": "-1w"}), line_graph)
+
+        self.assertEqual(cache_key({"display": "BoldNumber"}), cache_key({"display": "ActionsPie"}))
+        self.assertNotEqual(cache_key({"display": "BoldNumber"}), line_graph)
+        self.assertNotEqual(cache_key({"display": "WorldMap"}), cache_key({"display": "ActionsPie"}))
+        self.assertNotEqual(cache_key({}, compareFilter={"compare": True}), line_graph)
+
     @mock.patch("django.db.transaction.on_commit")
     def test_cache_response(self, mock_on_commit):
         TestQueryRunner = self.setup_test_query_runner_class()
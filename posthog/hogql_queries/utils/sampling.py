@@ -0,0 +1,13 @@
+from posthog.schema import SamplingRate
+
+
+def sample_rate_from_count(count: int) -> SamplingRate:
+    # Change the sample rate so that the query will sample about 100_000 to 1_000_000 events, but use defined steps of
+    # sample rate. These numbers are just a starting point, and we can tune as we get feedback.
+    sample_target = 10_000
+    sample_rate_steps = [1_000, 100, 10]
+
+    for step in sample_rate_steps:
+        if count / sample_target >= step:
+            return SamplingRate(numerator=1, denominator=step)
+    return SamplingRate(numerator=1)
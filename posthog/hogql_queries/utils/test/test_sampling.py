@@ -0,0 +1,17 @@
+from unittest import TestCase
+
+from posthog.hogql_queries.utils.sampling import sample_rate_from_count
+from posthog.schema import SamplingRate
+
+
+class TestSampling(TestCase):
+    def test_sample_rate_from_count(self):
+        self.assertEqual(SamplingRate(numerator=1), sample_rate_from_count(0))
+        self.assertEqual(SamplingRate(numerator=1), sample_rate_from_count(1_000))
+        self.assertEqual(SamplingRate(numerator=1), sample_rate_from_count(10_000))
+        self.assertEqual(SamplingRate(numerator=1, denominator=10), sample_rate_from_count(100_000))
+        self.assertEqual(SamplingRate(numerator=1, denominator=10), sample_rate_from_count(999_999))
+        self.assertEqual(SamplingRate(numerator=1, denominator=100), sample_rate_from_count(1_000_000))
+        self.assertEqual(SamplingRate(numerator=1, denominator=100), sample_rate_from_count(9_999_999))
+        self.assertEqual(SamplingRate(numerator=1, denominator=1000), sample_rate_from_count(10_000_000))
+        self.assertEqual(SamplingRate(numerator=1, denominator=1000), sample_rate_from_count(99_999_999))
@@ -1,9 +1,10 @@
 from typing import Union
+from unittest.mock import patch
 
+from django.core.cache import cache
 from freezegun import freeze_time
 
 from posthog.hogql_queries.web_analytics.stats_table import WebStatsTableQueryRunner
-from posthog.hogql_queries.web_analytics.web_analytics_query_runner import _sample_rate_from_count
 from posthog.hogql_queries.web_analytics.web_overview import WebOverviewQueryRunner
 from posthog.schema import (
     DateRange,
@@ -13,6 +14,8 @@ from posthog.schema import (
     EventPropertyFilter,
     PersonPropertyFilter,
     PropertyOperator,
+    HogQLQueryResponse,
+    Sampling,
     SamplingRate,
 )
 from posthog.test.base import (
@@ -102,13 +105,23 @@ class TestWebStatsTableQueryRunner(ClickhouseTestMixin, APIBaseTest):
 
         self.assertNotEqual(key_a, key_b)
 
-    def test_sample_rate_from_count(self):
-        self.assertEqual(SamplingRate(numerator=1), _sample_rate_from_count(0))
-        self.assertEqual(SamplingRate(numerator=1), _sample_rate_from_count(1_000))
-        self.assertEqual(SamplingRate(numerator=1), _sample_rate_from_count(10_000))
-        self.assertEqual(SamplingRate(numerator=1, denominator=10), _sample_rate_from_count(100_000))
-        self.assertEqual(SamplingRate(numerator=1, denominator=10), _sample_rate_from_count(999_999))
-        self.assertEqual(SamplingRate(numerator=1, denominator=100), _sample_rate_from_count(1_000_000))
-        self.assertEqual(SamplingRate(numerator=1, denominator=100), _sample_rate_from_count(9_999_999))
-        self.assertEqual(SamplingRate(numerator=1, denominator=1000), _sample_rate_from_count(10_000_000))
-        self.assertEqual(SamplingRate(numerator=1, denominator=1000), _sample_rate_from_count(99_999_999))
+    def test_sample_rate_is_calculated_once_across_runners(self):
+        cache.clear()
+        date_from = "2023-12-08"
+        date_to = "2023-12-15"
+        runners = [
+            self._create_web_stats_table_query(date_from, date_to, [], breakdown_by=WebStatsBreakdown.BROWSER),
+            self._create_web_stats_table_query(date_from, date_to, [], breakdown_by=WebStatsBreakdown.OS),
+            self._create__web_overview_query(date_from, date_to, []),
+        ]
+        for runner in runners:
+            runner.query.sampling = Sampling(enabled=True)
+
+        with patch(
+            "posthog.hogql_queries.web_analytics.web_analytics_query_runner.execute_hogql_query",
+            return_value=HogQLQueryResponse(results=[[100_000]]),
+        ) as mock_execute_hogql_query:
+            sample_rates = [runner._sample_rate for runner in runners]
+
+        mock_execute_hogql_query.assert_called_once()
+        self.assertEqual([SamplingRate(numerator=1, denominator=1000)] * 3, sample_rates)
@@ -17,6 +17,7 @@ from posthog.hogql_queries.query_runner import QueryRunner
 from posthog.hogql_queries.utils.query_date_range import QueryDateRange
 from posthog.hogql_queries.utils.query_compare_to_date_range import QueryCompareToDateRange
 from posthog.hogql_queries.utils.query_previous_period_date_range import QueryPreviousPeriodDateRange
+from posthog.hogql_queries.utils.sampling import sample_rate_from_count
 from posthog.models import Action
 from posthog.models.filters.mixins.utils import cached_property
 from posthog.schema import (
@@ -366,12 +367,12 @@ WHERE
             )
 
         if not response.results or not response.results[0] or not response.results[0][0]:
-            return SamplingRate(numerator=1)
-
-        count = response.results[0][0] * 1000
-        fresh_sample_rate = _sample_rate_from_count(count)
+            fresh_sample_rate = SamplingRate(numerator=1)
+        else:
+            count = response.results[0][0] * 1000
+            fresh_sample_rate = sample_rate_from_count(count)
 
-        cache.set(cache_key, fresh_sample_rate, settings.CACHED_RESULTS_TTL)
+        cache.set(cache_key, fresh_sample_rate.model_dump(), settings.CACHED_RESULTS_TTL)
 
         return fresh_sample_rate
 
@@ -402,17 +403,5 @@ WHERE
         return f"{original}_{self.team.path_cleaning_filters}"
 
 
-def _sample_rate_from_count(count: int) -> SamplingRate:
-    # Change the sample rate so that the query will sample about 100_000 to 1_000_000 events, but use defined steps of
-    # sample rate. These numbers are just a starting point, and we can tune as we get feedback.
-    sample_target = 10_000
-    sample_rate_steps = [1_000, 100, 10]
-
-    for step in sample_rate_steps:
-        if count / sample_target >= step:
-            return SamplingRate(numerator=1, denominator=step)
-    return SamplingRate(numerator=1)
-
-
 def map_columns(results, mapper: dict[int, typing.Callable]):
     return [[mapper[i](data, row) if i in mapper else data for i, data in enumerate(row)] for row in results]
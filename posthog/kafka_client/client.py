@@ -3,6 +3,7 @@ from enum import StrEnum
 from typing import Any, Optional
 from collections.abc import Callable
 
+import orjson
 from django.conf import settings
 from kafka import KafkaConsumer as KC
 from kafka import KafkaProducer as KP
@@ -24,6 +25,20 @@ KAFKA_PRODUCER_RETRIES = 5
 logger = get_logger(__name__)
 
 
+def json_dumps(d: Any) -> bytes:
+    """
+    Serializes to JSON with orjson, which is several times faster than the stdlib for event payloads.
+
+    The output decodes to the same value as `json.dumps`, but isn't byte for byte identical: it's compact and
+    non-ASCII characters are written as UTF-8 rather than escaped. orjson is stricter than the stdlib (e.g. about
+    lone surrogates, non-string keys or integers over 64 bits), so for those payloads we fall back to the stdlib.
+    """
+    try:
+        return orjson.dumps(d)
+    except orjson.JSONEncodeError:
+        return json.dumps(d).encode("utf-8")
+
+
 class KafkaProducerForTests:
     def __init__(self):
         pass
@@ -144,8 +159,7 @@ class _KafkaProducer:
 
     @staticmethod
     def json_serializer(d):
-        b = json.dumps(d).encode("utf-8")
-        return b
+        return json_dumps(d)
 
     def on_send_success(self, record_metadata: RecordMetadata):
         statsd.incr("posthog_cloud_kafka_send_success", tags={"topic": record_metadata.topic})
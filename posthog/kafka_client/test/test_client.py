@@ -1,9 +1,10 @@
+import json
 from unittest.mock import patch
 
 import kafka
 from django.test import TestCase, override_settings
 
-from posthog.kafka_client.client import _KafkaProducer, build_kafka_consumer
+from posthog.kafka_client.client import _KafkaProducer, build_kafka_consumer, json_dumps
 
 
 @override_settings(TEST=False)
@@ -33,6 +34,21 @@ class KafkaClientTestCase(TestCase):
         payload = next(consumer)
         self.assertEqual(payload.value, self.payload)
 
+    def test_json_serializer_decodes_like_stdlib(self):
+        event = {"event": "🤓", "properties": {"nested": [1, 2.5, None, True], "quote": 'some "text"\n'}}
+        envelope = {"uuid": "some-uuid", "data": json_dumps(event).decode("utf-8"), "sent_at": ""}
+
+        serialized = _KafkaProducer.json_serializer(envelope)
+
+        self.assertEqual(json.loads(serialized), json.loads(json.dumps(envelope)))
+        self.assertEqual(json.loads(json.loads(serialized)["data"]), event)
+
+    def test_json_serializer_falls_back_to_stdlib(self):
+        # orjson rejects lone surrogates and non string keys
+        payload = {"surrogate": "\ud83d", 1: "non string key"}
+
+        self.assertEqual(_KafkaProducer.json_serializer(payload), json.dumps(payload).encode("utf-8"))
+
     def test_kafka_default_security_protocol(self):
         producer = _KafkaProducer(test=False)
         self.assertEqual(producer.producer.config["security_protocol"], "PLAINTEXT")  # type: ignore
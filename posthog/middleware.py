@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from posthog.geoip import get_geoip_properties
 import time
+from contextlib import nullcontext
 from ipaddress import ip_address, ip_network
 from typing import Any, Optional, cast
 from collections.abc import Callable
@@ -30,12 +31,14 @@ from posthog.api.capture import get_event
 from posthog.api.decide import get_decide
 from posthog.api.shared import UserBasicSerializer
 from posthog.clickhouse.client.execute import clickhouse_query_counter
+from posthog.clickhouse.query_deadline import query_deadline
 from posthog.clickhouse.query_tagging import QueryCounter, reset_query_tags, tag_queries
 from posthog.cloud_utils import is_cloud
 from posthog.exceptions import generate_exception_response
 from posthog.metrics import LABEL_TEAM_ID
 from posthog.models import Action, Cohort, Dashboard, FeatureFlag, Insight, Notebook, User, Team
 from posthog.rate_limit import DecideRateThrottle
+from posthog.redis import batched_commands
 from posthog.settings import SITE_URL, DEBUG, PROJECT_SWITCHING_TOKEN_ALLOWLIST
 from posthog.user_permissions import UserPermissions
 from .auth import PersonalAPIKeyAuthentication
@@ -319,7 +322,13 @@ class CHQueries:
         )
 
         try:
-            response: HttpResponse = self.get_response(request)
+            with (
+                batched_commands(),
+                query_deadline(settings.API_QUERY_DEADLINE_SECONDS)
+                if settings.API_QUERY_DEADLINE_SECONDS
+                else nullcontext(),
+            ):
+                response: HttpResponse = self.get_response(request)
 
             if "api/" in request.path and "capture" not in request.path:
                 statsd.incr(
@@ -406,7 +415,8 @@ class ShortCircuitMiddleware:
                     http_user_agent=request.META.get("HTTP_USER_AGENT"),
                 )
                 if self.decide_throttler.allow_request(request, None):
-                    return get_decide(request)
+                    with batched_commands():
+                        return get_decide(request)
                 else:
                     return cors_response(
                         request,
@@ -1,5 +1,7 @@
 import time
+from collections.abc import Iterable
 from datetime import datetime
+from itertools import islice
 from typing import Any, Literal, Optional, Union, cast
 
 import structlog
@@ -34,6 +36,10 @@ INSERT INTO "posthog_cohortpeople" ("person_id", "cohort_id", "version")
 ON CONFLICT DO NOTHING
 """
 
+INSERT_USERS_BATCH_SIZE = 1000
+# How often (in batches) the cohort's count is updated while inserting users, to report progress on large uploads
+INSERT_USERS_PROGRESS_EVERY_N_BATCHES = 10
+
 
 class Group:
     def __init__(
@@ -250,17 +256,20 @@ class Cohort(models.Model):
 
         clear_stale_cohort.delay(self.pk, before_version=pending_version)
 
-    def insert_users_by_list(self, items: list[str], *, team_id: Optional[int] = None) -> None:
+    def insert_users_by_list(self, items: Iterable[str], *, team_id: Optional[int] = None) -> None:
         """
-        Insert a list of users identified by their distinct ID into the cohort, for the given team.
+        Insert users identified by their distinct ID into the cohort, for the given team.
+
+        Items are consumed lazily in batches, so a generator streaming a large upload never has to be held in memory.
+        While the insert runs, `count` is periodically bumped by the number of persons inserted so far, so that the
+        progress of large uploads is visible on the cohort. It's replaced by the exact size once done.
 
         Args:
-            items: List of distinct IDs of users to be inserted into the cohort.
+            items: Distinct IDs of users to be inserted into the cohort.
             team_id: ID of the team for which to insert the users. Defaults to `self.team`, because of a lot of existing usage in tests.
         """
         if team_id is None:
             team_id = self.team_id
-        batchsize = 1000
         from posthog.models.cohort.util import (
             insert_static_cohort,
             get_static_cohort_size,
@@ -274,8 +283,11 @@ class Cohort(models.Model):
 
         try:
             cursor = connection.cursor()
-            for i in range(0, len(items), batchsize):
-                batch = items[i : i + batchsize]
+            items = iter(items)
+            initial_count = self.count or 0
+            inserted_count = 0
+            batch_index = 0
+            while batch := list(islice(items, INSERT_USERS_BATCH_SIZE)):
                 persons_query = (
                     Person.objects.filter(team_id=team_id)
                     .filter(
@@ -286,8 +298,9 @@ class Cohort(models.Model):
                     )
                     .exclude(cohort__id=self.id)
                 )
+                person_uuids = list(persons_query.values_list("uuid", flat=True))
                 insert_static_cohort(
-                    list(persons_query.values_list("uuid", flat=True)),
+                    person_uuids,
                     self.pk,
                     team_id=team_id,
                 )
@@ -302,6 +315,11 @@ class Cohort(models.Model):
                 )
                 cursor.execute(query, params)
 
+                inserted_count += len(person_uuids)
+                batch_index += 1
+                if batch_index % INSERT_USERS_PROGRESS_EVERY_N_BATCHES == 0:
+                    Cohort.objects.filter(pk=self.pk).update(count=initial_count + inserted_count, is_calculating=True)
+
             count = get_static_cohort_size(cohort_id=self.id, team_id=self.team_id)
             self.count = count
 
@@ -1,5 +1,9 @@
+import codecs
+import csv
 import uuid
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any, Optional, Union, cast
 
 import structlog
@@ -43,6 +47,8 @@ from posthog.queries.person_distinct_id_query import get_team_distinct_ids_query
 # temporary marker to denote when cohortpeople table started being populated
 TEMP_PRECALCULATED_MARKER = parser.parse("2021-06-07T15:00:00+00:00")
 
+INSERT_STATIC_COHORT_BATCH_SIZE = 10_000
+
 logger = structlog.get_logger(__name__)
 
 
@@ -271,18 +277,39 @@ def format_cohort_subquery(
     return person_query, params
 
 
-def insert_static_cohort(person_uuids: list[Optional[uuid.UUID]], cohort_id: int, *, team_id: int):
-    persons = [
-        {
-            "id": str(uuid.uuid4()),
-            "person_id": str(person_uuid),
-            "cohort_id": cohort_id,
-            "team_id": team_id,
-            "_timestamp": datetime.now(),
-        }
-        for person_uuid in person_uuids
-    ]
-    sync_execute(INSERT_PERSON_STATIC_COHORT, persons)
+def insert_static_cohort(person_uuids: Iterable[Optional[uuid.UUID]], cohort_id: int, *, team_id: int):
+    """Insert persons into the static cohort table, in chunks so that no single INSERT grows unbounded."""
+    person_uuids = iter(person_uuids)
+    while batch := list(islice(person_uuids, INSERT_STATIC_COHORT_BATCH_SIZE)):
+        persons = [
+            {
+                "id": str(uuid.uuid4()),
+                "person_id": str(person_uuid),
+                "cohort_id": cohort_id,
+                "team_id": team_id,
+                "_timestamp": datetime.now(),
+            }
+            for person_uuid in batch
+        ]
+        sync_execute(INSERT_PERSON_STATIC_COHORT, persons)
+
+
+def parse_distinct_ids_from_csv(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the first column of each non-empty row of a static cohort CSV upload, reading it incrementally."""
+    for row in csv.reader(lines):
+        if len(row) > 0 and row[0]:
+            yield row[0]
+
+
+def iter_csv_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Split a stream of byte chunks, e.g. read from object storage, into decoded lines."""
+    remainder = ""
+    for text in codecs.iterdecode(chunks, encoding):
+        lines = (remainder + text).splitlines(keepends=True)
+        remainder = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    if remainder:
+        yield remainder
 
 
 def get_static_cohort_size(*, cohort_id: int, team_id: int) -> Optional[int]:
@@ -406,6 +406,22 @@ WHERE
 LIMIT 10
 """
 
+SELECT_TOP_PROP_VALUES_SQL = """
+SELECT
+    {property_field} as value,
+    count()
+FROM
+    events
+WHERE
+    team_id = %(team_id)s
+    {property_exists_filter}
+    {parsed_date_from}
+    {parsed_date_to}
+GROUP BY value
+ORDER BY count() DESC
+LIMIT {limit}
+"""
+
 SELECT_EVENT_BY_TEAM_AND_CONDITIONS_SQL = """
 SELECT
     uuid,
@@ -6,7 +6,7 @@ from posthog.helpers.dashboard_templates import (
 from django.db.models import Q
 from posthog.models.feature_flag.feature_flag import FeatureFlag
 from posthog.models import Team
-from posthog.redis import redis, get_client
+from posthog.redis import redis, get_client, queue_command
 import time
 from sentry_sdk import capture_exception
 from django.conf import settings
@@ -37,10 +37,9 @@ def increment_request_count(
     team_id: int, count: int = 1, request_type: FlagRequestType = FlagRequestType.DECIDE
 ) -> None:
     try:
-        client = get_client()
         time_bucket = str(int(time.time() / CACHE_BUCKET_SIZE))
         key_name = get_team_request_key(team_id, request_type)
-        client.hincrby(key_name, time_bucket, count)
+        queue_command("hincrby", key_name, time_bucket, count)
     except Exception as error:
         capture_exception(error)
 
@@ -55,11 +54,12 @@ def _extract_total_count_for_key_from_redis_hash(client: redis.Redis, key: str)
     # It will be counted in a later iteration, when it's not being filled anymore.
     if time_buckets and len(time_buckets) > 1:
         # redis returns encoded bytes, so we need to convert them into unix epoch for sorting
-        for time_bucket in sorted(time_buckets, key=lambda bucket: int(bucket))[:-1]:
+        counted_time_buckets = sorted(time_buckets, key=lambda bucket: int(bucket))[:-1]
+        for time_bucket in counted_time_buckets:
             min_time = min(min_time, int(time_bucket) * CACHE_BUCKET_SIZE)
             max_time = max(max_time, int(time_bucket) * CACHE_BUCKET_SIZE)
             total_count += int(existing_values[time_bucket])
-            client.hdel(key, time_bucket)
+        client.hdel(key, *counted_time_buckets)
 
     return total_count, min_time, max_time
 
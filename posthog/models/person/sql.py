@@ -500,7 +500,7 @@ FROM (
 )
 GROUP BY value
 ORDER BY count(value) DESC
-LIMIT 20
+LIMIT {limit}
 """
 
 SELECT_PERSON_PROP_VALUES_SQL_WITH_FILTER = """
@@ -521,7 +521,7 @@ FROM (
 )
 GROUP BY value
 ORDER BY count(value) DESC
-LIMIT 20
+LIMIT {limit}
 """
 
 GET_PERSON_COUNT_FOR_TEAM = "SELECT count() AS count FROM person WHERE team_id = %(team_id)s"
@@ -1,3 +1,4 @@
+from copy import deepcopy
 import json
 import os
 from typing import Any, Optional
@@ -5,6 +6,7 @@ from django.conf import settings
 from django.db import models
 from django.http import HttpRequest
 from django.utils import timezone
+import orjson
 from prometheus_client import Counter
 import requests
 from sentry_sdk import capture_exception
@@ -38,6 +40,12 @@ REMOTE_CONFIG_CACHE_COUNTER = Counter(
     labelnames=["result"],
 )
 
+REMOTE_CONFIG_DECIDE_CACHE_COUNTER = Counter(
+    "posthog_remote_config_decide_via_cache",
+    "Metric tracking whether the serialized /decide config was fetched from cache or not",
+    labelnames=["result"],
+)
+
 REMOTE_CONFIG_CDN_PURGE_COUNTER = Counter(
     "posthog_remote_config_cdn_purge",
     "Number of times the remote config CDN purge task has been run",
@@ -72,6 +80,10 @@ def cache_key_for_team_token(team_token: str) -> str:
     return f"remote_config/{team_token}/config"
 
 
+def cache_key_for_team_token_decide(team_token: str) -> str:
+    return f"remote_config/{team_token}/decide"
+
+
 def sanitize_config_for_public_cdn(config: dict, request: Optional[HttpRequest] = None) -> dict:
     from posthog.api.utils import on_permitted_recording_domain
 
@@ -90,6 +102,23 @@ def sanitize_config_for_public_cdn(config: dict, request: Optional[HttpRequest]
     return config
 
 
+def convert_config_for_decide(config: dict) -> dict:
+    """
+    Converts a sanitized RemoteConfig config into the shape the /decide endpoint responds with, minus the feature flags
+    """
+    # Add in a bunch of backwards compatibility stuff
+    config["isAuthenticated"] = False
+    config["toolbarParams"] = {}
+    config["config"] = {"enable_collect_everything": True}
+    config["surveys"] = True if len(config["surveys"]) > 0 else False
+
+    # Remove some stuff that is specific to the new RemoteConfig
+    del config["hasFeatureFlags"]
+    del config["token"]
+
+    return config
+
+
 class RemoteConfig(UUIDModel):
     """
     RemoteConfig is a helper model. There is one per team and stores a highly cacheable JSON object
@@ -322,6 +351,30 @@ class RemoteConfig(UUIDModel):
 
         return config
 
+    @classmethod
+    def get_serialized_decide_config_via_token(
+        cls, token: str, request: Optional[HttpRequest] = None
+    ) -> Optional[bytes]:
+        """
+        Returns the /decide config as pre-serialized JSON so the endpoint only has to splice in the flags.
+        Only the sync writes this cache, so a miss returns None and the caller should build the config itself.
+        """
+        from posthog.api.utils import on_permitted_recording_domain
+
+        data = cache.get(cache_key_for_team_token_decide(token))
+
+        if not data:
+            REMOTE_CONFIG_DECIDE_CACHE_COUNTER.labels(result="miss").inc()
+            return None
+
+        REMOTE_CONFIG_DECIDE_CACHE_COUNTER.labels(result="hit").inc()
+
+        # Empty list of domains means always permitted
+        if request and data["domains"] and not on_permitted_recording_domain(data["domains"], request=request):
+            return data["config_without_recording"]
+
+        return data["config"]
+
     @classmethod
     def get_config_js_via_token(cls, token: str, request: Optional[HttpRequest] = None) -> str:
         config = cls._get_config_via_cache(token)
@@ -360,6 +413,8 @@ class RemoteConfig(UUIDModel):
             config = self.build_config()
 
             if not force and config == self.config:
+                # The decide cache is invalidated on save, so it may need restoring even if nothing changed
+                self._cache_decide_config(config)
                 CELERY_TASK_REMOTE_CONFIG_SYNC.labels(result="no_changes").inc()
                 logger.info(f"RemoteConfig for team {self.team_id} is unchanged")
                 return
@@ -370,6 +425,7 @@ class RemoteConfig(UUIDModel):
 
             # Update the redis cache key for the config
             cache.set(cache_key_for_team_token(self.team.api_token), config, timeout=CACHE_TIMEOUT)
+            self._cache_decide_config(config)
             # Invalidate Cloudflare CDN cache
             self._purge_cdn()
 
@@ -380,6 +436,26 @@ class RemoteConfig(UUIDModel):
             CELERY_TASK_REMOTE_CONFIG_SYNC.labels(result="failure").inc()
             raise
 
+    def _cache_decide_config(self, config: dict):
+        # NOTE: Both variants are serialized up front so that /decide never has to touch the dict.
+        # The recording domains check is the only part that depends on the request.
+        decide_config = convert_config_for_decide(sanitize_config_for_public_cdn(deepcopy(config)))
+        domains = (config.get("sessionRecording") or {}).get("domains") or []
+
+        config_without_recording = None
+        if domains:
+            config_without_recording = orjson.dumps({**decide_config, "sessionRecording": False})
+
+        cache.set(
+            cache_key_for_team_token_decide(self.team.api_token),
+            {
+                "domains": domains,
+                "config": orjson.dumps(decide_config),
+                "config_without_recording": config_without_recording,
+            },
+            timeout=CACHE_TIMEOUT,
+        )
+
     def _purge_cdn(self):
         if (
             not settings.REMOTE_CONFIG_CDN_PURGE_ENDPOINT
@@ -425,13 +501,20 @@ def _update_team_remote_config(team_id: int):
     update_team_remote_config.delay(team_id)
 
 
+def _invalidate_decide_config(team_token: str):
+    # /decide falls back to building the config until the update task has re-synced it
+    cache.delete(cache_key_for_team_token_decide(team_token))
+
+
 @receiver(post_save, sender=Team)
 def team_saved(sender, instance: "Team", created, **kwargs):
+    _invalidate_decide_config(instance.api_token)
     _update_team_remote_config(instance.id)
 
 
 @receiver(post_save, sender=FeatureFlag)
 def feature_flag_saved(sender, instance: "FeatureFlag", created, **kwargs):
+    _invalidate_decide_config(instance.team.api_token)
     _update_team_remote_config(instance.team_id)
 
 
@@ -39,7 +39,12 @@ from posthog.utils import GenericEmails
 
 from ...hogql.modifiers import set_default_modifier_values
 from ...schema import HogQLQueryModifiers, PathCleaningFilter, PersonsOnEventsMode
-from .team_caching import get_team_in_cache, set_team_in_cache
+from .team_caching import (
+    UNKNOWN_TOKEN,
+    lookup_team_in_cache,
+    set_team_in_cache,
+    set_unknown_token_in_cache,
+)
 
 if TYPE_CHECKING:
     from posthog.models.user import User
@@ -143,15 +148,18 @@ class TeamManager(models.Manager):
         if not token:
             return None
         try:
-            team = get_team_in_cache(token)
-            if team:
-                return team
+            cached_team = lookup_team_in_cache(token)
+            if isinstance(cached_team, Team):
+                return cached_team
+            if cached_team == UNKNOWN_TOKEN:
+                return None
 
             team = Team.objects.get(api_token=token)
             set_team_in_cache(token, team)
             return team
 
         except Team.DoesNotExist:
+            set_unknown_token_in_cache(token)
             return None
 
     def increment_id_sequence(self) -> int:
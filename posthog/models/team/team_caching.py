@@ -1,7 +1,11 @@
 import json
-from typing import TYPE_CHECKING, Optional
+import threading
+from typing import TYPE_CHECKING, Any, Final, Literal, Optional, Union
 
+from cachetools import TTLCache
+from django.conf import settings
 from django.core.cache import cache
+from prometheus_client import Counter
 from sentry_sdk import capture_exception
 
 if TYPE_CHECKING:
@@ -9,6 +13,36 @@ if TYPE_CHECKING:
 
 FIVE_DAYS = 60 * 60 * 24 * 5  # 5 days in seconds
 
+# Tokens that don't belong to any team are remembered for a short while, so that floods of requests with bad tokens
+# don't each hit Postgres. Short, as a team could be created with the token in the meantime.
+UNKNOWN_TOKEN_TTL_SECONDS = 60
+UNKNOWN_TOKEN: Final = "__unknown__"
+
+# Every process keeps the teams it looked up recently in memory, in front of Redis. Saving a team updates the cache of
+# the process that saved it, other processes pick up the change once their entry expires.
+# Disabled in tests, as their teams are rolled back without signals and the memory would outlive them.
+LOCAL_CACHE_TTL_SECONDS = 0 if settings.TEST else 10
+LOCAL_CACHE_SIZE = 1000
+
+_local_cache: TTLCache[str, Any] = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=max(LOCAL_CACHE_TTL_SECONDS, 1))
+_local_cache_lock = threading.Lock()  # TTLCache isn't thread safe
+
+TEAM_CACHE_LOOKUP_COUNTER = Counter(
+    "posthog_team_cache_lookup",
+    "Lookups of teams by token, by where they were answered from",
+    labelnames=["result"],
+)
+
+
+def _set_local(token: str, team_data: Any) -> None:
+    if not LOCAL_CACHE_TTL_SECONDS:
+        return
+    with _local_cache_lock:
+        if team_data is None:
+            _local_cache.pop(token, None)
+        else:
+            _local_cache[token] = team_data
+
 
 def set_team_in_cache(token: str, team: Optional["Team"] = None) -> None:
     from posthog.api.team import CachingTeamSerializer
@@ -19,15 +53,34 @@ def set_team_in_cache(token: str, team: Optional["Team"] = None) -> None:
             team = Team.objects.get(api_token=token)
         except (Team.DoesNotExist, Team.MultipleObjectsReturned):
             cache.delete(f"team_token:{token}")
+            _set_local(token, None)
             return
 
     serialized_team = CachingTeamSerializer(team).data
 
-    cache.set(f"team_token:{token}", json.dumps(serialized_team), FIVE_DAYS)
+    team_data = json.dumps(serialized_team)
+    cache.set(f"team_token:{token}", team_data, FIVE_DAYS)
+    _set_local(token, team_data)
 
 
-def get_team_in_cache(token: str) -> Optional["Team"]:
-    from posthog.models.team import Team
+def set_unknown_token_in_cache(token: str) -> None:
+    """Remember that the token doesn't belong to any team."""
+    try:
+        cache.set(f"team_token:{token}", UNKNOWN_TOKEN, UNKNOWN_TOKEN_TTL_SECONDS)
+    except Exception:
+        # redis is unavailable
+        pass
+    _set_local(token, UNKNOWN_TOKEN)
+
+
+def _get_team_data(token: str) -> Optional[str]:
+    """The cached team data of the token, UNKNOWN_TOKEN if it has no team, or None if it isn't cached."""
+    if LOCAL_CACHE_TTL_SECONDS:
+        with _local_cache_lock:
+            team_data = _local_cache.get(token)
+        if team_data is not None:
+            TEAM_CACHE_LOOKUP_COUNTER.labels(result="local").inc()
+            return team_data
 
     try:
         team_data = cache.get(f"team_token:{token}")
@@ -35,6 +88,24 @@ def get_team_in_cache(token: str) -> Optional["Team"]:
         # redis is unavailable
         return None
 
+    TEAM_CACHE_LOOKUP_COUNTER.labels(result="redis" if team_data else "miss").inc()
+    if team_data:
+        _set_local(token, team_data)
+    return team_data
+
+
+def lookup_team_in_cache(token: str) -> Union["Team", Literal["__unknown__"], None]:
+    """
+    The cached team of the token, UNKNOWN_TOKEN if the token is known not to belong to any team,
+    or None if it isn't cached, all from a single cache read.
+    """
+    from posthog.models.team import Team
+
+    team_data = _get_team_data(token)
+
+    if team_data == UNKNOWN_TOKEN:
+        return UNKNOWN_TOKEN
+
     if team_data:
         try:
             parsed_data = json.loads(team_data)
@@ -46,3 +117,10 @@ def get_team_in_cache(token: str) -> Optional["Team"]:
             return None
 
     return None
+
+
+def get_team_in_cache(token: str) -> Optional["Team"]:
+    from posthog.models.team import Team
+
+    team = lookup_team_in_cache(token)
+    return team if isinstance(team, Team) else None
@@ -2,6 +2,7 @@ from decimal import Decimal
 from unittest.mock import patch
 from django.test import RequestFactory
 from inline_snapshot import snapshot
+import orjson
 import pytest
 from posthog.models.action.action import Action
 from posthog.models.feature_flag.feature_flag import FeatureFlag
@@ -9,7 +10,7 @@ from posthog.models.feedback.survey import Survey
 from posthog.models.hog_functions.hog_function import HogFunction, HogFunctionType
 from posthog.models.plugin import Plugin, PluginConfig, PluginSourceFile
 from posthog.models.project import Project
-from posthog.models.remote_config import RemoteConfig, cache_key_for_team_token
+from posthog.models.remote_config import RemoteConfig, cache_key_for_team_token, cache_key_for_team_token_decide
 from posthog.test.base import BaseTest
 from django.core.cache import cache
 
@@ -451,6 +452,53 @@ class TestRemoteConfigCaching(_RemoteConfigBase):
             config = self.remote_config.get_config_via_token(self.team.api_token, request=mock_request)
             assert not config["sessionRecording"]
 
+    def test_persists_serialized_decide_config_on_sync(self):
+        self.remote_config.sync(force=True)
+
+        with self.assertNumQueries(0):
+            data = RemoteConfig.get_serialized_decide_config_via_token(self.team.api_token)
+
+        assert data
+        config = orjson.loads(data)
+        assert "token" not in config
+        assert "hasFeatureFlags" not in config
+        assert "siteAppsJS" not in config
+        assert "domains" not in config["sessionRecording"]
+        assert config["surveys"] is False
+        assert config["isAuthenticated"] is False
+
+    def test_serialized_decide_config_only_includes_recording_for_approved_domains(self):
+        self.remote_config.sync(force=True)
+
+        mock_request = RequestFactory().get("/")
+        mock_request.META["HTTP_ORIGIN"] = "https://my.example.com"
+        data = RemoteConfig.get_serialized_decide_config_via_token(self.team.api_token, request=mock_request)
+        assert orjson.loads(data)["sessionRecording"]  # type: ignore
+
+        mock_request = RequestFactory().get("/")
+        mock_request.META["HTTP_ORIGIN"] = "https://other.com"
+        data = RemoteConfig.get_serialized_decide_config_via_token(self.team.api_token, request=mock_request)
+        assert orjson.loads(data)["sessionRecording"] is False  # type: ignore
+
+    def test_serialized_decide_config_missing_returns_none(self):
+        cache.delete(cache_key_for_team_token_decide(self.team.api_token))
+        assert RemoteConfig.get_serialized_decide_config_via_token(self.team.api_token) is None
+
+    def test_serialized_decide_config_invalidated_on_save(self):
+        self.remote_config.sync(force=True)
+        assert cache.get(cache_key_for_team_token_decide(self.team.api_token))
+
+        with patch("posthog.models.remote_config._update_team_remote_config"):
+            self.team.save()
+            assert cache.get(cache_key_for_team_token_decide(self.team.api_token)) is None
+
+        self.remote_config.sync(force=True)
+        assert cache.get(cache_key_for_team_token_decide(self.team.api_token))
+
+        with patch("posthog.models.remote_config._update_team_remote_config"):
+            FeatureFlag.objects.create(team=self.team, key="beta-feature", created_by=self.user)
+            assert cache.get(cache_key_for_team_token_decide(self.team.api_token)) is None
+
     @patch("posthog.models.remote_config.requests.post")
     def test_purges_cdn_cache_on_sync(self, mock_post):
         with self.settings(
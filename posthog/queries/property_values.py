@@ -2,7 +2,7 @@ from typing import Optional
 
 from django.utils import timezone
 
-from posthog.models.event.sql import SELECT_PROP_VALUES_SQL_WITH_FILTER
+from posthog.models.event.sql import SELECT_PROP_VALUES_SQL_WITH_FILTER, SELECT_TOP_PROP_VALUES_SQL
 from posthog.models.person.sql import (
     SELECT_PERSON_PROP_VALUES_SQL,
     SELECT_PERSON_PROP_VALUES_SQL_WITH_FILTER,
@@ -67,18 +67,44 @@ def get_property_values_for_key(
     )
 
 
-def get_person_property_values_for_key(key: str, team: Team, value: Optional[str] = None):
+def get_top_property_values_for_key(key: str, team: Team, limit: int):
+    """The most common values of an event property over the last week, with their counts."""
+    property_field, mat_column_exists = get_property_string_expr("events", key, "%(key)s", "properties")
+    parsed_date_from = "AND timestamp >= '{}'".format(
+        relative_date_parse("-7d", team.timezone_info).strftime("%Y-%m-%d 00:00:00")
+    )
+    parsed_date_to = "AND timestamp <= '{}'".format(timezone.now().strftime("%Y-%m-%d 23:59:59"))
+    if mat_column_exists:
+        property_exists_filter = "AND notEmpty({})".format(property_field)
+    else:
+        property_exists_filter = "AND JSONHas(properties, %(key)s)"
+
+    return insight_sync_execute(
+        SELECT_TOP_PROP_VALUES_SQL.format(
+            parsed_date_from=parsed_date_from,
+            parsed_date_to=parsed_date_to,
+            property_field=property_field,
+            property_exists_filter=property_exists_filter,
+            limit=limit,
+        ),
+        {"team_id": team.pk, "key": key},
+        query_type="get_top_property_values",
+        team_id=team.pk,
+    )
+
+
+def get_person_property_values_for_key(key: str, team: Team, value: Optional[str] = None, limit: int = 20):
     property_field, _ = get_property_string_expr("person", key, "%(key)s", "properties")
 
     if value:
         return insight_sync_execute(
-            SELECT_PERSON_PROP_VALUES_SQL_WITH_FILTER.format(property_field=property_field),
+            SELECT_PERSON_PROP_VALUES_SQL_WITH_FILTER.format(property_field=property_field, limit=limit),
             {"team_id": team.pk, "key": key, "value": "%{}%".format(value)},
             query_type="get_person_property_values_with_value",
             team_id=team.pk,
         )
     return insight_sync_execute(
-        SELECT_PERSON_PROP_VALUES_SQL.format(property_field=property_field),
+        SELECT_PERSON_PROP_VALUES_SQL.format(property_field=property_field, limit=limit),
         {"team_id": team.pk, "key": key},
         query_type="get_person_property_values",
         team_id=team.pk,
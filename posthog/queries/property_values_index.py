@@ -0,0 +1,124 @@
+"""
+A per-team index of the most common values of the event and person properties that are looked up in the UI.
+
+Suggesting property values used to scan ClickHouse on every keystroke of the property filter. Instead, the keys
+that teams actually look up are recorded, and a periodic task (see `posthog.tasks.property_values_index`) stores
+their top values in Redis. Lookups are served
+from the index when it can answer them exactly, and fall back to the live query otherwise, e.g. for uncommon keys
+or values outside of the top ones.
+"""
+
+import time
+from typing import Literal, Optional
+
+import orjson
+import structlog
+from prometheus_client import Counter
+from sentry_sdk import capture_exception
+
+from posthog.models import Team
+from posthog.queries.property_values import get_person_property_values_for_key, get_top_property_values_for_key
+from posthog.redis import get_client
+
+logger = structlog.get_logger(__name__)
+
+PropertyValuesIndexType = Literal["event", "person"]
+
+# How many of the most common values are kept per key
+PROPERTY_VALUES_INDEX_SIZE = 1000
+# How many of a team's most looked up keys are indexed on each refresh
+PROPERTY_VALUES_INDEX_MAX_KEYS_PER_TEAM = 50
+# The index is refreshed hourly, entries outlive a couple of missed refreshes before lookups fall back to live queries
+PROPERTY_VALUES_INDEX_TTL_SECONDS = 60 * 60 * 3
+
+TEAMS_KEY = "@posthog/property-values-index/teams"
+
+PROPERTY_VALUES_INDEX_COUNTER = Counter(
+    "posthog_property_values_index",
+    "Property value lookups, by whether the index could answer them",
+    labelnames=["property_type", "result"],
+)
+
+
+def _values_key(property_type: PropertyValuesIndexType, team_id: int, key: str) -> str:
+    return f"@posthog/property-values-index/values/{property_type}/{team_id}/{key}"
+
+
+def _requested_keys_key(property_type: PropertyValuesIndexType, team_id: int) -> str:
+    return f"@posthog/property-values-index/requested/{property_type}/{team_id}"
+
+
+def match_indexed_values(values: list[tuple[str, int]], value: Optional[str]) -> list[tuple[str, int]]:
+    """Values containing the search term, case-insensitively, in count order like the index."""
+    if not value:
+        return values
+
+    search = value.lower()
+    return [(indexed_value, count) for indexed_value, count in values if search in indexed_value.lower()]
+
+
+def get_indexed_property_values(
+    property_type: PropertyValuesIndexType, team_id: int, key: str, value: Optional[str], limit: int
+) -> Optional[list[tuple[str, int]]]:
+    """
+    Look up the values of a property in the index, recording the lookup so that the key gets indexed.
+    Returns None when the index can't answer exactly, in which case the live query should be run.
+    """
+    try:
+        pipeline = get_client().pipeline(transaction=False)
+        pipeline.get(_values_key(property_type, team_id, key))
+        pipeline.zincrby(_requested_keys_key(property_type, team_id), 1, key)
+        pipeline.expire(_requested_keys_key(property_type, team_id), PROPERTY_VALUES_INDEX_TTL_SECONDS)
+        pipeline.zadd(TEAMS_KEY, {f"{property_type}:{team_id}": time.time()})
+        raw_entry, *_ = pipeline.execute()
+    except Exception as e:
+        logger.warning("property_values_index_lookup_failed", error=e)
+        capture_exception(e)
+        return None
+
+    if raw_entry is None:
+        PROPERTY_VALUES_INDEX_COUNTER.labels(property_type=property_type, result="miss").inc()
+        return None
+
+    entry = orjson.loads(raw_entry)
+    values = [(indexed[0], indexed[1]) for indexed in entry["values"]]
+    matches = match_indexed_values(values, value)
+    if property_type == "event" and value:
+        # Searching event values returns the shortest matches, which only an index holding every value can know
+        can_answer = entry["complete"]
+        matches = sorted(matches, key=lambda match: len(match[0]))
+    else:
+        # Values that aren't in the index are less common than the ones that are, so the most common matches are in
+        # the index unless there are fewer than asked for and the index doesn't hold every value of the key
+        can_answer = entry["complete"] or len(matches) >= limit
+
+    if not can_answer:
+        PROPERTY_VALUES_INDEX_COUNTER.labels(property_type=property_type, result="fallback").inc()
+        return None
+
+    PROPERTY_VALUES_INDEX_COUNTER.labels(property_type=property_type, result="hit").inc()
+    return matches[:limit]
+
+
+def refresh_property_values_index(property_type: PropertyValuesIndexType, team: Team) -> int:
+    """Index the top values of the team's most looked up keys since the last refresh. Returns the number of keys."""
+    pipeline = get_client().pipeline(transaction=True)
+    pipeline.zrevrange(_requested_keys_key(property_type, team.pk), 0, PROPERTY_VALUES_INDEX_MAX_KEYS_PER_TEAM - 1)
+    pipeline.delete(_requested_keys_key(property_type, team.pk))
+    keys, _ = pipeline.execute()
+
+    for key in (key.decode("utf-8") for key in keys):
+        if property_type == "person":
+            rows = get_person_property_values_for_key(key, team, limit=PROPERTY_VALUES_INDEX_SIZE)
+        else:
+            rows = get_top_property_values_for_key(key, team, limit=PROPERTY_VALUES_INDEX_SIZE)
+
+        entry = {
+            "values": list(rows),
+            "complete": len(rows) < PROPERTY_VALUES_INDEX_SIZE,
+        }
+        get_client().set(
+            _values_key(property_type, team.pk, key), orjson.dumps(entry), ex=PROPERTY_VALUES_INDEX_TTL_SECONDS
+        )
+
+    return len(keys)
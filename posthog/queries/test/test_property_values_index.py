@@ -0,0 +1,82 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from posthog.queries.property_values_index import (
+    get_indexed_property_values,
+    match_indexed_values,
+    refresh_property_values_index,
+)
+from posthog.redis import get_client
+
+
+class TestPropertyValuesIndex(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        get_client().flushall()
+        self.team = MagicMock(pk=2)
+
+    def tearDown(self) -> None:
+        get_client().flushall()
+        super().tearDown()
+
+    def test_match_indexed_values(self) -> None:
+        values = [("chrome mobile", 30), ("Safari", 20), ("Chrome", 10), ("firefox", 5)]
+
+        assert match_indexed_values(values, None) == values
+        assert match_indexed_values(values, "chr") == [("chrome mobile", 30), ("Chrome", 10)]
+        assert match_indexed_values(values, "f") == [("Safari", 20), ("firefox", 5)]
+
+    def test_unindexed_keys_fall_back_to_the_live_query_and_get_indexed(self) -> None:
+        assert get_indexed_property_values("person", self.team.pk, "$browser", None, limit=20) is None
+
+        with patch(
+            "posthog.queries.property_values_index.get_person_property_values_for_key",
+            return_value=[("Chrome", 10), ("Safari", 5)],
+        ) as mock_live_query:
+            assert refresh_property_values_index("person", self.team) == 1
+        mock_live_query.assert_called_once_with("$browser", self.team, limit=1000)
+
+        assert get_indexed_property_values("person", self.team.pk, "$browser", None, limit=20) == [
+            ("Chrome", 10),
+            ("Safari", 5),
+        ]
+        assert get_indexed_property_values("person", self.team.pk, "$browser", "saf", limit=20) == [("Safari", 5)]
+        assert get_indexed_property_values("person", 3, "$browser", None, limit=20) is None
+        assert get_indexed_property_values("event", self.team.pk, "$browser", None, limit=20) is None
+
+    @patch("posthog.queries.property_values_index.PROPERTY_VALUES_INDEX_SIZE", 2)
+    def test_incomplete_index_only_answers_searches_it_can_fill(self) -> None:
+        get_indexed_property_values("event", self.team.pk, "$browser", None, limit=1)
+        with patch(
+            "posthog.queries.property_values_index.get_top_property_values_for_key",
+            return_value=[("Chrome", 10), ("Safari", 5)],
+        ):
+            refresh_property_values_index("event", self.team)
+
+        assert get_indexed_property_values("event", self.team.pk, "$browser", None, limit=1) == [("Chrome", 10)]
+        # other values could match, and be shorter, but they're outside of the top values that were indexed
+        assert get_indexed_property_values("event", self.team.pk, "$browser", "c", limit=1) is None
+        assert get_indexed_property_values("event", self.team.pk, "$browser", "edge", limit=1) is None
+
+    def test_event_value_searches_return_the_shortest_matches(self) -> None:
+        get_indexed_property_values("event", self.team.pk, "$browser", None, limit=10)
+        with patch(
+            "posthog.queries.property_values_index.get_top_property_values_for_key",
+            return_value=[("Chrome Mobile", 10), ("Chrome", 5), ("Safari", 1)],
+        ):
+            refresh_property_values_index("event", self.team)
+
+        assert get_indexed_property_values("event", self.team.pk, "$browser", "chrome", limit=10) == [
+            ("Chrome", 5),
+            ("Chrome Mobile", 10),
+        ]
+
+    def test_refresh_only_indexes_keys_looked_up_since_the_last_refresh(self) -> None:
+        get_indexed_property_values("person", self.team.pk, "$browser", None, limit=20)
+
+        with patch(
+            "posthog.queries.property_values_index.get_person_property_values_for_key", return_value=[]
+        ) as mock_live_query:
+            assert refresh_property_values_index("person", self.team) == 1
+            assert refresh_property_values_index("person", self.team) == 0
+        assert mock_live_query.call_count == 1
@@ -1,12 +1,67 @@
 # flake8: noqa
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
 from typing import Any, Dict, Optional
 
 import redis
+import structlog
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from prometheus_client import Histogram
+
+from posthog.clickhouse.query_tagging import get_query_tag_value
+
+logger = structlog.get_logger(__name__)
 
 _client_map: Dict[str, Any] = {}
 
+REDIS_COMMAND_LATENCY = Histogram(
+    "posthog_redis_command_latency_seconds",
+    "Time taken by Redis commands, including waiting for a connection from the pool",
+    labelnames=["command", "caller"],
+    buckets=(0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, float("inf")),
+)
+
+
+def _caller() -> str:
+    """The route of the current request, or the name of the current task, as tagged for ClickHouse queries."""
+    if get_query_tag_value("kind") == "celery":
+        return get_query_tag_value("id") or "celery"
+    return get_query_tag_value("route_id") or "other"
+
+
+class _CommandLatencyMixin:
+    def execute_command(self, *args, **options):
+        start_time = perf_counter()
+        try:
+            return super().execute_command(*args, **options)  # type: ignore
+        finally:
+            REDIS_COMMAND_LATENCY.labels(command=str(args[0]).lower(), caller=_caller()).observe(
+                perf_counter() - start_time
+            )
+
+
+class InstrumentedRedis(_CommandLatencyMixin, redis.Redis):
+    pass
+
+
+def _create_client(redis_url: str) -> redis.Redis:
+    pool: redis.ConnectionPool
+    if settings.REDIS_MAX_CONNECTIONS:
+        # Blocks for a connection when the pool is exhausted, instead of opening ever more of them
+        pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            db=0,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        )
+    else:
+        pool = redis.ConnectionPool.from_url(redis_url, db=0)
+    return InstrumentedRedis(connection_pool=pool)
+
 
 def get_client(redis_url: Optional[str] = None) -> redis.Redis:
     redis_url = redis_url or settings.REDIS_URL
@@ -19,9 +74,13 @@ def get_client(redis_url: Optional[str] = None) -> redis.Redis:
         if settings.TEST:
             import fakeredis
 
-            client = fakeredis.FakeRedis()
+            # fakeredis' own from_url signature differs from redis.Redis's, which the mixin doesn't touch
+            class InstrumentedFakeRedis(_CommandLatencyMixin, fakeredis.FakeRedis):  # type: ignore[misc]
+                pass
+
+            client = InstrumentedFakeRedis()
         elif redis_url:
-            client = redis.from_url(redis_url, db=0)
+            client = _create_client(redis_url)
 
         if not client:
             raise ImproperlyConfigured("Redis not configured!")
@@ -31,6 +90,61 @@ def get_client(redis_url: Optional[str] = None) -> redis.Redis:
     return _client_map[redis_url]
 
 
+class _QueuedCommands:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()  # Threads started with a copy of the context share the queue
+        self.commands: list[tuple[Optional[str], str, tuple, dict]] = []
+
+
+_queued_commands: ContextVar[Optional[_QueuedCommands]] = ContextVar("redis_queued_commands", default=None)
+
+
+def queue_command(command: str, *args, redis_url: Optional[str] = None, **kwargs) -> None:
+    """
+    Run a command whose result isn't needed, e.g. `queue_command("zadd", key, mapping)`.
+    Within `batched_commands`, it's sent along with the other queued commands when the block exits.
+    """
+    queued = _queued_commands.get()
+    if queued is None:
+        getattr(get_client(redis_url), command)(*args, **kwargs)
+        return
+
+    with queued.lock:
+        queued.commands.append((redis_url, command, args, kwargs))
+
+
+@contextmanager
+def batched_commands() -> Iterator[None]:
+    """
+    Send the commands queued within the block, e.g. during a request, in one pipeline per Redis URL.
+    Failing to send them is logged, they're only used for writes that don't affect the result of the block.
+    """
+    queued = _QueuedCommands()
+    token = _queued_commands.set(queued)
+    try:
+        yield
+    finally:
+        _queued_commands.reset(token)
+        _send_queued_commands(queued.commands)
+
+
+def _send_queued_commands(commands: list[tuple[Optional[str], str, tuple, dict]]) -> None:
+    pipelines: dict[Optional[str], Any] = {}
+    for redis_url, command, args, kwargs in commands:
+        if redis_url not in pipelines:
+            pipelines[redis_url] = get_client(redis_url).pipeline(transaction=False)
+        getattr(pipelines[redis_url], command)(*args, **kwargs)
+
+    for pipeline in pipelines.values():
+        start_time = perf_counter()
+        try:
+            pipeline.execute()
+        except Exception as e:
+            logger.warning("redis_queued_commands_failed", error=e)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(command="pipeline", caller=_caller()).observe(perf_counter() - start_time)
+
+
 def TEST_clear_clients():
     global _client_map
     for key in list(_client_map.keys()):
@@ -2804,6 +2804,10 @@ class QueryResponseAlternative28(BaseModel):
         default=None,
         description="Query error. Returned only if 'explain' or `modifiers.debug` is true. Throws an error otherwise.",
     )
+    full_refresh_at: Optional[AwareDatetime] = Field(
+        default=None,
+        description="When the results were last calculated in full, if they have since been refreshed incrementally",
+    )
     hasMore: Optional[bool] = Field(default=None, description="Wether more breakdown values are available.")
     hogql: Optional[str] = Field(default=None, description="Generated HogQL query.")
     modifiers: Optional[HogQLQueryModifiers] = Field(
@@ -3289,6 +3293,10 @@ class TrendsQueryResponse(BaseModel):
         default=None,
         description="Query error. Returned only if 'explain' or `modifiers.debug` is true. Throws an error otherwise.",
     )
+    full_refresh_at: Optional[AwareDatetime] = Field(
+        default=None,
+        description="When the results were last calculated in full, if they have since been refreshed incrementally",
+    )
     hasMore: Optional[bool] = Field(default=None, description="Wether more breakdown values are available.")
     hogql: Optional[str] = Field(default=None, description="Generated HogQL query.")
     modifiers: Optional[HogQLQueryModifiers] = Field(
@@ -4214,6 +4222,10 @@ class CachedTrendsQueryResponse(BaseModel):
         default=None,
         description="Query error. Returned only if 'explain' or `modifiers.debug` is true. Throws an error otherwise.",
     )
+    full_refresh_at: Optional[AwareDatetime] = Field(
+        default=None,
+        description="When the results were last calculated in full, if they have since been refreshed incrementally",
+    )
     hasMore: Optional[bool] = Field(default=None, description="Wether more breakdown values are available.")
     hogql: Optional[str] = Field(default=None, description="Generated HogQL query.")
     is_cached: bool
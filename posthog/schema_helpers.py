@@ -71,6 +71,9 @@ def to_dict(query: BaseModel) -> dict:
                                 "showLabelsOnSeries",
                                 "showMean",
                                 "yAxisScaleType",
+                                "hiddenLegendIndexes",
+                                "hiddenLegendBreakdowns",
+                                "showAlertThresholdLines",
                             ]
                         }
 
@@ -85,6 +88,9 @@ def to_dict(query: BaseModel) -> dict:
                                 del dumped[insightFilterKey]["display"]  # default value, remove
                             else:
                                 dumped[insightFilterKey]["display"] = canonical_display
+                    elif name == "compareFilter" and not dumped["compareFilter"].get("compare"):
+                        # the period to compare to only matters when comparing
+                        del dumped["compareFilter"]
 
                     ###
                     # Remove empty nested models, so that empty and not existing models serialize to the same json.
@@ -133,12 +139,16 @@ def grouped_chart_display_types(display: ChartDisplayType) -> ChartDisplayType |
         ChartDisplayType.ACTIONS_LINE_GRAPH,
         ChartDisplayType.ACTIONS_BAR,
         ChartDisplayType.ACTIONS_AREA_GRAPH,
+        ChartDisplayType.ACTIONS_STACKED_BAR,
     ]:
         # time series
         return ChartDisplayType.ACTIONS_LINE_GRAPH
     elif display in [ChartDisplayType.ACTIONS_LINE_GRAPH_CUMULATIVE]:
         # cumulative time series
         return ChartDisplayType.ACTIONS_LINE_GRAPH_CUMULATIVE
+    elif display in [ChartDisplayType.WORLD_MAP]:
+        # total value, with a higher breakdown limit
+        return ChartDisplayType.WORLD_MAP
     else:
         # total value
         return ChartDisplayType.ACTIONS_BAR_VALUE
@@ -1,4 +1,6 @@
 import json
+from collections.abc import Iterator
+from dataclasses import dataclass
 from time import sleep
 from typing import Optional
 
@@ -33,6 +35,9 @@ REALTIME_SUBSCRIPTIONS_DATA_LENGTH = Histogram(
 
 SUBSCRIPTION_CHANNEL = "@posthog/replay/realtime-subscriptions"
 
+# how many sorted set members we read from redis at a time when streaming snapshots to the client
+REALTIME_SNAPSHOTS_PAGE_SIZE = 100
+
 
 def get_key(team_id: str, suffix: str) -> str:
     return f"@posthog/replay/snapshots/team-{team_id}/{suffix}"
@@ -61,17 +66,37 @@ def publish_subscription(team_id: str, session_id: str) -> None:
         raise
 
 
+def _retry_delay(attempt_count: int) -> float:
+    return (
+        settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_TIMEOUT_SECONDS
+        if attempt_count < 4
+        else settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_TIMEOUT_SECONDS * 2
+    )
+
+
+def _decode_lines(encoded_snapshots: list[tuple[bytes, float]]) -> Iterator[str]:
+    for s in encoded_snapshots:
+        # s[0] is the content
+        # s[1] is the time the content was written to redis
+        for line in s[0].splitlines():
+            yield line.decode("utf8")
+
+
 def get_realtime_snapshots(team_id: str, session_id: str, attempt_count=0) -> Optional[list[str]]:
     try:
         redis = get_client(settings.SESSION_RECORDING_REDIS_URL)
         key = get_key(team_id, session_id)
-        encoded_snapshots = redis.zrange(key, 0, -1, withscores=True)
 
-        # We always publish as it could be that a rebalance has occurred
-        # and the consumer doesn't know it should be sending data to redis
-        publish_subscription(team_id, session_id)
+        while True:
+            encoded_snapshots = redis.zrange(key, 0, -1, withscores=True)
+
+            # We always publish as it could be that a rebalance has occurred
+            # and the consumer doesn't know it should be sending data to redis
+            publish_subscription(team_id, session_id)
+
+            if encoded_snapshots or attempt_count >= settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_MAX:
+                break
 
-        if not encoded_snapshots and attempt_count < settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_MAX:
             logger.info(
                 "No realtime snapshots found, publishing subscription and retrying",
                 team_id=team_id,
@@ -81,21 +106,11 @@ def get_realtime_snapshots(team_id: str, session_id: str, attempt_count=0) -> Op
 
             PUBLISHED_REALTIME_SUBSCRIPTIONS_COUNTER.labels(attempt_count=attempt_count).inc()
 
-            sleep(
-                settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_TIMEOUT_SECONDS
-                if attempt_count < 4
-                else settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_TIMEOUT_SECONDS * 2
-            )
-            return get_realtime_snapshots(team_id, session_id, attempt_count + 1)
+            sleep(_retry_delay(attempt_count))
+            attempt_count += 1
 
         if encoded_snapshots:
-            snapshots = []
-
-            for s in encoded_snapshots:
-                # s[0] is the content
-                # s[1] is the time the content was written to redis
-                for line in s[0].splitlines():
-                    snapshots.append(line.decode("utf8"))
+            snapshots = list(_decode_lines(encoded_snapshots))
 
             REALTIME_SUBSCRIPTIONS_LOADED_COUNTER.labels(attempt_count=attempt_count).inc()
             REALTIME_SUBSCRIPTIONS_DATA_LENGTH.labels(attempt_count=attempt_count).observe(len(snapshots))
@@ -113,3 +128,99 @@ def get_realtime_snapshots(team_id: str, session_id: str, attempt_count=0) -> Op
             tags={"team_id": team_id, "session_id": session_id},
         )
         raise
+
+
+@dataclass(frozen=True)
+class RealtimeSnapshots:
+    # the redis score of the newest snapshot included in `lines`,
+    # clients pass it back as `since` to only receive snapshots written after it
+    last_score: float
+    lines: Iterator[str]
+
+
+def stream_realtime_snapshots(
+    team_id: str, session_id: str, since: Optional[float] = None
+) -> Optional[RealtimeSnapshots]:
+    """
+    Returns the snapshots written to redis after `since` (or all of them when it is not provided),
+    read a page at a time while the response is being written so memory stays bounded however long the session is.
+
+    Only the first request for a session (without `since`) waits for Mr Blobby to start syncing to redis.
+    Clients that already have data are polling, so when there's nothing new we return straight away
+    rather than holding the worker while we sleep.
+    """
+    attempt_count = 0
+    try:
+        redis = get_client(settings.SESSION_RECORDING_REDIS_URL)
+        key = get_key(team_id, session_id)
+
+        while True:
+            newest = redis.zrange(key, -1, -1, withscores=True)
+
+            # We always publish as it could be that a rebalance has occurred
+            # and the consumer doesn't know it should be sending data to redis
+            publish_subscription(team_id, session_id)
+
+            if newest or since is not None or attempt_count >= settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_MAX:
+                break
+
+            PUBLISHED_REALTIME_SUBSCRIPTIONS_COUNTER.labels(attempt_count=attempt_count).inc()
+
+            sleep(_retry_delay(attempt_count))
+            attempt_count += 1
+
+        if not newest or (since is not None and newest[0][1] <= since):
+            return None
+
+        last_score = newest[0][1]
+        REALTIME_SUBSCRIPTIONS_LOADED_COUNTER.labels(attempt_count=attempt_count).inc()
+
+        return RealtimeSnapshots(
+            last_score=last_score,
+            lines=_stream_lines(key, since, last_score, attempt_count),
+        )
+    except Exception as e:
+        capture_exception(
+            e,
+            extras={
+                "attempt_count": attempt_count,
+                "operation": "stream_realtime_snapshots",
+            },
+            tags={"team_id": team_id, "session_id": session_id},
+        )
+        raise
+
+
+def _stream_lines(key: str, since: Optional[float], last_score: float, attempt_count: int) -> Iterator[str]:
+    redis = get_client(settings.SESSION_RECORDING_REDIS_URL)
+    # exclusive of `since` as the client already has that snapshot,
+    # and capped at `last_score` so that we return what the client was told it is getting
+    min_score = f"({since}" if since is not None else "-inf"
+    line_count = 0
+
+    while True:
+        page = redis.zrangebyscore(
+            key, min_score, last_score, start=0, num=REALTIME_SNAPSHOTS_PAGE_SIZE, withscores=True
+        )
+        if len(page) == REALTIME_SNAPSHOTS_PAGE_SIZE:
+            # snapshots can share a score, so read the rest of the ones sharing the last score of the page
+            # before moving past it
+            page_last_score = page[-1][1]
+            read_at_page_last_score = sum(1 for _, score in page if score == page_last_score)
+            page.extend(
+                redis.zrangebyscore(
+                    key, page_last_score, page_last_score, start=read_at_page_last_score, num=-1, withscores=True
+                )
+            )
+
+        for line in _decode_lines(page):
+            line_count += 1
+            yield line
+
+        if len(page) < REALTIME_SNAPSHOTS_PAGE_SIZE:
+            break
+        # pages continue from the score of the last snapshot read rather than from an offset into the set,
+        # so that snapshots trimmed while streaming don't shift the pages
+        min_score = f"({page[-1][1]}"
+
+    REALTIME_SUBSCRIPTIONS_DATA_LENGTH.labels(attempt_count=attempt_count).observe(line_count)
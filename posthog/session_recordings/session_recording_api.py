@@ -1,7 +1,8 @@
 import json
+import math
 import os
 import time
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from json import JSONDecodeError
@@ -12,7 +13,7 @@ import requests
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from drf_spectacular.utils import extend_schema
 from prometheus_client import Counter, Histogram
 from rest_framework import exceptions, request, serializers, viewsets
@@ -46,7 +47,15 @@ from posthog.session_recordings.queries.session_replay_events import SessionRepl
 from posthog.session_recordings.realtime_snapshots import (
     get_realtime_snapshots,
     publish_subscription,
+    stream_realtime_snapshots,
 )
+from posthog.session_recordings.snapshot_blob_cache import (
+    SNAPSHOT_BLOB_BYTES_SERVED_COUNTER,
+    CachedBlob,
+    get_snapshot_blob_cache,
+    parse_range_header,
+)
+from posthog.session_recordings.snapshot_sources import get_blob_sources
 from posthog.storage import object_storage
 
 SNAPSHOTS_BY_PERSONAL_API_KEY_COUNTER = Counter(
@@ -71,6 +80,9 @@ GET_REALTIME_SNAPSHOTS_FROM_REDIS = Histogram(
     "Time taken to get realtime snapshots from Redis",
 )
 
+# clients pass the value of this header back as `since` to only load realtime snapshots they haven't seen yet
+REALTIME_SNAPSHOTS_LAST_SCORE_HEADER = "X-Realtime-Snapshots-Last-Score"
+
 STREAM_RESPONSE_TO_CLIENT_HISTOGRAM = Histogram(
     "session_snapshots_stream_response_to_client_histogram",
     "Time taken to stream a session snapshot to the client",
@@ -559,37 +571,19 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
         might_have_realtime = True
         newest_timestamp = None
         response_data = {}
-        sources: list[dict] = []
-        blob_keys: list[str] | None = None
-        blob_prefix = ""
 
         if recording.object_storage_path:
-            blob_prefix = recording.object_storage_path
-            blob_keys = object_storage.list_objects(cast(str, blob_prefix))
+            sources = get_blob_sources(cast(str, recording.object_storage_path), is_immutable=True)
             might_have_realtime = False
         else:
-            blob_prefix = recording.build_blob_ingestion_storage_path()
-            blob_keys = object_storage.list_objects(blob_prefix)
-
-        if blob_keys:
-            for full_key in blob_keys:
-                # Keys are like 1619712000-1619712060
-                blob_key = full_key.replace(blob_prefix.rstrip("/") + "/", "")
-                blob_key_base = blob_key.split(".")[0]  # Remove the extension if it exists
-                time_range = [datetime.fromtimestamp(int(x) / 1000, tz=UTC) for x in blob_key_base.split("-")]
-
-                sources.append(
-                    {
-                        "source": "blob",
-                        "start_timestamp": time_range[0],
-                        "end_timestamp": time_range.pop(),
-                        "blob_key": blob_key,
-                    }
-                )
+            sources = get_blob_sources(recording.build_blob_ingestion_storage_path(), is_immutable=False)
+
+        # copied, because the realtime source is added to the list below
+        sources = list(sources)
         if sources:
-            sources = sorted(sources, key=lambda x: x["start_timestamp"])
-            oldest_timestamp = min(sources, key=lambda k: k["start_timestamp"])["start_timestamp"]
-            newest_timestamp = min(sources, key=lambda k: k["end_timestamp"])["end_timestamp"]
+            # sources are sorted by start time
+            oldest_timestamp = sources[0]["start_timestamp"]
+            newest_timestamp = min(source["end_timestamp"] for source in sources)
 
             if might_have_realtime:
                 might_have_realtime = oldest_timestamp + timedelta(hours=24) > datetime.now(UTC)
@@ -678,21 +672,25 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
         blob_key = request.GET.get("blob_key", "")
         self._validate_blob_key(blob_key)
 
-        # very short-lived pre-signed URL
-        with GENERATE_PRE_SIGNED_URL_HISTOGRAM.time():
-            if recording.object_storage_path:
-                if recording.storage_version == "2023-08-01":
-                    file_key = f"{recording.object_storage_path}/{blob_key}"
-                else:
-                    raise NotImplementedError(
-                        f"Unknown session replay object storage version {recording.storage_version}"
-                    )
+        if recording.object_storage_path:
+            if recording.storage_version == "2023-08-01":
+                file_key = f"{recording.object_storage_path}/{blob_key}"
             else:
-                blob_prefix = settings.OBJECT_STORAGE_SESSION_RECORDING_BLOB_INGESTION_FOLDER
-                file_key = f"{recording.build_blob_ingestion_storage_path(root_prefix=blob_prefix)}/{blob_key}"
-            url = object_storage.get_presigned_url(file_key, expiration=60)
-            if not url:
-                raise exceptions.NotFound("Snapshot file not found")
+                raise NotImplementedError(f"Unknown session replay object storage version {recording.storage_version}")
+        else:
+            blob_prefix = settings.OBJECT_STORAGE_SESSION_RECORDING_BLOB_INGESTION_FOLDER
+            file_key = f"{recording.build_blob_ingestion_storage_path(root_prefix=blob_prefix)}/{blob_key}"
+
+        blob_cache = get_snapshot_blob_cache()
+        cached_blob = blob_cache.get(file_key) if blob_cache else None
+
+        url: Optional[str] = None
+        if not cached_blob:
+            # very short-lived pre-signed URL
+            with GENERATE_PRE_SIGNED_URL_HISTOGRAM.time():
+                url = object_storage.get_presigned_url(file_key, expiration=60)
+                if not url:
+                    raise exceptions.NotFound("Snapshot file not found")
 
         event_properties["source"] = "blob"
         event_properties["blob_key"] = blob_key
@@ -703,6 +701,15 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
         )
 
         with STREAM_RESPONSE_TO_CLIENT_HISTOGRAM.time():
+            if cached_blob:
+                return self._send_cached_blob(cached_blob, request)
+
+            assert url is not None  # there's a pre-signed URL whenever the blob wasn't cached
+            if blob_cache:
+                cached_blob = self._fetch_blob_for_cache(url)
+                blob_cache.set(file_key, cached_blob)
+                return self._send_cached_blob(cached_blob, request)
+
             # streams the file from S3 to the client
             # will not decompress the possibly large file because of `stream=True`
             #
@@ -713,11 +720,16 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
             # if the client provides an e-tag we can use it to check if the file has changed
             # object store will respect this and send back 304 if the file hasn't changed,
             # and we don't need to send the large file over the wire
+            #
+            # a range request is passed on to the object store, which sends back the partial content
 
             if_none_match = request.headers.get("If-None-Match")
             headers = {}
             if if_none_match:
                 headers["If-None-Match"] = ensure_not_weak(if_none_match)
+            range_header = request.headers.get("Range")
+            if range_header:
+                headers["Range"] = range_header
 
             with stream_from(url=url, headers=headers) as streaming_response:
                 streaming_response.raise_for_status()
@@ -728,6 +740,10 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
                 if etag:
                     response["ETag"] = ensure_not_weak(etag)
 
+                for header in ("Accept-Ranges", "Content-Range"):
+                    if streaming_response.headers.get(header):
+                        response[header] = streaming_response.headers[header]
+
                 # blobs are immutable, _really_ we can cache forever
                 # but let's cache for an hour since people won't re-watch too often
                 # we're setting cache control and ETag which might be considered overkill,
@@ -738,50 +754,136 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet, U
                 response["Content-Type"] = "application/json"
                 response["Content-Disposition"] = "inline"
 
+                SNAPSHOT_BLOB_BYTES_SERVED_COUNTER.labels(source="object_storage").inc(len(response.content))
                 return response
 
+    @staticmethod
+    def _fetch_blob_for_cache(url: str) -> CachedBlob:
+        with stream_from(url=url) as streaming_response:
+            streaming_response.raise_for_status()
+            # read the blob without decoding it, the same way it is otherwise passed through to the client
+            content = HttpResponse(content=streaming_response.raw).content
+            etag = streaming_response.headers.get("ETag")
+            return CachedBlob(etag=ensure_not_weak(etag) if etag else None, content=content)
+
+    @staticmethod
+    def _send_cached_blob(cached_blob: CachedBlob, request: request.Request) -> HttpResponse:
+        if_none_match = request.headers.get("If-None-Match")
+        if cached_blob.etag and if_none_match and ensure_not_weak(if_none_match) == cached_blob.etag:
+            response = HttpResponse(status=304)
+        else:
+            size = len(cached_blob.content)
+            try:
+                byte_range = parse_range_header(request.headers.get("Range"), size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+            if byte_range:
+                first_byte, last_byte = byte_range
+                response = HttpResponse(content=cached_blob.content[first_byte : last_byte + 1], status=206)
+                response["Content-Range"] = f"bytes {first_byte}-{last_byte}/{size}"
+            else:
+                response = HttpResponse(content=cached_blob.content)
+            SNAPSHOT_BLOB_BYTES_SERVED_COUNTER.labels(source="cache").inc(len(response.content))
+
+        if cached_blob.etag:
+            response["ETag"] = cached_blob.etag
+        response["Accept-Ranges"] = "bytes"
+        response["Cache-Control"] = "max-age=3600"
+        response["Content-Type"] = "application/json"
+        response["Content-Disposition"] = "inline"
+        return response
+
     def _send_realtime_snapshots_to_client(
         self, recording: SessionRecording, request: request.Request, event_properties: dict
-    ) -> HttpResponse | Response:
+    ) -> HttpResponse | StreamingHttpResponse | Response:
         version = request.GET.get("version", "og")
 
-        with GET_REALTIME_SNAPSHOTS_FROM_REDIS.time():
-            snapshot_lines = (
-                get_realtime_snapshots(
-                    team_id=self.team.pk,
-                    session_id=str(recording.session_id),
-                )
-                or []
-            )
-
-        event_properties["source"] = "realtime"
-        event_properties["snapshots_length"] = len(snapshot_lines)
-        posthoganalytics.capture(
-            self._distinct_id_from_request(request),
-            "session recording snapshots v2 loaded",
-            event_properties,
-        )
-
         if version == "og":
             # originally we returned a list of dictionaries
             # under a snapshot key
             # we keep doing this here for a little while
             # so that existing browser sessions, that don't know about the new format
             # can carry on working until the next refresh
+            with GET_REALTIME_SNAPSHOTS_FROM_REDIS.time():
+                snapshot_lines = (
+                    get_realtime_snapshots(
+                        team_id=self.team.pk,
+                        session_id=str(recording.session_id),
+                    )
+                    or []
+                )
+
+            event_properties["source"] = "realtime"
+            event_properties["snapshots_length"] = len(snapshot_lines)
+            posthoganalytics.capture(
+                self._distinct_id_from_request(request),
+                "session recording snapshots v2 loaded",
+                event_properties,
+            )
+
             serializer = SessionRecordingSourcesSerializer({"snapshots": [json.loads(s) for s in snapshot_lines]})
             return Response(serializer.data)
         elif version == "2024-04-30":
-            response = HttpResponse(
-                # convert list to a jsonl response
-                content=("\n".join(snapshot_lines)),
-                content_type="application/json",
+            since = self._validate_since(request.GET.get("since"))
+
+            with GET_REALTIME_SNAPSHOTS_FROM_REDIS.time():
+                realtime_snapshots = stream_realtime_snapshots(
+                    team_id=str(self.team.pk),
+                    session_id=str(recording.session_id),
+                    since=since,
+                )
+
+            event_properties["source"] = "realtime"
+            event_properties["since"] = since
+            posthoganalytics.capture(
+                self._distinct_id_from_request(request),
+                "session recording snapshots v2 loaded",
+                event_properties,
             )
+
+            response: HttpResponse | StreamingHttpResponse
+            if realtime_snapshots is None:
+                response = HttpResponse(content="", content_type="application/json")
+                if since is not None:
+                    response[REALTIME_SNAPSHOTS_LAST_SCORE_HEADER] = str(since)
+            else:
+                # a jsonl response, written a page of snapshots at a time
+                response = StreamingHttpResponse(
+                    _join_lines(realtime_snapshots.lines),
+                    content_type="application/json",
+                )
+                response[REALTIME_SNAPSHOTS_LAST_SCORE_HEADER] = str(realtime_snapshots.last_score)
+
             # the browser is not allowed to cache this at all
             response["Cache-Control"] = "no-store"
             return response
         else:
             raise exceptions.ValidationError(f"Invalid version: {version}")
 
+    @staticmethod
+    def _validate_since(since: Any) -> Optional[float]:
+        if since is None or since == "":
+            return None
+
+        try:
+            parsed_since = float(since)
+        except ValueError:
+            raise exceptions.ValidationError("Invalid since: " + since)
+
+        if not math.isfinite(parsed_since):
+            raise exceptions.ValidationError("Invalid since: " + since)
+        return parsed_since
+
+
+def _join_lines(lines: Iterator[str]) -> Iterator[bytes]:
+    separator = b""
+    for line in lines:
+        yield separator + line.encode("utf-8")
+        separator = b"\n"
+
 
 # TODO i guess this becomes the query runner for our _internal_ use of RecordingsQuery
 def list_recordings_from_query(
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import structlog
+from django.conf import settings
+from prometheus_client import Counter
+
+logger = structlog.get_logger(__name__)
+
+SNAPSHOT_BLOB_CACHE_COUNTER = Counter(
+    "session_snapshots_blob_cache",
+    "Snapshot blobs requested from the local blob cache, by whether they were found.",
+    labelnames=["result"],
+)
+
+SNAPSHOT_BLOB_BYTES_SERVED_COUNTER = Counter(
+    "session_snapshots_blob_bytes_served",
+    "Bytes of snapshot blobs sent to clients, by where they were read from.",
+    labelnames=["source"],
+)
+
+RANGE_HEADER_REGEX = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass(frozen=True)
+class CachedBlob:
+    etag: Optional[str]
+    content: bytes
+
+
+class SnapshotBlobCache:
+    """
+    A least recently used cache of snapshot blobs on local disk.
+
+    Blobs are immutable once written to object storage, so entries never need invalidating, only evicting.
+    Files are written atomically and the directory can be shared by several processes: each keeps a running
+    estimate of the size of the cache and only scans the directory to evict the least recently read blobs
+    once that estimate is over the limit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_blob_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_blob_bytes = max_blob_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._estimated_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.is_file() and not entry.name.startswith("."):
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str) -> Optional[CachedBlob]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                etag = f.readline().rstrip(b"\n").decode("utf-8") or None
+                content = f.read()
+            # the modification time marks when the blob was last read, which is what eviction goes by
+            os.utime(path)
+        except FileNotFoundError:
+            SNAPSHOT_BLOB_CACHE_COUNTER.labels(result="miss").inc()
+            return None
+
+        SNAPSHOT_BLOB_CACHE_COUNTER.labels(result="hit").inc()
+        return CachedBlob(etag=etag, content=content)
+
+    def set(self, key: str, blob: CachedBlob) -> None:
+        if len(blob.content) > self.max_blob_bytes:
+            return
+
+        header = (blob.etag or "").encode("utf-8") + b"\n"
+        temp_path = None
+        try:
+            # written to a hidden temporary file first, so that readers never see a partially written blob
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".")
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(blob.content)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            # the cache is an optimization, failing to write to it must never fail the request
+            logger.warning("snapshot_blob_cache.write_failed", error=e)
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            self._estimated_bytes += len(header) + len(blob.content)
+            if self._estimated_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        self._estimated_bytes = total_bytes
+
+
+_cache: Optional[SnapshotBlobCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_snapshot_blob_cache() -> Optional[SnapshotBlobCache]:
+    global _cache
+
+    if not settings.SESSION_RECORDING_BLOB_CACHE_DIR:
+        return None
+
+    with _cache_lock:
+        if _cache is None or _cache.directory != settings.SESSION_RECORDING_BLOB_CACHE_DIR:
+            _cache = SnapshotBlobCache(
+                directory=settings.SESSION_RECORDING_BLOB_CACHE_DIR,
+                max_bytes=settings.SESSION_RECORDING_BLOB_CACHE_MAX_BYTES,
+                max_blob_bytes=settings.SESSION_RECORDING_BLOB_CACHE_MAX_BLOB_BYTES,
+            )
+        return _cache
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    The inclusive byte range requested by a `Range` header, or None if the whole blob should be sent.
+
+    Only single ranges are supported, other `Range` headers are ignored as the spec allows.
+    Raises ValueError if the range can't be satisfied.
+    """
+    match = RANGE_HEADER_REGEX.match(range_header or "")
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.groups()
+    if not first:
+        # a suffix range, the last N bytes of the blob
+        first_byte, last_byte = max(size - int(last), 0), size - 1
+    else:
+        first_byte, last_byte = int(first), min(int(last), size - 1) if last else size - 1
+
+    if first_byte >= size or last_byte < first_byte:
+        raise ValueError(f"Range {range_header} not satisfiable for {size} bytes")
+    return first_byte, last_byte
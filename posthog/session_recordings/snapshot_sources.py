@@ -0,0 +1,81 @@
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+import structlog
+from django.core.cache import cache
+from prometheus_client import Counter
+
+from posthog.storage import object_storage
+
+logger = structlog.get_logger(__name__)
+
+SNAPSHOT_SOURCES_MANIFEST_COUNTER = Counter(
+    "session_snapshots_sources_manifest",
+    "Blob sources for a recording requested from the cached manifest, by whether it was found.",
+    labelnames=["result"],
+)
+
+# no more blobs are ingested for a session this long after it started
+BLOB_INGESTION_WINDOW = timedelta(hours=24)
+
+SNAPSHOT_SOURCES_MANIFEST_TTL_SECONDS = 60 * 60 * 24 * 7
+
+
+def _manifest_cache_key(blob_prefix: str) -> str:
+    return f"@posthog/replay/snapshot-sources/{blob_prefix.rstrip('/')}"
+
+
+def list_blob_sources(blob_prefix: str) -> list[dict]:
+    """
+    Lists the blobs under the prefix as snapshot sources, sorted by start time.
+    """
+    sources: list[dict] = []
+    for full_key in object_storage.list_objects(blob_prefix) or []:
+        # Keys are like 1619712000-1619712060
+        blob_key = full_key.replace(blob_prefix.rstrip("/") + "/", "")
+        blob_key_base = blob_key.split(".")[0]  # Remove the extension if it exists
+        time_range = [datetime.fromtimestamp(int(x) / 1000, tz=UTC) for x in blob_key_base.split("-")]
+
+        sources.append(
+            {
+                "source": "blob",
+                "start_timestamp": time_range[0],
+                "end_timestamp": time_range.pop(),
+                "blob_key": blob_key,
+            }
+        )
+    return sorted(sources, key=lambda x: x["start_timestamp"])
+
+
+def write_blob_sources_manifest(blob_prefix: str) -> list[dict]:
+    """
+    Lists the blobs under a prefix that won't change anymore, e.g. a recording's long term storage,
+    and caches them so that loading the recording doesn't need to list object storage again.
+    """
+    sources = list_blob_sources(blob_prefix)
+    if sources:
+        cache.set(_manifest_cache_key(blob_prefix), sources, timeout=SNAPSHOT_SOURCES_MANIFEST_TTL_SECONDS)
+    return sources
+
+
+def get_blob_sources(blob_prefix: str, is_immutable: bool, now: Optional[datetime] = None) -> list[dict]:
+    """
+    The blob sources of a recording, from the cached manifest when possible.
+
+    Blobs under a prefix only stop changing once the recording is in long term storage (`is_immutable`),
+    or once it is too old for more blobs to be ingested. Only then is the manifest cached, so it never
+    needs invalidating. Otherwise, or when it isn't cached yet, the blobs are listed from object storage.
+    """
+    cache_key = _manifest_cache_key(blob_prefix)
+    sources = cache.get(cache_key)
+    if sources is not None:
+        SNAPSHOT_SOURCES_MANIFEST_COUNTER.labels(result="hit").inc()
+        return sources
+
+    SNAPSHOT_SOURCES_MANIFEST_COUNTER.labels(result="miss").inc()
+    sources = list_blob_sources(blob_prefix)
+
+    if sources and (is_immutable or sources[0]["start_timestamp"] + BLOB_INGESTION_WINDOW < (now or datetime.now(UTC))):
+        cache.set(cache_key, sources, timeout=SNAPSHOT_SOURCES_MANIFEST_TTL_SECONDS)
+
+    return sources
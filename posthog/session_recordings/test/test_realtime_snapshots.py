@@ -0,0 +1,84 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from posthog import settings
+from posthog.redis import get_client
+from posthog.session_recordings.realtime_snapshots import get_key, stream_realtime_snapshots
+from posthog.test.base import BaseTest
+
+
+class TestRealtimeSnapshots(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.redis = get_client(settings.SESSION_RECORDING_REDIS_URL)
+        self.session_id = "some-session"
+        self.key = get_key(str(self.team.pk), self.session_id)
+        self.redis.delete(self.key)
+
+    def _write(self, score: int, *lines: dict) -> None:
+        self.redis.zadd(self.key, {"\n".join(json.dumps(line) for line in lines): score})
+
+    @patch("posthog.session_recordings.realtime_snapshots.REALTIME_SNAPSHOTS_PAGE_SIZE", 2)
+    def test_streams_every_page_of_snapshots(self) -> None:
+        for score in range(1, 6):
+            self._write(score, {"score": score, "line": 1}, {"score": score, "line": 2})
+
+        realtime_snapshots = stream_realtime_snapshots(str(self.team.pk), self.session_id)
+
+        assert realtime_snapshots is not None
+        assert realtime_snapshots.last_score == 5
+        assert [json.loads(line) for line in realtime_snapshots.lines] == [
+            {"score": score, "line": line} for score in range(1, 6) for line in (1, 2)
+        ]
+
+    @patch("posthog.session_recordings.realtime_snapshots.REALTIME_SNAPSHOTS_PAGE_SIZE", 2)
+    def test_streams_snapshots_sharing_a_score_across_pages(self) -> None:
+        for index in range(5):
+            self._write(1, {"score": 1, "index": index})
+        self._write(2, {"score": 2})
+
+        realtime_snapshots = stream_realtime_snapshots(str(self.team.pk), self.session_id)
+
+        assert realtime_snapshots is not None
+        lines = [json.loads(line) for line in realtime_snapshots.lines]
+        assert len(lines) == 6
+        assert {line.get("index") for line in lines if line["score"] == 1} == set(range(5))
+
+    @patch("posthog.session_recordings.realtime_snapshots.REALTIME_SNAPSHOTS_PAGE_SIZE", 2)
+    def test_snapshots_trimmed_while_streaming_do_not_shift_pages(self) -> None:
+        for score in range(1, 7):
+            self._write(score, {"score": score})
+
+        realtime_snapshots = stream_realtime_snapshots(str(self.team.pk), self.session_id)
+        assert realtime_snapshots is not None
+
+        lines = [json.loads(next(realtime_snapshots.lines)), json.loads(next(realtime_snapshots.lines))]
+        self.redis.zremrangebyscore(self.key, 1, 2)
+        lines.extend(json.loads(line) for line in realtime_snapshots.lines)
+
+        assert lines == [{"score": score} for score in range(1, 7)]
+
+    def test_only_streams_snapshots_after_since(self) -> None:
+        for score in range(1, 4):
+            self._write(score, {"score": score})
+
+        realtime_snapshots = stream_realtime_snapshots(str(self.team.pk), self.session_id, since=1)
+
+        assert realtime_snapshots is not None
+        assert realtime_snapshots.last_score == 3
+        assert [json.loads(line) for line in realtime_snapshots.lines] == [{"score": 2}, {"score": 3}]
+
+    @patch("posthog.session_recordings.realtime_snapshots.sleep")
+    def test_does_not_wait_for_snapshots_when_polling(self, mock_sleep: MagicMock) -> None:
+        self._write(1, {"score": 1})
+
+        assert stream_realtime_snapshots(str(self.team.pk), self.session_id, since=1) is None
+        mock_sleep.assert_not_called()
+
+    @patch("posthog.session_recordings.realtime_snapshots.publish_subscription")
+    @patch("posthog.session_recordings.realtime_snapshots.sleep")
+    def test_waits_for_first_snapshots(self, mock_sleep: MagicMock, mock_publish: MagicMock) -> None:
+        assert stream_realtime_snapshots(str(self.team.pk), self.session_id) is None
+
+        assert mock_sleep.call_count == settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_MAX
+        assert mock_publish.call_count == settings.REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_MAX + 1
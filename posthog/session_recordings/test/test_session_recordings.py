@@ -1,4 +1,5 @@
 import json
+import tempfile
 import time
 import uuid
 from datetime import UTC, datetime, timedelta
@@ -8,6 +9,7 @@ from urllib.parse import urlencode
 
 from dateutil.parser import parse
 from dateutil.relativedelta import relativedelta
+from django.http import StreamingHttpResponse
 from django.utils.timezone import now
 from freezegun import freeze_time
 from parameterized import parameterized
@@ -23,6 +25,7 @@ from posthog.session_recordings.models.session_recording_event import (
 from posthog.session_recordings.queries.test.session_replay_sql import (
     produce_replay_summary,
 )
+from posthog.session_recordings.realtime_snapshots import RealtimeSnapshots
 from posthog.session_recordings.test import setup_stream_from
 from posthog.test.base import (
     APIBaseTest,
@@ -876,6 +879,56 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
         assert response.headers.get("etag") == "represents the file contents"  # we don't allow weak etags
         assert response.headers.get("cache-control") == "more specific cache control"
 
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
+    @patch("posthog.session_recordings.session_recording_api.object_storage.get_presigned_url")
+    @patch(
+        "posthog.session_recordings.session_recording_api.stream_from",
+        return_value=setup_stream_from({"ETag": '"represents the file contents"'}),
+    )
+    def test_serves_blobs_from_the_local_cache(
+        self,
+        mock_stream_from,
+        mock_presigned_url,
+        mock_get_session_recording,
+        _mock_exists,
+    ) -> None:
+        session_id = str(uuid.uuid4())
+        blob_key = f"1682608337071"
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=blob&blob_key={blob_key}"
+        mock_get_session_recording.return_value = SessionRecording(session_id=session_id, team=self.team, deleted=False)
+        mock_presigned_url.return_value = "https://test.com/"
+
+        with tempfile.TemporaryDirectory() as cache_dir, self.settings(SESSION_RECORDING_BLOB_CACHE_DIR=cache_dir):
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == b"Example content"
+            assert response.headers.get("etag") == '"represents the file contents"'
+            assert mock_stream_from.call_count == 1
+
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == b"Example content"
+            assert response.headers.get("accept-ranges") == "bytes"
+
+            response = self.client.get(url, headers={"Range": "bytes=0-6"})
+            assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+            assert response.content == b"Example"
+            assert response.headers.get("content-range") == "bytes 0-6/15"
+
+            response = self.client.get(url, headers={"Range": "bytes=20-"})
+            assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+            response = self.client.get(url, headers={"If-None-Match": '"represents the file contents"'})
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+            # everything after the first request was served without going to object storage
+            assert mock_stream_from.call_count == 1
+            assert mock_presigned_url.call_count == 1
+
     @patch(
         "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
         return_value=True,
@@ -920,11 +973,6 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
 
     @parameterized.expand(
         [
-            (
-                "version=2024-04-30",
-                "version=2024-04-30",
-                b'{"some": "\\ud801\\udc37 probably from console logs"}\n{"some": "more data"}',
-            ),
             (
                 "version=None",
                 None,
@@ -971,6 +1019,75 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
         assert response.headers.get("content-type") == "application/json"
         assert response.content == expected_response
 
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
+    @patch("posthog.session_recordings.session_recording_api.stream_realtime_snapshots")
+    def test_can_stream_session_recording_realtime(
+        self,
+        mock_stream_realtime_snapshots,
+        mock_get_session_recording,
+        _mock_exists,
+    ) -> None:
+        session_id = str(uuid.uuid4())
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=realtime&version=2024-04-30"
+        mock_get_session_recording.return_value = SessionRecording(session_id=session_id, team=self.team, deleted=False)
+
+        mock_stream_realtime_snapshots.return_value = RealtimeSnapshots(
+            last_score=1700000000123.0,
+            lines=iter(
+                [
+                    json.dumps({"some": "\ud801\udc37 probably from console logs"}),
+                    json.dumps({"some": "more data"}),
+                ]
+            ),
+        )
+
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers.get("content-type") == "application/json"
+        assert response.headers.get("X-Realtime-Snapshots-Last-Score") == "1700000000123.0"
+        assert response.headers.get("Cache-Control") == "no-store"
+        assert (
+            cast(StreamingHttpResponse, response).getvalue()
+            == b'{"some": "\\ud801\\udc37 probably from console logs"}\n{"some": "more data"}'
+        )
+        mock_stream_realtime_snapshots.assert_called_once_with(
+            team_id=str(self.team.pk), session_id=session_id, since=None
+        )
+
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
+    @patch("posthog.session_recordings.session_recording_api.stream_realtime_snapshots")
+    def test_realtime_snapshots_since_the_last_score(
+        self,
+        mock_stream_realtime_snapshots,
+        mock_get_session_recording,
+        _mock_exists,
+    ) -> None:
+        session_id = str(uuid.uuid4())
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=realtime&version=2024-04-30"
+        mock_get_session_recording.return_value = SessionRecording(session_id=session_id, team=self.team, deleted=False)
+        mock_stream_realtime_snapshots.return_value = None
+
+        response = self.client.get(f"{url}&since=1700000000123")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b""
+        # nothing new, so the client keeps the score it had
+        assert response.headers.get("X-Realtime-Snapshots-Last-Score") == "1700000000123.0"
+        mock_stream_realtime_snapshots.assert_called_once_with(
+            team_id=str(self.team.pk), session_id=session_id, since=1700000000123.0
+        )
+
+        for invalid_since in ["yesterday", "nan", "inf", "-Infinity"]:
+            response = self.client.get(f"{url}&since={invalid_since}")
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
     @patch("posthog.session_recordings.session_recording_api.object_storage.get_presigned_url")
     @patch("posthog.session_recordings.session_recording_api.stream_from")
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from posthog.session_recordings.snapshot_blob_cache import CachedBlob, SnapshotBlobCache, parse_range_header
+
+
+class TestSnapshotBlobCache(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def _set_read_time(self, cache: SnapshotBlobCache, key: str, timestamp: float) -> None:
+        os.utime(cache._path(key), (timestamp, timestamp))
+
+    def test_can_read_cached_blobs(self) -> None:
+        cache = SnapshotBlobCache(self.directory, max_bytes=1000, max_blob_bytes=100)
+
+        assert cache.get("some/blob") is None
+        cache.set("some/blob", CachedBlob(etag='"an etag"', content=b"some content"))
+        assert cache.get("some/blob") == CachedBlob(etag='"an etag"', content=b"some content")
+
+        cache.set("another/blob", CachedBlob(etag=None, content=b"\nmore content\n"))
+        assert cache.get("another/blob") == CachedBlob(etag=None, content=b"\nmore content\n")
+
+    def test_does_not_cache_large_blobs(self) -> None:
+        cache = SnapshotBlobCache(self.directory, max_bytes=1000, max_blob_bytes=5)
+
+        cache.set("some/blob", CachedBlob(etag=None, content=b"some content"))
+
+        assert cache.get("some/blob") is None
+
+    def test_evicts_least_recently_read_blobs(self) -> None:
+        cache = SnapshotBlobCache(self.directory, max_bytes=30, max_blob_bytes=100)
+        cache.set("first", CachedBlob(etag=None, content=b"0123456789"))
+        cache.set("second", CachedBlob(etag=None, content=b"0123456789"))
+        self._set_read_time(cache, "first", 2000)
+        self._set_read_time(cache, "second", 1000)
+
+        cache.set("third", CachedBlob(etag=None, content=b"0123456789"))
+
+        assert cache.get("first") is not None
+        assert cache.get("second") is None
+        assert cache.get("third") is not None
+
+    @parameterized.expand(
+        [
+            (None, None),
+            ("bytes=0-4", (0, 4)),
+            ("bytes=5-", (5, 9)),
+            ("bytes=-3", (7, 9)),
+            ("bytes=2-100", (2, 9)),
+            # multiple or malformed ranges are ignored and the whole blob is sent
+            ("bytes=0-1,4-5", None),
+            ("items=0-4", None),
+            ("bytes=-", None),
+        ]
+    )
+    def test_parse_range_header(self, range_header, expected) -> None:
+        assert parse_range_header(range_header, 10) == expected
+
+    @parameterized.expand([("bytes=10-",), ("bytes=5-2",), ("bytes=-0",)])
+    def test_parse_unsatisfiable_range_header(self, range_header) -> None:
+        with self.assertRaises(ValueError):
+            parse_range_header(range_header, 10)
@@ -0,0 +1,79 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from freezegun import freeze_time
+
+from posthog.session_recordings.snapshot_sources import get_blob_sources, write_blob_sources_manifest
+from posthog.test.base import BaseTest
+
+PREFIX = "session_recordings/team_id/1/session_id/abc/data"
+
+
+def _blob_keys(start: datetime) -> list[str]:
+    start_ms = round(start.timestamp() * 1000)
+    # listed out of order to check that sources are sorted
+    return [f"{PREFIX}/{start_ms + 5000}-{start_ms + 10000}", f"{PREFIX}/{start_ms}-{start_ms + 5000}"]
+
+
+@freeze_time("2023-01-01T00:00:00Z")
+@patch("posthog.session_recordings.snapshot_sources.object_storage.list_objects")
+class TestSnapshotSources(BaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+
+    def test_lists_sorted_blob_sources(self, mock_list_objects: MagicMock) -> None:
+        start = datetime(2022, 12, 31, 23, 0, tzinfo=UTC)
+        mock_list_objects.return_value = _blob_keys(start)
+
+        sources = get_blob_sources(PREFIX, is_immutable=False)
+
+        assert [source["start_timestamp"] for source in sources] == [start, start + timedelta(seconds=5)]
+        assert sources[0] == {
+            "source": "blob",
+            "start_timestamp": start,
+            "end_timestamp": start + timedelta(seconds=5),
+            "blob_key": f"{round(start.timestamp() * 1000)}-{round(start.timestamp() * 1000) + 5000}",
+        }
+
+    def test_caches_immutable_blob_sources(self, mock_list_objects: MagicMock) -> None:
+        mock_list_objects.return_value = _blob_keys(datetime(2022, 12, 31, 23, 0, tzinfo=UTC))
+
+        first = get_blob_sources(PREFIX, is_immutable=True)
+        second = get_blob_sources(PREFIX, is_immutable=True)
+
+        assert first == second
+        assert mock_list_objects.call_count == 1
+
+    def test_caches_blob_sources_once_no_more_can_be_ingested(self, mock_list_objects: MagicMock) -> None:
+        mock_list_objects.return_value = _blob_keys(datetime(2022, 12, 30, 23, 0, tzinfo=UTC))
+
+        get_blob_sources(PREFIX, is_immutable=False)
+        get_blob_sources(PREFIX, is_immutable=False)
+
+        assert mock_list_objects.call_count == 1
+
+    def test_does_not_cache_blob_sources_that_might_change(self, mock_list_objects: MagicMock) -> None:
+        mock_list_objects.return_value = _blob_keys(datetime(2022, 12, 31, 23, 0, tzinfo=UTC))
+
+        get_blob_sources(PREFIX, is_immutable=False)
+        get_blob_sources(PREFIX, is_immutable=False)
+
+        assert mock_list_objects.call_count == 2
+
+    def test_does_not_cache_missing_blobs(self, mock_list_objects: MagicMock) -> None:
+        mock_list_objects.return_value = None
+
+        assert get_blob_sources(PREFIX, is_immutable=True) == []
+        assert get_blob_sources(PREFIX, is_immutable=True) == []
+
+        assert mock_list_objects.call_count == 2
+
+    def test_written_manifest_is_used(self, mock_list_objects: MagicMock) -> None:
+        mock_list_objects.return_value = _blob_keys(datetime(2022, 12, 31, 23, 0, tzinfo=UTC))
+
+        written = write_blob_sources_manifest(PREFIX)
+
+        assert get_blob_sources(PREFIX, is_immutable=False) == written
+        assert mock_list_objects.call_count == 1
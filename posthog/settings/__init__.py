@@ -31,6 +31,7 @@ from posthog.settings.ingestion import *
 from posthog.settings.feature_flags import *
 from posthog.settings.geoip import *
 from posthog.settings.metrics import *
+from posthog.settings.queries import *
 from posthog.settings.schedules import *
 from posthog.settings.sentry import *
 from posthog.settings.shell_plus import *
@@ -298,6 +298,11 @@ if not REDIS_URL:
         "https://posthog.com/docs/deployment/upgrading-posthog#upgrading-from-before-1011"
     )
 
+# Size of the connection pool of each Redis URL per process, 0 means unbounded.
+# When bounded, commands wait up to REDIS_POOL_TIMEOUT_SECONDS for a free connection
+REDIS_MAX_CONNECTIONS = get_from_env("REDIS_MAX_CONNECTIONS", 0, type_cast=int)
+REDIS_POOL_TIMEOUT_SECONDS = get_from_env("REDIS_POOL_TIMEOUT_SECONDS", 5, type_cast=int)
+
 # Controls whether the TolerantZlibCompressor is used for Redis compression when writing to Redis.
 # The TolerantZlibCompressor is a drop-in replacement for the standard Django ZlibCompressor that
 # can cope with compressed and uncompressed reading at the same time
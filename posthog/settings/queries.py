@@ -0,0 +1,29 @@
+from posthog.settings.base_variables import TEST
+from posthog.settings.utils import get_from_env, str_to_bool
+
+# How many dashboard tiles are calculated at a time when a dashboard is loaded with blocking refresh
+# Tests run serially, as other threads wouldn't see the test transaction
+DASHBOARD_TILES_MAX_CONCURRENCY = get_from_env("DASHBOARD_TILES_MAX_CONCURRENCY", 1 if TEST else 4, type_cast=int)
+
+# Whether stale trends results are refreshed by only recalculating the intervals since the last refresh
+TRENDS_INCREMENTAL_REFRESH_ENABLED = get_from_env("TRENDS_INCREMENTAL_REFRESH_ENABLED", True, type_cast=str_to_bool)
+# How long results may be refreshed incrementally for, before they are calculated in full again to pick up late changes
+TRENDS_INCREMENTAL_REFRESH_MAX_AGE_SECONDS = get_from_env(
+    "TRENDS_INCREMENTAL_REFRESH_MAX_AGE_SECONDS", 60 * 60 * 4, type_cast=int
+)
+# Trends over ranges with at least this many events show results from a sample first, 0 disables approximate results
+TRENDS_APPROXIMATE_RESULTS_MIN_EVENTS = get_from_env("TRENDS_APPROXIMATE_RESULTS_MIN_EVENTS", 50_000_000, type_cast=int)
+
+# How long the status and results of async queries are kept for
+ASYNC_QUERY_RESULTS_TTL_SECONDS = get_from_env("ASYNC_QUERY_RESULTS_TTL_SECONDS", 60 * 20, type_cast=int)
+# Results of async queries larger than this are stored compressed, in chunks of rows, so that they can be paginated
+ASYNC_QUERY_RESULTS_CHUNKING_THRESHOLD_BYTES = get_from_env(
+    "ASYNC_QUERY_RESULTS_CHUNKING_THRESHOLD_BYTES", 1024 * 1024, type_cast=int
+)
+ASYNC_QUERY_RESULTS_CHUNK_ROWS = get_from_env("ASYNC_QUERY_RESULTS_CHUNK_ROWS", 5000, type_cast=int)
+
+# How long queries run for an API request, or for an async query since it was enqueued, may take altogether.
+# Queries get their max_execution_time capped to the time left, 0 means no deadline.
+# API requests have no deadline by default, as one would also cap dashboards calculating many tiles in a request
+API_QUERY_DEADLINE_SECONDS = get_from_env("API_QUERY_DEADLINE_SECONDS", 0, type_cast=int)
+ASYNC_QUERY_DEADLINE_SECONDS = get_from_env("ASYNC_QUERY_DEADLINE_SECONDS", 60 * 10, type_cast=int)
@@ -39,3 +39,14 @@ SESSION_REPLAY_RRWEB_SCRIPT = get_from_env("SESSION_REPLAY_RRWEB_SCRIPT", None,
 # a list of teams that are allowed to use the SESSION_REPLAY_RRWEB_SCRIPT
 # can be a comma separated list of team ids or '*' to allow all teams
 SESSION_REPLAY_RRWEB_SCRIPT_ALLOWED_TEAMS = get_list(get_from_env("SESSION_REPLAY_RRWEB_SCRIPT_ALLOWED_TEAMS", ""))
+
+# blobs served by the snapshots API can be cached on local disk, so that popular recordings aren't proxied
+# from object storage on every load. The cache is disabled unless a directory is set.
+SESSION_RECORDING_BLOB_CACHE_DIR = get_from_env("SESSION_RECORDING_BLOB_CACHE_DIR", "")
+SESSION_RECORDING_BLOB_CACHE_MAX_BYTES = get_from_env(
+    "SESSION_RECORDING_BLOB_CACHE_MAX_BYTES", 1024 * 1024 * 1024, type_cast=int
+)
+# larger blobs aren't cached, so they're fetched from object storage on every request
+SESSION_RECORDING_BLOB_CACHE_MAX_BLOB_BYTES = get_from_env(
+    "SESSION_RECORDING_BLOB_CACHE_MAX_BLOB_BYTES", 20 * 1024 * 1024, type_cast=int
+)
@@ -1,5 +1,9 @@
 import abc
-from typing import Optional, Union
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import IO, Optional, TypeVar, Union
 
 import structlog
 from boto3 import client
@@ -9,6 +13,16 @@ from sentry_sdk import capture_exception
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
+# the client is configured not to retry, so that a slow object store fails requests fast,
+# but copying or deleting many objects shouldn't fail because one request did
+BULK_OPERATION_ATTEMPTS = 3
+BULK_OPERATION_RETRY_DELAY_SECONDS = 0.1
+# the most keys S3 accepts in a single delete_objects request
+DELETE_OBJECTS_BATCH_SIZE = 1000
+READ_STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 class ObjectStorageError(Exception):
     pass
@@ -29,12 +43,38 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
     def list_objects(self, bucket: str, prefix: str) -> Optional[list[str]]:
         pass
 
+    @abc.abstractmethod
+    def iter_objects(self, bucket: str, prefix: str) -> Iterator[str]:
+        """
+        Lists the keys under the prefix one page at a time, so listing isn't limited to the first 1000 keys.
+        """
+        pass
+
     @abc.abstractmethod
     def read(self, bucket: str, key: str) -> Optional[str]:
         pass
 
     @abc.abstractmethod
-    def read_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+    def read_bytes(
+        self, bucket: str, key: str, first_byte: Optional[int] = None, last_byte: Optional[int] = None
+    ) -> Optional[bytes]:
+        """
+        Reads the object, or only the (inclusive) byte range of it if `first_byte` or `last_byte` are given.
+        """
+        pass
+
+    @abc.abstractmethod
+    def read_stream(
+        self,
+        bucket: str,
+        key: str,
+        first_byte: Optional[int] = None,
+        last_byte: Optional[int] = None,
+        chunk_size: int = READ_STREAM_CHUNK_SIZE,
+    ) -> Optional[Iterator[bytes]]:
+        """
+        Like `read_bytes`, but streams the object in chunks instead of loading it into memory.
+        """
         pass
 
     @abc.abstractmethod
@@ -45,6 +85,13 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    @abc.abstractmethod
+    def write_stream(self, bucket: str, key: str, fileobj: IO[bytes], extras: dict | None) -> None:
+        """
+        Write the contents of a file object, uploading it in parts as it's read rather than loading it into memory.
+        """
+        pass
+
     @abc.abstractmethod
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         """
@@ -52,6 +99,13 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
         """
         pass
 
+    @abc.abstractmethod
+    def delete_objects(self, bucket: str, prefix: str) -> int | None:
+        """
+        Delete all objects under the prefix. Returns the number of objects deleted.
+        """
+        pass
+
 
 class UnavailableStorage(ObjectStorageClient):
     def head_bucket(self, bucket: str):
@@ -63,10 +117,25 @@ class UnavailableStorage(ObjectStorageClient):
     def list_objects(self, bucket: str, prefix: str) -> Optional[list[str]]:
         pass
 
+    def iter_objects(self, bucket: str, prefix: str) -> Iterator[str]:
+        return iter(())
+
     def read(self, bucket: str, key: str) -> Optional[str]:
         pass
 
-    def read_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+    def read_bytes(
+        self, bucket: str, key: str, first_byte: Optional[int] = None, last_byte: Optional[int] = None
+    ) -> Optional[bytes]:
+        pass
+
+    def read_stream(
+        self,
+        bucket: str,
+        key: str,
+        first_byte: Optional[int] = None,
+        last_byte: Optional[int] = None,
+        chunk_size: int = READ_STREAM_CHUNK_SIZE,
+    ) -> Optional[Iterator[bytes]]:
         pass
 
     def tag(self, bucket: str, key: str, tags: dict[str, str]) -> None:
@@ -75,9 +144,37 @@ class UnavailableStorage(ObjectStorageClient):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    def write_stream(self, bucket: str, key: str, fileobj: IO[bytes], extras: dict | None) -> None:
+        pass
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         pass
 
+    def delete_objects(self, bucket: str, prefix: str) -> int | None:
+        pass
+
+
+def _range_header(first_byte: Optional[int], last_byte: Optional[int]) -> Optional[str]:
+    if first_byte is None and last_byte is None:
+        return None
+    return f"bytes={first_byte or 0}-{'' if last_byte is None else last_byte}"
+
+
+def _with_retries(operation: Callable[[], T]) -> T:
+    for attempt in range(1, BULK_OPERATION_ATTEMPTS + 1):
+        try:
+            return operation()
+        except Exception:
+            if attempt == BULK_OPERATION_ATTEMPTS:
+                raise
+            time.sleep(BULK_OPERATION_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+    raise AssertionError("unreachable")
+
+
+def _batched(items: Iterator[str], batch_size: int) -> Iterator[list[str]]:
+    while batch := list(islice(items, batch_size)):
+        yield batch
+
 
 class ObjectStorage(ObjectStorageClient):
     def __init__(self, aws_client) -> None:
@@ -105,11 +202,7 @@ class ObjectStorage(ObjectStorageClient):
 
     def list_objects(self, bucket: str, prefix: str) -> Optional[list[str]]:
         try:
-            s3_response = self.aws_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-            if s3_response.get("Contents"):
-                return [obj["Key"] for obj in s3_response["Contents"]]
-            else:
-                return None
+            return list(self.iter_objects(bucket, prefix)) or None
         except Exception as e:
             logger.exception(
                 "object_storage.list_objects_failed",
@@ -120,6 +213,12 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             return None
 
+    def iter_objects(self, bucket: str, prefix: str) -> Iterator[str]:
+        paginator = self.aws_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"]
+
     def read(self, bucket: str, key: str) -> Optional[str]:
         object_bytes = self.read_bytes(bucket, key)
         if object_bytes:
@@ -127,10 +226,12 @@ class ObjectStorage(ObjectStorageClient):
         else:
             return None
 
-    def read_bytes(self, bucket: str, key: str) -> Optional[bytes]:
+    def read_bytes(
+        self, bucket: str, key: str, first_byte: Optional[int] = None, last_byte: Optional[int] = None
+    ) -> Optional[bytes]:
         s3_response = {}
         try:
-            s3_response = self.aws_client.get_object(Bucket=bucket, Key=key)
+            s3_response = self._get_object(bucket, key, first_byte, last_byte)
             return s3_response["Body"].read()
         except Exception as e:
             logger.exception(
@@ -143,6 +244,33 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             raise ObjectStorageError("read failed") from e
 
+    def read_stream(
+        self,
+        bucket: str,
+        key: str,
+        first_byte: Optional[int] = None,
+        last_byte: Optional[int] = None,
+        chunk_size: int = READ_STREAM_CHUNK_SIZE,
+    ) -> Optional[Iterator[bytes]]:
+        s3_response = {}
+        try:
+            s3_response = self._get_object(bucket, key, first_byte, last_byte)
+            return s3_response["Body"].iter_chunks(chunk_size=chunk_size)
+        except Exception as e:
+            logger.exception(
+                "object_storage.read_failed",
+                bucket=bucket,
+                file_name=key,
+                error=e,
+                s3_response=s3_response,
+            )
+            capture_exception(e)
+            raise ObjectStorageError("read failed") from e
+
+    def _get_object(self, bucket: str, key: str, first_byte: Optional[int], last_byte: Optional[int]) -> dict:
+        byte_range = _range_header(first_byte, last_byte)
+        return self.aws_client.get_object(Bucket=bucket, Key=key, **({"Range": byte_range} if byte_range else {}))
+
     def tag(self, bucket: str, key: str, tags: dict[str, str]) -> None:
         try:
             self.aws_client.put_object_tagging(
@@ -170,16 +298,25 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             raise ObjectStorageError("write failed") from e
 
-    def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
+    def write_stream(self, bucket: str, key: str, fileobj: IO[bytes], extras: dict | None) -> None:
         try:
-            source_objects = self.list_objects(bucket, source_prefix) or []
+            self.aws_client.upload_fileobj(Fileobj=fileobj, Bucket=bucket, Key=key, ExtraArgs=extras)
+        except Exception as e:
+            logger.exception("object_storage.write_stream_failed", bucket=bucket, file_name=key, error=e)
+            capture_exception(e)
+            raise ObjectStorageError("write failed") from e
 
-            for object_key in source_objects:
-                copy_source = {"Bucket": bucket, "Key": object_key}
-                target = object_key.replace(source_prefix.rstrip("/"), target_prefix)
-                self.aws_client.copy(copy_source, bucket, target)
+    def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
+        def copy(object_key: str) -> None:
+            copy_source = {"Bucket": bucket, "Key": object_key}
+            target = object_key.replace(source_prefix.rstrip("/"), target_prefix)
+            _with_retries(lambda: self.aws_client.copy(copy_source, bucket, target))
 
-            return len(source_objects)
+        try:
+            # copies are independent round trips, so a recording with thousands of blobs
+            # is copied in about the time of a single copy per pool worker
+            with ThreadPoolExecutor(max_workers=settings.OBJECT_STORAGE_MAX_CONCURRENCY) as executor:
+                return sum(1 for _ in executor.map(copy, self.iter_objects(bucket, source_prefix)))
         except Exception as e:
             logger.exception(
                 "object_storage.copy_objects_failed",
@@ -190,6 +327,32 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             return None
 
+    def delete_objects(self, bucket: str, prefix: str) -> int | None:
+        def delete(keys: list[str]) -> int:
+            def delete_batch() -> None:
+                s3_response = self.aws_client.delete_objects(
+                    Bucket=bucket, Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+                )
+                if s3_response.get("Errors"):
+                    raise ObjectStorageError(f"failed to delete {len(s3_response['Errors'])} objects")
+
+            _with_retries(delete_batch)
+            return len(keys)
+
+        try:
+            with ThreadPoolExecutor(max_workers=settings.OBJECT_STORAGE_MAX_CONCURRENCY) as executor:
+                batches = _batched(self.iter_objects(bucket, prefix), DELETE_OBJECTS_BATCH_SIZE)
+                return sum(executor.map(delete, batches))
+        except Exception as e:
+            logger.exception(
+                "object_storage.delete_objects_failed",
+                bucket=bucket,
+                prefix=prefix,
+                error=e,
+            )
+            capture_exception(e)
+            return None
+
 
 _client: ObjectStorageClient = UnavailableStorage()
 
@@ -210,6 +373,8 @@ def object_storage_client() -> ObjectStorageClient:
                     signature_version="s3v4",
                     connect_timeout=1,
                     retries={"max_attempts": 1},
+                    # enough connections for the concurrent bulk operations to not wait on each other
+                    max_pool_connections=max(settings.OBJECT_STORAGE_MAX_CONCURRENCY, 10),
                 ),
                 region_name=settings.OBJECT_STORAGE_REGION,
             )
@@ -227,6 +392,15 @@ def write(file_name: str, content: Union[str, bytes], extras: dict | None = None
     )
 
 
+def write_stream(file_name: str, fileobj: IO[bytes], extras: dict | None = None, bucket: str | None = None) -> None:
+    return object_storage_client().write_stream(
+        bucket=bucket or settings.OBJECT_STORAGE_BUCKET,
+        key=file_name,
+        fileobj=fileobj,
+        extras=extras,
+    )
+
+
 def tag(file_name: str, tags: dict[str, str]) -> None:
     return object_storage_client().tag(bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name, tags=tags)
 
@@ -235,14 +409,41 @@ def read(file_name: str, bucket: str | None = None) -> Optional[str]:
     return object_storage_client().read(bucket=bucket or settings.OBJECT_STORAGE_BUCKET, key=file_name)
 
 
-def read_bytes(file_name: str) -> Optional[bytes]:
-    return object_storage_client().read_bytes(bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name)
+def read_bytes(
+    file_name: str,
+    bucket: str | None = None,
+    first_byte: Optional[int] = None,
+    last_byte: Optional[int] = None,
+) -> Optional[bytes]:
+    return object_storage_client().read_bytes(
+        bucket=bucket or settings.OBJECT_STORAGE_BUCKET, key=file_name, first_byte=first_byte, last_byte=last_byte
+    )
+
+
+def read_stream(
+    file_name: str,
+    bucket: str | None = None,
+    first_byte: Optional[int] = None,
+    last_byte: Optional[int] = None,
+    chunk_size: int = READ_STREAM_CHUNK_SIZE,
+) -> Optional[Iterator[bytes]]:
+    return object_storage_client().read_stream(
+        bucket=bucket or settings.OBJECT_STORAGE_BUCKET,
+        key=file_name,
+        first_byte=first_byte,
+        last_byte=last_byte,
+        chunk_size=chunk_size,
+    )
 
 
 def list_objects(prefix: str) -> Optional[list[str]]:
     return object_storage_client().list_objects(bucket=settings.OBJECT_STORAGE_BUCKET, prefix=prefix)
 
 
+def iter_objects(prefix: str) -> Iterator[str]:
+    return object_storage_client().iter_objects(bucket=settings.OBJECT_STORAGE_BUCKET, prefix=prefix)
+
+
 def copy_objects(source_prefix: str, target_prefix: str) -> int:
     return (
         object_storage_client().copy_objects(
@@ -254,6 +455,10 @@ def copy_objects(source_prefix: str, target_prefix: str) -> int:
     )
 
 
+def delete_objects(prefix: str) -> int:
+    return object_storage_client().delete_objects(bucket=settings.OBJECT_STORAGE_BUCKET, prefix=prefix) or 0
+
+
 def get_presigned_url(file_key: str, expiration: int = 3600) -> Optional[str]:
     return object_storage_client().get_presigned_url(
         bucket=settings.OBJECT_STORAGE_BUCKET, file_key=file_key, expiration=expiration
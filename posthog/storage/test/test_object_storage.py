@@ -1,5 +1,5 @@
 import uuid
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from boto3 import resource
 from botocore.client import Config
@@ -11,12 +11,16 @@ from posthog.settings import (
     OBJECT_STORAGE_SECRET_ACCESS_KEY,
 )
 from posthog.storage.object_storage import (
+    ObjectStorage,
     health_check,
     read,
+    read_bytes,
+    read_stream,
     write,
     get_presigned_url,
     list_objects,
     copy_objects,
+    delete_objects,
 )
 from posthog.test.base import APIBaseTest
 
@@ -157,3 +161,54 @@ class TestStorage(APIBaseTest):
                 "test_storage_bucket/a_shared_prefix/b",
                 "test_storage_bucket/a_shared_prefix/c",
             ]
+
+    def test_lists_objects_across_pages(self) -> None:
+        aws_client = MagicMock()
+        aws_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": f"prefix/{index}"} for index in range(1000)]},
+            {"Contents": [{"Key": "prefix/1000"}]},
+        ]
+
+        listing = ObjectStorage(aws_client).list_objects(bucket=OBJECT_STORAGE_BUCKET, prefix="prefix")
+
+        assert listing == [f"prefix/{index}" for index in range(1001)]
+        aws_client.get_paginator.assert_called_once_with("list_objects_v2")
+
+    @patch("posthog.storage.object_storage.BULK_OPERATION_RETRY_DELAY_SECONDS", 0)
+    def test_retries_failed_copies(self) -> None:
+        aws_client = MagicMock()
+        aws_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "source/a"}, {"Key": "source/b"}]}
+        ]
+        aws_client.copy.side_effect = [Exception("Slow down"), None, None]
+
+        copied_count = ObjectStorage(aws_client).copy_objects(
+            bucket=OBJECT_STORAGE_BUCKET, source_prefix="source", target_prefix="target"
+        )
+
+        assert copied_count == 2
+        assert aws_client.copy.call_count == 3
+
+    def test_can_delete_objects_with_prefix(self) -> None:
+        with self.settings(OBJECT_STORAGE_ENABLED=True):
+            for file in ["a", "b", "c"]:
+                write(f"{TEST_BUCKET}/to_delete/{file}", b"my content")
+            write(f"{TEST_BUCKET}/to_keep/a", b"my content")
+
+            deleted_count = delete_objects(prefix=f"{TEST_BUCKET}/to_delete")
+
+            assert deleted_count == 3
+            assert list_objects(prefix=f"{TEST_BUCKET}") == ["test_storage_bucket/to_keep/a"]
+
+    def test_can_read_byte_ranges(self) -> None:
+        with self.settings(OBJECT_STORAGE_ENABLED=True):
+            file_name = f"{TEST_BUCKET}/test_can_read_byte_ranges/{uuid.uuid4()}"
+            write(file_name, b"0123456789")
+
+            assert read_bytes(file_name, first_byte=2, last_byte=4) == b"234"
+            assert read_bytes(file_name, first_byte=7) == b"789"
+            assert read_bytes(file_name, last_byte=2) == b"012"
+
+            stream = read_stream(file_name, first_byte=1, chunk_size=4)
+            assert stream is not None
+            assert list(stream) == [b"1234", b"5678", b"9"]
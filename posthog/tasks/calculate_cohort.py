@@ -17,7 +17,12 @@ from datetime import timedelta
 from posthog.api.monitoring import Feature
 from posthog.models import Cohort
 from posthog.models.cohort import get_and_update_pending_version
-from posthog.models.cohort.util import clear_stale_cohortpeople, get_static_cohort_size
+from posthog.models.cohort.util import (
+    clear_stale_cohortpeople,
+    get_static_cohort_size,
+    iter_csv_lines,
+    parse_distinct_ids_from_csv,
+)
 from posthog.models.user import User
 
 COHORT_RECALCULATIONS_BACKLOG_GAUGE = Gauge(
@@ -126,6 +131,29 @@ def calculate_cohort_from_list(cohort_id: int, items: list[str], team_id: Option
     logger.warn("Calculating cohort {} from CSV took {:.2f} seconds".format(cohort.pk, (time.time() - start_time)))
 
 
+@shared_task(ignore_result=True, max_retries=1)
+def calculate_cohort_from_csv(cohort_id: int, file_key: str, team_id: int) -> None:
+    """
+    Like `calculate_cohort_from_list`, but for large CSV uploads that were put in object storage.
+    The file is streamed, so distinct IDs are resolved and inserted in batches without ever loading the whole upload.
+    """
+    from posthog.storage import object_storage
+
+    start_time = time.time()
+    cohort = Cohort.objects.get(pk=cohort_id)
+
+    chunks = object_storage.read_stream(file_key)
+    if chunks is None:
+        logger.error("cohort_csv_upload_missing", cohort_id=cohort_id, file_key=file_key)
+        return
+
+    try:
+        cohort.insert_users_by_list(parse_distinct_ids_from_csv(iter_csv_lines(chunks)), team_id=team_id)
+    finally:
+        object_storage.delete_objects(file_key)
+    logger.warn("Calculating cohort {} from CSV took {:.2f} seconds".format(cohort.pk, (time.time() - start_time)))
+
+
 @shared_task(ignore_result=True, max_retries=1)
 def insert_cohort_from_insight_filter(
     cohort_id: int, filter_data: dict[str, Any], team_id: Optional[int] = None
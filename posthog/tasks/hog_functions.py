@@ -47,13 +47,22 @@ def refresh_affected_hog_functions(team_id: Optional[int] = None, action_id: Opt
 
     actions_by_id = {action.id: action for action in all_related_actions}
 
+    # Functions sharing the same filters only compile them once, see `compile_filters_bytecode`
+    changed_hog_functions: list[HogFunction] = []
     for hog_function in affected_hog_functions:
-        hog_function.filters = compile_filters_bytecode(hog_function.filters, hog_function.team, actions_by_id)
+        filters = hog_function.filters or {}
+        previous = (filters.get("bytecode"), filters.get("bytecode_error"))
+        hog_function.filters = compile_filters_bytecode(filters, hog_function.team, actions_by_id)
+        if (hog_function.filters.get("bytecode"), hog_function.filters.get("bytecode_error")) != previous:
+            changed_hog_functions.append(hog_function)
 
-    updates = HogFunction.objects.bulk_update(affected_hog_functions, ["filters"])
+    if not changed_hog_functions:
+        return 0
+
+    updates = HogFunction.objects.bulk_update(changed_hog_functions, ["filters"])
 
     reload_hog_functions_on_workers(
-        team_id=team_id, hog_function_ids=[str(hog_function.id) for hog_function in affected_hog_functions]
+        team_id=team_id, hog_function_ids=[str(hog_function.id) for hog_function in changed_hog_functions]
     )
 
     return updates
@@ -0,0 +1,41 @@
+import time
+
+import structlog
+from celery import shared_task
+
+from posthog.models import Team
+from posthog.queries.property_values_index import (
+    PROPERTY_VALUES_INDEX_TTL_SECONDS,
+    TEAMS_KEY,
+    PropertyValuesIndexType,
+    refresh_property_values_index,
+)
+from posthog.redis import get_client
+from posthog.tasks.utils import CeleryQueue
+
+logger = structlog.get_logger(__name__)
+
+
+@shared_task(ignore_result=True, expires=60 * 15)
+def schedule_property_values_index_refresh() -> None:
+    """Refresh the property values index for every team that looked up property values recently."""
+    redis_client = get_client()
+    redis_client.zremrangebyscore(TEAMS_KEY, "-inf", time.time() - PROPERTY_VALUES_INDEX_TTL_SECONDS)
+    for member in redis_client.zrange(TEAMS_KEY, 0, -1):
+        property_type, team_id = member.decode("utf-8").split(":")
+        refresh_property_values_index_for_team.delay(property_type, int(team_id))
+
+
+@shared_task(
+    queue=CeleryQueue.ANALYTICS_LIMITED.value,  # Important! Prevents Clickhouse from being overwhelmed
+    ignore_result=True,
+    expires=60 * 60,
+)
+def refresh_property_values_index_for_team(property_type: PropertyValuesIndexType, team_id: int) -> None:
+    try:
+        team = Team.objects.get(pk=team_id)
+    except Team.DoesNotExist:
+        return
+
+    indexed_keys = refresh_property_values_index(property_type, team)
+    logger.info("property_values_index_refreshed", property_type=property_type, team_id=team_id, keys=indexed_keys)
@@ -16,6 +16,7 @@ from posthog.tasks.alerts.checks import (
 )
 from posthog.tasks.integrations import refresh_integrations
 from posthog.tasks.periodic_digest import send_all_periodic_digest_reports
+from posthog.tasks.property_values_index import schedule_property_values_index_refresh
 from posthog.tasks.tasks import (
     calculate_cohort,
     calculate_decide_usage,
@@ -106,6 +107,12 @@ def setup_periodic_tasks(sender: Celery, **kwargs: Any) -> None:
         name="schedule warming for largest teams",
     )
 
+    sender.add_periodic_task(
+        crontab(hour="*", minute="15"),
+        schedule_property_values_index_refresh.s(),
+        name="refresh property values index",
+    )
+
     # Update events table partitions twice a week
     sender.add_periodic_task(
         crontab(day_of_week="mon,fri", hour="0", minute="0"),
@@ -36,6 +36,10 @@ def redis_heartbeat() -> None:
     get_client().set("POSTHOG_HEARTBEAT", int(time.time()))
 
 
+# Queries that may run at once for a single team
+TEAM_QUERIES_CONCURRENCY_LIMIT = 10
+
+
 @shared_task(
     ignore_result=True,
     queue=CeleryQueue.ANALYTICS_QUERIES.value,
@@ -53,7 +57,7 @@ def redis_heartbeat() -> None:
 )
 @limit_concurrency(90)  # Do not go above what CH can handle (max_concurrent_queries)
 @limit_concurrency(
-    10, key=lambda *args, **kwargs: kwargs.get("team_id") or args[0]
+    TEAM_QUERIES_CONCURRENCY_LIMIT, key=lambda *args, **kwargs: kwargs.get("team_id") or args[0]
 )  # Do not run too many queries at once for the same team
 def process_query_task(
     team_id: int,
@@ -7,7 +7,12 @@ from freezegun import freeze_time
 
 from posthog.models.cohort import Cohort
 from posthog.models.person import Person
-from posthog.tasks.calculate_cohort import calculate_cohort_from_list, calculate_cohorts, MAX_AGE_MINUTES
+from posthog.tasks.calculate_cohort import (
+    calculate_cohort_from_csv,
+    calculate_cohort_from_list,
+    calculate_cohorts,
+    MAX_AGE_MINUTES,
+)
 from posthog.test.base import APIBaseTest
 
 
@@ -67,6 +72,27 @@ def calculate_cohort_test_factory(event_factory: Callable, person_factory: Calla
             people = Person.objects.filter(cohort__id=cohort.pk)
             self.assertEqual(people.count(), 1)
 
+        @patch("posthog.models.cohort.cohort.INSERT_USERS_BATCH_SIZE", 1)
+        @patch("posthog.storage.object_storage.delete_objects")
+        @patch("posthog.storage.object_storage.read_stream")
+        def test_calculate_cohort_from_csv_streams_the_upload(
+            self, mock_read_stream: MagicMock, mock_delete_objects: MagicMock
+        ) -> None:
+            person_factory(team_id=self.team.pk, distinct_ids=["blabla"])
+            person_factory(team_id=self.team.pk, distinct_ids=["other"])
+            person_factory(team_id=self.team.pk, distinct_ids=["not_in_the_upload"])
+            cohort = Cohort.objects.create(team=self.team, is_static=True, name="test")
+            # rows are split across the chunks read from object storage
+            mock_read_stream.return_value = iter([b"User ID,\nbla", b"bla,\r\not", b"her\n\nunknown\n"])
+
+            calculate_cohort_from_csv(cohort.pk, "cohort_uploads/some-file.csv", team_id=self.team.pk)
+
+            cohort.refresh_from_db()
+            self.assertEqual(cohort.count, 2)
+            self.assertFalse(cohort.is_calculating)
+            self.assertEqual(Person.objects.filter(cohort__id=cohort.pk).count(), 2)
+            mock_delete_objects.assert_called_once_with("cohort_uploads/some-file.csv")
+
         @patch("posthog.tasks.calculate_cohort.update_cohort")
         def test_exponential_backoff(self, patch_update_cohort: MagicMock) -> None:
             # Exponential backoff
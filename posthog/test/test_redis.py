@@ -1,5 +1,5 @@
 from unittest.mock import ANY, patch
-from posthog.redis import TEST_clear_clients, get_client, _client_map
+from posthog.redis import TEST_clear_clients, batched_commands, get_client, _client_map, queue_command
 
 from django.test.testcases import TestCase
 
@@ -10,9 +10,11 @@ class TestRedis(TestCase):
 
         TEST_clear_clients()
 
+    @patch("posthog.redis.InstrumentedRedis")
     @patch("posthog.redis.redis")
-    def test_redis_client_is_created(self, mock_redis):
-        mock_redis.from_url.return_value = "test"
+    def test_redis_client_is_created(self, mock_redis, mock_instrumented_redis):
+        mock_redis.ConnectionPool.from_url.return_value = "pool"
+        mock_instrumented_redis.return_value = "test"
 
         with self.settings(REDIS_URL="redis://mocked:6379", TEST=False):
             client = get_client()
@@ -21,7 +23,21 @@ class TestRedis(TestCase):
         assert _client_map == {
             "redis://mocked:6379": "test",
         }
-        mock_redis.from_url.assert_called_once_with("redis://mocked:6379", db=0)
+        mock_redis.ConnectionPool.from_url.assert_called_once_with("redis://mocked:6379", db=0)
+        mock_instrumented_redis.assert_called_once_with(connection_pool="pool")
+
+    @patch("posthog.redis.InstrumentedRedis")
+    @patch("posthog.redis.redis")
+    def test_redis_client_pool_can_be_bounded(self, mock_redis, mock_instrumented_redis):
+        with self.settings(
+            REDIS_URL="redis://mocked:6379", TEST=False, REDIS_MAX_CONNECTIONS=10, REDIS_POOL_TIMEOUT_SECONDS=2
+        ):
+            assert get_client()
+
+        mock_redis.BlockingConnectionPool.from_url.assert_called_once_with(
+            "redis://mocked:6379", db=0, max_connections=10, timeout=2
+        )
+        mock_redis.ConnectionPool.from_url.assert_not_called()
 
     def test_redis_client_uses_given_url(self):
         with self.settings(REDIS_URL="redis://mocked:6379"):
@@ -31,17 +47,30 @@ class TestRedis(TestCase):
             "redis://other:6379": ANY,
         }
 
+    @patch("posthog.redis.InstrumentedRedis")
     @patch("posthog.redis.redis")
-    def test_redis_client_is_cached_between_calls(self, mock_redis):
-        mock_redis.from_url.return_value = "test"
-
+    def test_redis_client_is_cached_between_calls(self, mock_redis, mock_instrumented_redis):
         with self.settings(REDIS_URL="redis://mocked:6379", TEST=False):
             assert get_client()
-            mock_redis.from_url.assert_called_once_with("redis://mocked:6379", db=0)
-            mock_redis.from_url.reset_mock()
+            mock_redis.ConnectionPool.from_url.assert_called_once_with("redis://mocked:6379", db=0)
+            mock_redis.ConnectionPool.from_url.reset_mock()
 
             assert get_client()
-            mock_redis.from_url.assert_not_called()
+            mock_redis.ConnectionPool.from_url.assert_not_called()
 
             assert get_client("redis://other:6379")
-            mock_redis.from_url.assert_called_once_with("redis://other:6379", db=0)
+            mock_redis.ConnectionPool.from_url.assert_called_once_with("redis://other:6379", db=0)
+
+    def test_queued_commands_are_sent_when_the_batch_ends(self):
+        client = get_client()
+        client.delete("test_key")
+
+        queue_command("incr", "test_key")
+        assert client.get("test_key") == b"1"
+
+        with batched_commands():
+            queue_command("incr", "test_key")
+            queue_command("incr", "test_key")
+            assert client.get("test_key") == b"1"
+
+        assert client.get("test_key") == b"3"
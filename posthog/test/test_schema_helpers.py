@@ -120,6 +120,37 @@ class TestSchemaHelpers(TestCase):
             {"kind": "TrendsQuery", "series": [], "trendsFilter": {"display": "ActionsBarValue"}},
         )
 
+        # stacked bars are a time series too
+        query = TrendsQuery(**{**base_trends, "trendsFilter": {"display": "ActionsStackedBar"}})
+        self.assertEqual(to_dict(query), {"kind": "TrendsQuery", "series": []})
+
+        # world maps use a higher breakdown limit than other total values
+        query = TrendsQuery(**{**base_trends, "trendsFilter": {"display": "WorldMap"}})
+        self.assertEqual(
+            to_dict(query),
+            {"kind": "TrendsQuery", "series": [], "trendsFilter": {"display": "WorldMap"}},
+        )
+
+    def test_serializes_trends_filter_without_legend_and_alert_display_options(self):
+        query = TrendsQuery(
+            **{
+                **base_trends,
+                "trendsFilter": {"hiddenLegendIndexes": [1], "showAlertThresholdLines": True, "formula": "A+B"},
+            }
+        )
+
+        self.assertEqual(to_dict(query), {"kind": "TrendsQuery", "series": [], "trendsFilter": {"formula": "A+B"}})
+
+    def test_serializes_compare_filter_only_when_comparing(self):
+        query = TrendsQuery(**{**base_trends, "compareFilter": {"compare": False, "compare_to": "-1w"}})
+        self.assertEqual(to_dict(query), {"kind": "TrendsQuery", "series": []})
+
+        query = TrendsQuery(**{**base_trends, "compareFilter": {"compare": True, "compare_to": "-1w"}})
+        self.assertEqual(
+            to_dict(query),
+            {"kind": "TrendsQuery", "series": [], "compareFilter": {"compare": True, "compare_to": "-1w"}},
+        )
+
     def _assert_filter(self, key: str, num_keys: int, q1: BaseModel, q2: BaseModel):
         self.assertEqual(to_dict(q1), to_dict(q2))
         if num_keys == 0:
@@ -13,7 +13,7 @@ from posthog.models import (
 )
 from posthog.models.instance_setting import override_instance_config
 from posthog.models.project import Project
-from posthog.models.team import get_team_in_cache, util
+from posthog.models.team import get_team_in_cache, team_caching, util
 from posthog.plugins.test.mock import mocked_plugin_requests_get
 from posthog.schema import PersonsOnEventsMode
 
@@ -64,6 +64,50 @@ class TestModelCache(TestCase):
         cached_team = get_team_in_cache(api_token)
         assert cached_team is None
 
+    def test_unknown_tokens_are_cached(self):
+        with self.assertNumQueries(1):
+            assert Team.objects.get_team_from_cache_or_token("unknown_token") is None
+        with self.assertNumQueries(0):
+            assert Team.objects.get_team_from_cache_or_token("unknown_token") is None
+
+        org = Organization.objects.create(name="org name")
+        team = Team.objects.create(organization=org, api_token="unknown_token", test_account_filters=[])
+
+        with self.assertNumQueries(0):
+            cached_team = Team.objects.get_team_from_cache_or_token("unknown_token")
+        assert cached_team is not None
+        self.assertEqual(cached_team.id, team.id)
+
+    def test_cache_miss_reads_the_cache_once(self):
+        with mock.patch.object(team_caching.cache, "get", wraps=team_caching.cache.get) as mock_cache_get:
+            assert Team.objects.get_team_from_cache_or_token("unknown_token") is None
+            assert Team.objects.get_team_from_cache_or_token("unknown_token") is None
+
+        # once for the miss, once for the token remembered as unknown
+        self.assertEqual(mock_cache_get.call_count, 2)
+
+    @mock.patch("posthog.models.team.team_caching.LOCAL_CACHE_TTL_SECONDS", 10)
+    def test_teams_are_cached_locally(self):
+        team_caching._local_cache.clear()
+        org = Organization.objects.create(name="org name")
+        team = Team.objects.create(organization=org, api_token="test_token", test_account_filters=[])
+
+        cache.clear()
+        cached_team = get_team_in_cache("test_token")
+        assert cached_team is not None
+        self.assertEqual(cached_team.name, "Default project")
+
+        team.name = "New name"
+        team.save()
+        cache.clear()
+        cached_team = get_team_in_cache("test_token")
+        assert cached_team is not None
+        self.assertEqual(cached_team.name, "New name")
+
+        team.delete()
+        assert get_team_in_cache("test_token") is None
+        team_caching._local_cache.clear()
+
 
 class TestTeam(BaseTest):
     def test_team_has_expected_defaults(self):
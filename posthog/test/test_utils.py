@@ -1,5 +1,6 @@
 import base64
 from datetime import datetime
+import gzip
 import json
 from unittest.mock import call, patch
 from zoneinfo import ZoneInfo
@@ -412,6 +413,56 @@ class TestLoadDataFromRequest(TestCase):
         data = load_data_from_request(post_request)
         self.assertEqual({"what is it": "the decompressed value"}, data)
 
+    def test_can_decompress_real_gzipped_body_received_with_no_compression_flag(self):
+        rf = RequestFactory()
+        post_request = rf.post("/s/", gzip.compress(b'{"event": "$pageview"}'), "text/plain")
+
+        data = load_data_from_request(post_request)
+        self.assertEqual({"event": "$pageview"}, data)
+
+    def test_parses_nan_and_infinity_as_none(self):
+        rf = RequestFactory()
+        post_request = rf.post("/s/", b'{"a": NaN, "b": Infinity, "c": -Infinity, "d": 1}', "text/plain")
+
+        data = load_data_from_request(post_request)
+        self.assertEqual({"a": None, "b": None, "c": None, "d": 1}, data)
+
+    def test_keeps_integers_wider_than_64_bits_exact(self):
+        rf = RequestFactory()
+        post_request = rf.post(
+            "/s/", b'{"a": 123456789012345678901234567890, "b": "1234567890123456789"}', "text/plain"
+        )
+
+        data = load_data_from_request(post_request)
+        self.assertEqual({"a": 123456789012345678901234567890, "b": "1234567890123456789"}, data)
+
+    def test_parses_base64_encoded_body(self):
+        rf = RequestFactory()
+        encoded = base64.b64encode('{"event": "$pageview", "properties": {"emoji": "👋"}}'.encode())
+        post_request = rf.post("/s/", b"data=" + encoded, "text/plain")
+
+        data = load_data_from_request(post_request)
+        self.assertEqual({"event": "$pageview", "properties": {"emoji": "👋"}}, data)
+
+    def test_does_not_base64_decode_json_body(self):
+        rf = RequestFactory()
+        post_request = rf.post("/s/?compression=gzip-js", gzip.compress(b'  [{"event": "abcd"}]'), "text/plain")
+
+        with patch("posthog.utils.base64_decode") as patched_base64_decode:
+            data = load_data_from_request(post_request)
+
+        patched_base64_decode.assert_not_called()
+        self.assertEqual([{"event": "abcd"}], data)
+
+    def test_invalid_json_body_with_compression_flag(self):
+        rf = RequestFactory()
+        post_request = rf.post("/s/?compression=gzip-js", gzip.compress(b'{"event": '), "text/plain")
+
+        with self.assertRaises(RequestParsingError) as ctx:
+            load_data_from_request(post_request)
+
+        self.assertTrue(str(ctx.exception).startswith("Invalid JSON: "))
+
 
 class TestShouldRefresh(TestCase):
     def test_refresh_requested_by_client_with_refresh_true(self):
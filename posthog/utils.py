@@ -23,6 +23,7 @@ from zoneinfo import ZoneInfo
 from rest_framework import serializers
 
 import lzstring
+import orjson
 import posthoganalytics
 import pytz
 import structlog
@@ -656,10 +657,74 @@ def base64_decode(data):
     return decoded.decode("utf-8", "surrogatepass")
 
 
+GZIP_MAGIC_BYTES = b"\x1f\x8b"
+
+
+def _looks_like_json(data: Union[str, bytes]) -> bool:
+    """
+    Request bodies are JSON objects or arrays, and neither `{` nor `[` is part of the base64 alphabet,
+    so a single byte tells us whether a payload needs to go through base64 decoding at all.
+    """
+    first = data.lstrip()[:1]
+    if isinstance(first, str):
+        return first in ("{", "[")
+    return first in (b"{", b"[")
+
+
+def _is_gzipped(data: Union[str, bytes]) -> bool:
+    return isinstance(data, bytes) and data.startswith(GZIP_MAGIC_BYTES)
+
+
+# orjson reads integers wider than 64 bits as floats, losing precision, so payloads that may contain them are parsed
+# with the stdlib instead. Any run of 19 digits could be one, including digits within strings, which errs on the side
+# of the slow path.
+_WIDE_INTEGER_PATTERN = re.compile(r"\d{19,}")
+_WIDE_INTEGER_BYTES_PATTERN = re.compile(rb"\d{19,}")
+
+
+def _may_contain_wide_integers(data: Union[str, bytes]) -> bool:
+    if isinstance(data, bytes):
+        return _WIDE_INTEGER_BYTES_PATTERN.search(data) is not None
+    return _WIDE_INTEGER_PATTERN.search(data) is not None
+
+
+def _parse_json(data: Union[str, bytes]) -> Any:
+    if not _may_contain_wide_integers(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is strict: it rejects NaN/Infinity, lone surrogates and non UTF-8 encodings, all of which the
+            # stdlib parser accepts. Retrying with the stdlib keeps the previous semantics (and error messages) for
+            # those rare payloads while the common case stays on the fast path.
+            pass
+
+    # Use custom parse_constant to handle NaN, Infinity, etc.
+    return json.loads(data, parse_constant=lambda x: None)
+
+
+def _decompress_unspecified_gzip(data: Any, error: Optional[Exception] = None):
+    try:
+        # Attempt gzip decompression as fallback for unspecified compression
+        fallback = decompress(data, "gzip")
+        KLUDGES_COUNTER.labels(kludge="unspecified_gzip_fallback").inc()
+        return fallback
+    except Exception as fallback_error:
+        # Increment a separate counter for JSON parsing failures after all decompression attempts
+        # We do this because we're no longer tracking these fallbacks in Sentry (since they're not actionable defects),
+        # but we still want to know how often they occur.
+        KLUDGES_COUNTER.labels(kludge="json_parse_failure_after_unspecified_gzip_fallback").inc()
+        raise UnspecifiedCompressionFallbackParsingError(f"Invalid JSON: {error or fallback_error}")
+
+
 def decompress(data: Any, compression: str):
     if not data:
         return None
 
+    if compression == "" and _is_gzipped(data):
+        # Some clients gzip the body without telling us. Sniffing the magic bytes lets us decompress right away
+        # instead of first failing to parse the compressed bytes as JSON.
+        return _decompress_unspecified_gzip(data)
+
     if compression in ("gzip", "gzip-js"):
         if data == b"undefined":
             raise RequestParsingError(
@@ -684,30 +749,20 @@ def decompress(data: Any, compression: str):
 
         data = data.encode("utf-16", "surrogatepass").decode("utf-16")
 
-    # Attempt base64 decoding after decompression
-    try:
-        base64_decoded = base64_decode(data)
-        KLUDGES_COUNTER.labels(kludge=f"base64_after_decompression_{compression}").inc()
-        data = base64_decoded
-    except Exception:
-        pass
+    # Attempt base64 decoding after decompression, unless the payload is already plain JSON
+    if not _looks_like_json(data):
+        try:
+            base64_decoded = base64_decode(data)
+            KLUDGES_COUNTER.labels(kludge=f"base64_after_decompression_{compression}").inc()
+            data = base64_decoded
+        except Exception:
+            pass
 
     try:
-        # Use custom parse_constant to handle NaN, Infinity, etc.
-        data = json.loads(data, parse_constant=lambda x: None)
+        data = _parse_json(data)
     except (json.JSONDecodeError, UnicodeDecodeError) as error_main:
         if compression == "":
-            try:
-                # Attempt gzip decompression as fallback for unspecified compression
-                fallback = decompress(data, "gzip")
-                KLUDGES_COUNTER.labels(kludge="unspecified_gzip_fallback").inc()
-                return fallback
-            except Exception:
-                # Increment a separate counter for JSON parsing failures after all decompression attempts
-                # We do this because we're no longer tracking these fallbacks in Sentry (since they're not actionable defects),
-                # but we still want to know how often they occur.
-                KLUDGES_COUNTER.labels(kludge="json_parse_failure_after_unspecified_gzip_fallback").inc()
-                raise UnspecifiedCompressionFallbackParsingError(f"Invalid JSON: {error_main}")
+            return _decompress_unspecified_gzip(data, error_main)
         else:
             raise RequestParsingError(f"Invalid JSON: {error_main}")
 